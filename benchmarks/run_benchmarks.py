@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmarks du scanner de ports sur une ferme de cibles locale
+
+Mesure, pour chaque combinaison (nombre de ports, nombre de threads):
+débit (ports/s), latence par port (p50/p99), RSS maximal, descripteurs
+ouverts au pic et exactitude des états détectés. Chaque mesure est faite
+dans un processus séparé pour isoler RSS et descripteurs.
+
+Exemples:
+    python benchmarks/run_benchmarks.py --sizes 100,1000 --threads 50,200 -o bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from scanner import PortScanner
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from target_farm import TargetFarm
+
+STATE_NAMES = {STATE_OPEN: 'open', STATE_CLOSED: 'closed', STATE_FILTERED: 'filtered'}
+
+class TimedPortScanner(PortScanner):
+    """
+    PortScanner qui mesure la durée de chaque sonde
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def scan_port(self, port, host=None):
+        started = time.perf_counter()
+        super().scan_port(port, host)
+        self.latencies.append(time.perf_counter() - started)
+
+def percentile(values, fraction):
+    """
+    Percentile (rang le plus proche) d'une liste triée
+    """
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+def count_open_fds():
+    """
+    Nombre de descripteurs ouverts par le processus (None si indisponible)
+    """
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except OSError:
+        return None
+
+def peak_rss_kb():
+    """
+    RSS maximal du processus en Ko (None si indisponible)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sur macOS, Ko ailleurs
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+class FdSampler:
+    """
+    Relève périodiquement le nombre de descripteurs ouverts et garde le pic
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = count_open_fds()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            current = count_open_fds()
+            if current is not None and (self.peak is None or current > self.peak):
+                self.peak = current
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+def run_case(host, ports, expected, threads, timeout):
+    """
+    Exécute un scan et retourne ses mesures (appelé dans un processus fils)
+    """
+    # La barre de progression n'a pas sa place dans les mesures
+    sys.stderr = open(os.devnull, 'w')
+
+    scanner = TimedPortScanner(host, ports, timeout=timeout, threads=threads)
+    baseline_fds = count_open_fds()
+
+    with FdSampler() as sampler:
+        started = time.perf_counter()
+        scanner.scan(verbose=False)
+        elapsed = time.perf_counter() - started
+
+    table = scanner.store.table(host)
+    states = {'open': 0, 'closed': 0, 'filtered': 0}
+    mismatches = 0
+    for port in ports:
+        state = STATE_NAMES.get(table.get(port), 'unknown')
+        states[state] = states.get(state, 0) + 1
+        if state != expected[port]:
+            mismatches += 1
+
+    latencies = sorted(scanner.latencies)
+    return {
+        'ports': len(ports),
+        'threads': threads,
+        'timeout': timeout,
+        'elapsed': round(elapsed, 4),
+        'ports_per_second': round(len(ports) / elapsed, 1) if elapsed else None,
+        'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        'peak_rss_kb': peak_rss_kb(),
+        'peak_fds': (sampler.peak - baseline_fds
+                     if sampler.peak is not None and baseline_fds is not None else None),
+        'states': states,
+        'mismatches': mismatches
+    }
+
+def run_benchmarks(sizes, thread_counts, timeout=0.3, open_ratio=0.1, filtered_ratio=0.02,
+                   repeat=1):
+    """
+    Exécute la matrice de benchmarks et retourne la liste des mesures
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    for size in sizes:
+        open_count = max(1, int(size * open_ratio))
+        filtered_count = int(size * filtered_ratio)
+        closed_count = max(0, size - open_count - filtered_count)
+
+        with TargetFarm(open_count, closed_count, filtered_count) as farm:
+            ports = farm.ports
+            expected = farm.expected_states()
+            for threads in thread_counts:
+                for run in range(repeat):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        result = pool.submit(run_case, farm.host, ports, expected,
+                                             threads, timeout).result()
+                    result['run'] = run
+                    result['layout'] = {'open': open_count, 'closed': closed_count,
+                                        'filtered': filtered_count}
+                    print(f"[*] {size} ports, {threads} threads: "
+                          f"{result['ports_per_second']} ports/s, "
+                          f"p50 {result['latency_p50_ms']} ms, p99 {result['latency_p99_ms']} ms, "
+                          f"RSS {result['peak_rss_kb']} Ko, fds {result['peak_fds']}",
+                          file=sys.stderr)
+                    results.append(result)
+
+    return results
+
+def git_version():
+    """
+    Version du code mesuré (git describe), None hors dépôt git
+    """
+    try:
+        return subprocess.check_output(
+            ['git', 'describe', '--always', '--dirty'], cwd=ROOT,
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Compare les mesures à une référence et retourne la liste des régressions
+    """
+    reference = {}
+    for entry in baseline.get('results', []):
+        reference.setdefault((entry['ports'], entry['threads']), entry)
+
+    regressions = []
+    for entry in results:
+        previous = reference.get((entry['ports'], entry['threads']))
+        if not previous:
+            continue
+        key = f"{entry['ports']} ports/{entry['threads']} threads"
+        if (previous.get('ports_per_second') and entry['ports_per_second'] is not None
+                and entry['ports_per_second'] < previous['ports_per_second'] * (1 - tolerance)):
+            regressions.append(f"{key}: débit {entry['ports_per_second']} < "
+                               f"{previous['ports_per_second']} ports/s")
+        if (previous.get('latency_p99_ms') and entry['latency_p99_ms'] is not None
+                and entry['latency_p99_ms'] > previous['latency_p99_ms'] * (1 + tolerance)):
+            regressions.append(f"{key}: p99 {entry['latency_p99_ms']} > "
+                               f"{previous['latency_p99_ms']} ms")
+        if entry['mismatches'] > previous.get('mismatches', 0):
+            regressions.append(f"{key}: {entry['mismatches']} états incorrects")
+    return regressions
+
+def parse_int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks du scanner de ports')
+    parser.add_argument('--sizes', type=parse_int_list, default=[100, 1000],
+                        help='Nombres de ports à scanner (ex: 100,1000)')
+    parser.add_argument('--threads', type=parse_int_list, default=[50, 100, 200],
+                        help='Nombres de threads (ex: 50,100,200)')
+    parser.add_argument('--timeout', type=float, default=0.3,
+                        help='Timeout de connexion (secondes)')
+    parser.add_argument('--open-ratio', type=float, default=0.1,
+                        help='Proportion de ports ouverts')
+    parser.add_argument('--filtered-ratio', type=float, default=0.02,
+                        help='Proportion de ports sans réponse')
+    parser.add_argument('--repeat', type=int, default=1, help='Répétitions par mesure')
+    parser.add_argument('-o', '--output', help='Fichier JSON de sortie (défaut: stdout)')
+    parser.add_argument('--baseline', help='Fichier JSON de référence à comparer')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Écart toléré par rapport à la référence (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.threads, args.timeout,
+                             args.open_ratio, args.filtered_ratio, args.repeat)
+    report = {
+        'version': git_version(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"[+] Résultats écrits dans {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"[-] Régression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"[+] Aucune régression par rapport à {args.baseline}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
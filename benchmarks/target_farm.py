@@ -0,0 +1,141 @@
+"""
+Ferme de cibles locale pour les benchmarks
+
+Simule sur 127.0.0.1, sans iptables ni privilèges:
+    - des ports ouverts (écoute, envoi d'une bannière puis fermeture)
+    - des ports fermés (aucune écoute: le noyau répond par un RST)
+    - des ports filtrés (file d'acceptation saturée: les SYN sont ignorés,
+      le client n'obtient aucune réponse avant son timeout)
+"""
+import selectors
+import socket
+import threading
+
+HOST = '127.0.0.1'
+BANNER = b'BENCH-TARGET 1.0\r\n'
+CLOSED_CHUNK = 256
+
+class TargetFarm:
+    """
+    Ensemble de ports locaux aux comportements contrôlés
+
+    S'utilise comme gestionnaire de contexte:
+
+        with TargetFarm(open_count=10, closed_count=80, filtered_count=10) as farm:
+            scanner = PortScanner(farm.host, farm.ports)
+    """
+
+    def __init__(self, open_count=10, closed_count=80, filtered_count=10):
+        """
+        Args:
+            open_count: Nombre de ports ouverts
+            closed_count: Nombre de ports fermés (RST)
+            filtered_count: Nombre de ports sans réponse
+        """
+        self.host = HOST
+        self.open_count = open_count
+        self.closed_count = closed_count
+        self.filtered_count = filtered_count
+        self.open_ports = []
+        self.closed_ports = []
+        self.filtered_ports = []
+        self.sockets = []
+        self.selector = selectors.DefaultSelector()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def ports(self):
+        """
+        Tous les ports de la ferme, triés
+        """
+        return sorted(self.open_ports + self.closed_ports + self.filtered_ports)
+
+    def expected_states(self):
+        """
+        État attendu de chaque port: {port: 'open' | 'closed' | 'filtered'}
+        """
+        states = dict.fromkeys(self.closed_ports, 'closed')
+        states.update(dict.fromkeys(self.open_ports, 'open'))
+        states.update(dict.fromkeys(self.filtered_ports, 'filtered'))
+        return states
+
+    def _listener(self, backlog):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind((self.host, 0))
+        sock.listen(backlog)
+        self.sockets.append(sock)
+        return sock
+
+    def start(self):
+        """
+        Ouvre les ports et démarre le thread d'acceptation
+        """
+        for _ in range(self.open_count):
+            sock = self._listener(128)
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ)
+            self.open_ports.append(sock.getsockname()[1])
+
+        for _ in range(self.filtered_count):
+            # backlog 0: une connexion en attente suffit à saturer la file,
+            # les SYN suivants sont ignorés par le noyau
+            sock = self._listener(0)
+            port = sock.getsockname()[1]
+            for _ in range(2):
+                filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                filler.setblocking(False)
+                filler.connect_ex((self.host, port))
+                self.sockets.append(filler)
+            self.filtered_ports.append(port)
+
+        # Réserver des ports libres puis les relâcher: ils répondront par RST.
+        # Réservation par tranches pour rester sous la limite de descripteurs
+        used = set(self.open_ports) | set(self.filtered_ports)
+        while len(self.closed_ports) < self.closed_count:
+            reserved = []
+            for _ in range(min(CLOSED_CHUNK, self.closed_count - len(self.closed_ports))):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.bind((self.host, 0))
+                reserved.append(sock)
+            for sock in reserved:
+                port = sock.getsockname()[1]
+                if port not in used:
+                    used.add(port)
+                    self.closed_ports.append(port)
+                sock.close()
+
+        self.thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _accept_loop(self):
+        while not self.stopped.is_set():
+            for key, _ in self.selector.select(timeout=0.1):
+                try:
+                    conn, _ = key.fileobj.accept()
+                except OSError:
+                    continue
+                try:
+                    conn.sendall(BANNER)
+                except OSError:
+                    pass
+                conn.close()
+
+    def stop(self):
+        """
+        Arrête le thread d'acceptation et ferme tous les ports
+        """
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+        self.selector.close()
+        for sock in self.sockets:
+            sock.close()
+        self.sockets = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -3,21 +3,31 @@
 Scanner de Ports Automatique
 Point d'entrée principal du programme
 """
+import os
 import sys
 import argparse
+import sqlite3
 import yaml
+from datetime import datetime
 from pathlib import Path
 
 # Ajouter le dossier src au path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-from scanner import PortScanner
+from engines import ENGINES, create_scanner
+from distributed import ScanCoordinator, ScanWorker, parse_address
 from reporter import Reporter
-from port_db import get_common_ports_list, get_port_info
+from checkpoint import CheckpointWriter
+from history import ScanHistory, DEFAULT_HISTORY, prioritize_ports
+from stream import NdjsonSink
+from port_db import get_common_ports_list, get_top_ports, get_port_info
+from resolver import default_resolver
+from discovery import HostDiscovery, DEFAULT_DISCOVERY_PORTS
+from metrics import ScanMetrics, StatsReporter
+from fd_budget import default_fd_budget, raise_fd_limit
 from utils import (
-    validate_ip, 
-    resolve_hostname, 
     validate_port_range,
+    parse_targets,
     print_banner,
     print_success,
     print_error,
@@ -40,6 +50,22 @@ def load_config(config_file='config/config.yaml'):
         print_error(f"Erreur lors du chargement de la config: {e}")
         return None
 
+def parse_ports(port_spec):
+    """
+    Convertit une spécification de ports: "common", "top-N" ou liste/plages
+    """
+    port_spec = str(port_spec).strip()
+    if port_spec.lower() == 'common':
+        return get_common_ports_list()
+    if port_spec.lower().startswith('top-') and port_spec[4:].isdigit():
+        count = int(port_spec[4:])
+        ports = get_top_ports(count)
+        if count > len(ports):
+            print_warning(f"Seuls {len(ports)} ports sont classés par fréquence: "
+                          f"top-{count} limité à {len(ports)} ports")
+        return ports or None
+    return validate_port_range(port_spec)
+
 def parse_arguments():
     """
     Parse les arguments de la ligne de commande
@@ -54,31 +80,160 @@ Exemples d'utilisation:
   python main.py -t 192.168.1.1 -p 80,443,8080     # Scan de ports spécifiques
   python main.py -t 192.168.1.1 --profile full     # Scan complet
   python main.py -t 192.168.1.1 --profile web      # Scan des ports web
+  python main.py -t 192.168.1.1 --top-ports 1000   # Les 1000 ports les plus fréquents
+  python main.py -t 192.168.1.1 -p 1-65535 --engine async   # Moteur asyncio
+  sudo python main.py -t 192.168.1.1 --engine syn  # Scan SYN semi-ouvert
+  python main.py -t 192.168.1.1 -p 53,123,161 --engine udp   # Scan UDP
+  python main.py -t 10.0.0.0/24 -p 1-65535 --workers 4   # Scan réparti sur 4 processus
+  python main.py -t 10.0.0.0/16 -p 1-1024 --serve 0.0.0.0:8765 --token SECRET   # Coordinateur distribué
+  python main.py --worker --coordinator 10.0.0.5:8765 --token SECRET   # Worker d'un scan distribué
+  python main.py -t 192.168.1.0/24 --profile full --changed-only   # Changements depuis le dernier scan
+  python main.py -t 192.168.1.0/24 -p 22,80,443    # Scan d'un sous-réseau
+  python main.py -t 10.0.0.0/24 -p 1-1024 --skip-discovery   # Sans découverte des hôtes
+  python main.py -t 10.0.0.1-50,@cibles.txt        # Plage + fichier de cibles
+  python main.py -t 10.0.0.0/24 --profile full --resume results/scan.ckpt   # Reprise
+  python main.py -t 10.0.0.0/24 --stream - --no-report | jq .             # Flux NDJSON
+  python main.py -t 10.0.0.0/16 -p 1-1024 --stats-interval 5   # Métriques en direct
         """
     )
     
     parser.add_argument('-t', '--target', 
-                       required=True,
-                       help='Adresse IP ou nom d\'hôte cible')
+                       help='Cible(s): IP, nom d\'hôte, CIDR (192.168.1.0/24), '
+                            'plage (192.168.1.10-20), liste séparée par des virgules '
+                            'ou fichier (@cibles.txt)')
     
     parser.add_argument('-p', '--ports',
-                       help='Ports à scanner (ex: 80,443,8000-9000 ou "common" pour les ports communs)')
+                       help='Ports à scanner (ex: 80,443,8000-9000, "common" pour les ports communs, '
+                            '"top-N" pour les N ports les plus fréquents, au plus 1000)')
+    
+    parser.add_argument('--top-ports',
+                       type=int,
+                       metavar='N',
+                       help='Scanner les N ports les plus fréquemment ouverts (au plus 1000)')
     
     parser.add_argument('--profile',
-                       choices=['quick', 'full', 'web', 'database', 'safe'],
+                       choices=['quick', 'top', 'full', 'web', 'database', 'safe'],
                        help='Profil de scan prédéfini')
     
     parser.add_argument('--threads',
                        type=int,
                        help='Nombre de threads (défaut: 100)')
     
+    parser.add_argument('--engine',
+                       choices=sorted(ENGINES),
+                       help='Moteur de scan: thread (défaut), async, syn (socket brute, CAP_NET_RAW) ou udp')
+    
+    parser.add_argument('--workers',
+                       type=int,
+                       help='Nombre de processus de scan (défaut: 1); le travail est réparti entre eux')
+    
+    parser.add_argument('--serve',
+                       metavar='HOTE:PORT',
+                       help='Mode coordinateur: distribuer le scan aux workers connectés à cette adresse')
+    
+    parser.add_argument('--local-workers',
+                       type=int,
+                       default=0,
+                       help='Workers à lancer localement en mode coordinateur')
+    
+    parser.add_argument('--lease-size',
+                       type=int,
+                       help='Paires (hôte, port) par bail en mode coordinateur (défaut: 4096)')
+    
+    parser.add_argument('--worker',
+                       action='store_true',
+                       help='Mode worker: scanner les baux du coordinateur (--coordinator)')
+    
+    parser.add_argument('--coordinator',
+                       metavar='HOTE:PORT',
+                       help='Adresse du coordinateur pour le mode worker')
+    
+    parser.add_argument('--token',
+                       help='Secret partagé du coordinateur et de ses workers '
+                            '(défaut: distributed.token, sinon tiré au hasard par --serve)')
+    
+    parser.add_argument('--concurrency',
+                       type=int,
+                       help='Connexions simultanées pour le moteur async (défaut: 1000)')
+    
+    parser.add_argument('--syn-rate',
+                       type=int,
+                       help='Paquets SYN par seconde pour le moteur syn (défaut: 1000)')
+    
+    parser.add_argument('--udp-rate',
+                       type=float,
+                       help='Datagrammes par seconde pour le moteur udp (défaut: 200)')
+    
+    parser.add_argument('--udp-retries',
+                       type=int,
+                       help='Retransmissions sans réponse pour le moteur udp (défaut: 2)')
+    
+    parser.add_argument('--max-rate',
+                       type=float,
+                       help='Cadence maximale en ports/seconde (seau à jetons)')
+    
+    parser.add_argument('--min-rate',
+                       type=float,
+                       help='Cadence plancher lorsque le contrôle AIMD ralentit le scan')
+    
     parser.add_argument('--timeout',
                        type=float,
                        help='Timeout en secondes (défaut: 1)')
     
+    parser.add_argument('--fixed-timeout',
+                       action='store_true',
+                       help='Désactiver le timeout adaptatif (basé sur les RTT mesurés)')
+    
+    parser.add_argument('--skip-discovery',
+                       action='store_true',
+                       help='Scanner toutes les cibles sans découverte préalable des hôtes actifs')
+    
+    parser.add_argument('--no-randomize',
+                       action='store_true',
+                       help='Scanner les ports dans l\'ordre au lieu d\'un ordre pseudo-aléatoire')
+    
+    parser.add_argument('--no-banners',
+                       action='store_true',
+                       help='Ne pas récupérer les bannières des ports ouverts')
+    
+    parser.add_argument('--diff-against',
+                       metavar='SCAN',
+                       help='Comparer au scan de référence de l\'historique ("last" ou identifiant)')
+    
+    parser.add_argument('--changed-only',
+                       action='store_true',
+                       help='Scan différentiel: ports ouverts connus d\'abord puis échantillon des autres '
+                            '(implique --diff-against last)')
+    
+    parser.add_argument('--no-history',
+                       action='store_true',
+                       help='Ne pas enregistrer le scan dans l\'historique')
+    
     parser.add_argument('-o', '--output',
                        help='Nom du fichier de sortie (sans extension)')
     
+    parser.add_argument('--checkpoint',
+                       metavar='FICHIER',
+                       help='Enregistrer la progression dans un fichier de checkpoint')
+    
+    parser.add_argument('--resume',
+                       metavar='FICHIER',
+                       help='Reprendre un scan interrompu depuis un fichier de checkpoint')
+    
+    parser.add_argument('--stream',
+                       metavar='FICHIER',
+                       help='Écrire les ports découverts en NDJSON au fil du scan ("-" pour stdout)')
+    
+    parser.add_argument('--stats-interval',
+                       type=float,
+                       default=0,
+                       metavar='SECONDES',
+                       help='Afficher un résumé des métriques du scan toutes les N secondes')
+    
+    parser.add_argument('--stream-summaries',
+                       action='store_true',
+                       help='Ajouter au flux NDJSON des résumés fermés/filtrés par lot')
+    
     parser.add_argument('--no-report',
                        action='store_true',
                        help='Ne pas générer de rapports')
@@ -95,34 +250,94 @@ Exemples d'utilisation:
                        action='store_true',
                        help='Mode verbose')
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.worker and not args.coordinator:
+        parser.error("--worker nécessite --coordinator HOTE:PORT")
+    if not args.worker and not args.target:
+        parser.error("la cible (-t/--target) est obligatoire")
+    return args
+
+def run_worker_mode(args):
+    """
+    Mode worker: traite les baux d'un coordinateur jusqu'à la fin du scan
+    """
+    config = load_config()
+    distributed = (config.get('distributed') or {}) if config else {}
+    worker = ScanWorker(args.coordinator, token=args.token or distributed.get('token'))
+    print_info(f"Worker {worker.worker_id} connecté à {args.coordinator}")
+    try:
+        leases = worker.run()
+    except KeyboardInterrupt:
+        print_error("\nWorker interrompu (ses baux seront réattribués)")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Erreur du worker: {e}")
+        sys.exit(1)
+    print_success(f"Scan terminé: {leases} bail(s) traité(s)")
 
 def main():
     """
     Fonction principale
     """
-    print_banner()
-    
     # Parser les arguments
     args = parse_arguments()
     
+    # Flux NDJSON sur stdout: les messages passent sur stderr
+    stream_output = args.stream
+    if args.stream == '-':
+        stream_output = sys.stdout
+        sys.stdout = sys.stderr
+    
+    print_banner()
+    
+    if args.worker:
+        run_worker_mode(args)
+        return
+    
     # Charger la configuration
     config = load_config()
     
     # Valider la cible
     print_info(f"Validation de la cible: {args.target}")
     
-    if not validate_ip(args.target):
+    target_names = parse_targets(args.target)
+    if not target_names:
         print_error(f"Cible invalide: {args.target}")
         sys.exit(1)
     
-    # Résoudre le nom d'hôte si nécessaire
-    target_ip = resolve_hostname(args.target)
-    if target_ip:
-        print_success(f"Cible résolue: {args.target} -> {target_ip}")
-        target = target_ip
-    else:
-        target = args.target
+    # Résoudre les noms d'hôtes en parallèle (une seule requête par nom)
+    resolved = default_resolver.resolve_many(target_names)
+    targets = []
+    for name in target_names:
+        target_ip = resolved[name]
+        if not target_ip:
+            print_error(f"Cible invalide: {name}")
+            sys.exit(1)
+        
+        if target_ip != name or len(target_names) == 1:
+            print_success(f"Cible résolue: {name} -> {target_ip}")
+        targets.append(target_ip)
+    
+    targets = list(dict.fromkeys(targets))
+    if len(targets) > 1:
+        print_info(f"{len(targets)} cibles à scanner")
+    
+    # Découverte des hôtes actifs: seuls ceux-ci passent au scan de ports
+    discovery_config = (config.get('discovery') or {}) if config else {}
+    if len(targets) > 1 and discovery_config.get('enabled', True) and not args.skip_discovery:
+        discovery = HostDiscovery(
+            timeout=discovery_config.get('timeout', 1.0),
+            ports=discovery_config.get('ports') or DEFAULT_DISCOVERY_PORTS,
+            concurrency=discovery_config.get('concurrency', 256),
+            icmp=discovery_config.get('icmp', True),
+            arp=discovery_config.get('arp', True)
+        )
+        live_hosts = discovery.discover(targets)
+        print_info(f"Découverte: {len(live_hosts)}/{len(targets)} hôte(s) actif(s)")
+        if not live_hosts:
+            print_warning("Aucun hôte actif (forcer le scan avec --skip-discovery)")
+            sys.exit(0)
+        targets = live_hosts
     
     # Déterminer les ports à scanner
     ports = []
@@ -133,57 +348,253 @@ def main():
         if profile:
             print_info(f"Utilisation du profil: {args.profile} - {profile['description']}")
             
-            if profile['ports'] == 'common':
-                ports = get_common_ports_list()
-            else:
-                ports = validate_port_range(profile['ports'])
+            ports = parse_ports(profile['ports'])
             
             threads = args.threads or profile.get('threads', 100)
             timeout = args.timeout or profile.get('timeout', 1)
+            engine = args.engine or profile.get('engine')
+            concurrency = args.concurrency or profile.get('concurrency')
+            syn_rate = args.syn_rate or profile.get('syn_rate')
+            max_rate = args.max_rate or profile.get('max_rate')
+            min_rate = args.min_rate or profile.get('min_rate')
         else:
             print_error(f"Profil non trouvé: {args.profile}")
             sys.exit(1)
-    elif args.ports:
+    elif args.ports or args.top_ports:
         # Utiliser les ports spécifiés
-        if args.ports.lower() == 'common':
-            ports = get_common_ports_list()
-            print_info(f"Scan des {len(ports)} ports communs")
-        else:
-            ports = validate_port_range(args.ports)
-            if not ports:
-                print_error("Ports invalides")
-                sys.exit(1)
+        ports = parse_ports(f"top-{args.top_ports}" if args.top_ports else args.ports)
+        if not ports:
+            print_error("Ports invalides")
+            sys.exit(1)
+        if args.top_ports or not args.ports[0].isdigit():
+            print_info(f"Scan des {len(ports)} ports ({args.ports or f'top-{args.top_ports}'})")
         
         threads = args.threads or (config['scan']['threads'] if config else 100)
         timeout = args.timeout or (config['scan']['timeout'] if config else 1)
+        engine = args.engine or (config['scan'].get('engine') if config else None)
+        concurrency = args.concurrency or (config['scan'].get('concurrency') if config else None)
+        syn_rate = args.syn_rate or (config['scan'].get('syn_rate') if config else None)
+        max_rate = args.max_rate or (config['scan'].get('max_rate') if config else None)
+        min_rate = args.min_rate or (config['scan'].get('min_rate') if config else None)
     else:
         # Scan rapide par défaut
         ports = get_common_ports_list()
         threads = args.threads or 200
         timeout = args.timeout or 0.5
+        engine = args.engine
+        concurrency = args.concurrency
+        syn_rate = args.syn_rate
+        max_rate = args.max_rate
+        min_rate = args.min_rate
         print_info("Aucun port spécifié, scan rapide des ports communs")
     
     if not ports:
         print_error("Aucun port à scanner")
         sys.exit(1)
     
-    print_info(f"Configuration: {len(ports)} ports, {threads} threads, timeout {timeout}s")
+    engine = engine or 'thread'
+    
+    # Timeout adaptatif: le timeout configuré sert de valeur initiale
+    scan_config = config['scan'] if config else {}
+    adaptive_timeout = scan_config.get('adaptive_timeout', False) and not args.fixed_timeout
+    advanced = (config.get('advanced') or {}) if config else {}
+    
+    # Les moteurs par paquets (syn, udp) ont chacun leur cadence
+    if engine == 'udp':
+        rate = args.udp_rate or scan_config.get('udp_rate')
+        retries = args.udp_retries if args.udp_retries is not None else scan_config.get('udp_retries')
+    else:
+        rate = syn_rate
+        retries = None
+    
+    workers = args.workers or scan_config.get('workers', 1)
+    
+    # Budget de descripteurs: une socket par sonde en vol ou bannière en attente
+    if advanced.get('raise_fd_limit', True):
+        raise_fd_limit()
+    default_fd_budget.reserve = advanced.get('fd_reserve', default_fd_budget.reserve)
+    fd_capacity = default_fd_budget.refresh()
+    
+    # Historique des scans: enregistrement, comparaison et scan différentiel
+    history_config = (config.get('history') or {}) if config else {}
+    diff_against = args.diff_against or ('last' if args.changed_only else None)
+    history = None
+    if diff_against or (history_config.get('enabled', True) and not args.no_history):
+        try:
+            history = ScanHistory(history_config.get('path') or DEFAULT_HISTORY)
+        except sqlite3.Error as e:
+            print_warning(f"Historique indisponible: {e}")
+            diff_against = None
+    
+    if args.changed_only and history:
+        protocol = 'udp' if engine == 'udp' else 'tcp'
+        known_open = set(history.known_open_ports(targets, protocol, ports))
+        requested = len(ports)
+        ports = prioritize_ports(ports, known_open, history_config.get('sample_ratio', 0.1))
+        print_info(f"Scan différentiel: {len(known_open.intersection(ports))} port(s) ouvert(s) "
+                   f"connu(s) + échantillon, {len(ports)}/{requested} ports")
+    
+    options = {
+        'adaptive_timeout': adaptive_timeout,
+        'min_timeout': scan_config.get('min_timeout', 0.05),
+        'max_timeout': scan_config.get('max_timeout', 3.0),
+        'max_rate': max_rate,
+        'min_rate': min_rate,
+        'banner_grabbing': advanced.get('banner_grabbing', True) and not args.no_banners,
+        'banner_timeout': advanced.get('banner_timeout', 0.5),
+        'banner_concurrency': advanced.get('banner_concurrency', 50),
+        'randomize': scan_config.get('randomize_ports', True) and not args.no_randomize,
+        'retry_passes': advanced.get('max_retries', 1),
+        'retry_timeout_factor': advanced.get('retry_timeout_factor', 2.0),
+        'retry_rate_factor': advanced.get('retry_rate_factor', 0.5),
+        'retry_max_ratio': advanced.get('retry_max_ratio', 0.5)
+    }
+    if args.changed_only and history:
+        # Ports ouverts connus sondés en premier, même avec l'ordre pseudo-aléatoire
+        options['priority_ports'] = sorted(known_open.intersection(ports))
+    
+    # Instrumentation: seulement si un résumé périodique est demandé
+    metrics = None
+    if args.stats_interval > 0:
+        metrics = ScanMetrics()
+        options['metrics'] = metrics
     
     # Créer le scanner
-    scanner = PortScanner(
-        target=target,
-        ports=ports,
-        timeout=timeout,
-        threads=threads
-    )
+    if args.serve:
+        distributed = (config.get('distributed') or {}) if config else {}
+        scanner = ScanCoordinator(
+            targets,
+            ports,
+            timeout=timeout,
+            engine=engine,
+            threads=threads,
+            concurrency=concurrency,
+            rate=rate,
+            retries=retries,
+            listen=parse_address(args.serve),
+            lease_size=args.lease_size or distributed.get('lease_size', 4096),
+            lease_timeout=distributed.get('lease_timeout', 30),
+            local_workers=args.local_workers,
+            token=args.token or distributed.get('token'),
+            **options
+        )
+        if not (args.token or distributed.get('token')):
+            print_info(f"Secret des workers (--token): {scanner.token}")
+    else:
+        scanner = create_scanner(
+            engine,
+            target=targets,
+            ports=ports,
+            timeout=timeout,
+            threads=threads,
+            concurrency=concurrency,
+            rate=rate,
+            retries=retries,
+            workers=workers,
+            **options
+        )
+    
+    if scanner.engine != engine:
+        print_warning(f"Moteur {engine} indisponible (CAP_NET_RAW requis, IPv4 uniquement), "
+                      f"utilisation du moteur {scanner.engine}")
+    
+    if scanner.engine == 'async':
+        print_info(f"Configuration: {len(ports)} ports x {len(targets)} cible(s), moteur async, {scanner.concurrency} connexions, timeout {timeout}s")
+    elif scanner.engine == 'syn':
+        print_info(f"Configuration: {len(ports)} ports x {len(targets)} cible(s), moteur syn, {scanner.rate_limiter.rate if scanner.rate_limiter else 'max'} paquets/s, timeout {timeout}s")
+    elif scanner.engine == 'udp':
+        print_info(f"Configuration: {len(ports)} ports UDP x {len(targets)} cible(s), {scanner.rate_limiter.rate if scanner.rate_limiter else 'max'} datagrammes/s, timeout {timeout}s, {scanner.retries} retransmission(s)")
+    else:
+        print_info(f"Configuration: {len(ports)} ports x {len(targets)} cible(s), {threads} threads, timeout {timeout}s")
+    
+    if fd_capacity is not None and scanner.engine in ('thread', 'async'):
+        in_flight = scanner.concurrency if scanner.engine == 'async' else scanner.threads
+        if in_flight > fd_capacity:
+            print_warning(f"{in_flight} connexions demandées pour un budget de {fd_capacity} sockets "
+                          f"(RLIMIT_NOFILE): les sondes au-delà attendront une place libre")
+    
+    if args.serve:
+        print_info(f"Mode coordinateur sur {args.serve}, {args.local_workers} worker(s) local(aux)")
+    elif workers > 1:
+        print_info(f"Scan réparti sur {workers} processus")
+    
+    if scanner.rate_controller:
+        print_info(f"Cadence: {scanner.rate_controller.min_rate:g} - {scanner.rate_controller.max_rate:g} ports/s (AIMD)")
+    
+    if adaptive_timeout and scanner.engine not in ('syn', 'udp'):
+        print_info(f"Timeout adaptatif: {scan_config.get('min_timeout', 0.05)}s - "
+                   f"{scan_config.get('max_timeout', 3.0)}s selon les RTT mesurés")
+    
+    # Checkpoint: reprise d'un scan interrompu et sauvegarde périodique
+    checkpoint_path = args.resume or args.checkpoint
+    auto_checkpoint = False
+    if not checkpoint_path:
+        threshold = advanced.get('auto_checkpoint_threshold', 0)
+        if threshold and scanner.total_ports() >= threshold:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            checkpoint_path = f"results/checkpoint_{timestamp}.ckpt"
+            auto_checkpoint = True
+    
+    if args.resume:
+        try:
+            resumed = scanner.resume_from(args.resume)
+        except (OSError, ValueError) as e:
+            print_error(f"Reprise impossible: {e}")
+            sys.exit(1)
+        print_info(f"Reprise: {resumed} paire(s) (hôte, port) déjà scannée(s)")
+    
+    checkpoint = None
+    if checkpoint_path:
+        checkpoint = CheckpointWriter(checkpoint_path, interval=advanced.get('checkpoint_interval', 5))
+        scanner.add_sink(checkpoint)
+        print_info(f"Checkpoint: {checkpoint_path}")
+    
+    stream = None
+    if stream_output:
+        stream = NdjsonSink(stream_output, include_summaries=args.stream_summaries)
+        scanner.add_sink(stream)
+        if args.stream != '-':
+            print_info(f"Flux NDJSON: {args.stream}")
+    
+    stats = None
     
     # Lancer le scan
     try:
         print_success("Démarrage du scan...")
+        if metrics:
+            stats = StatsReporter(metrics, args.stats_interval).start()
         results = scanner.scan(verbose=args.verbose)
+        if stats:
+            stats.stop()
+        
+        if stream:
+            stream.close()
+        if checkpoint:
+            checkpoint.close()
+            if auto_checkpoint:
+                os.remove(checkpoint_path)
         
         print_success(f"Scan terminé en {format_scan_time(results['duration'])}")
         print_success(f"Ports ouverts trouvés: {len(results['open_ports'])}")
+        if results.get('retried_ports'):
+            print_info(f"Ports filtrés relancés: {results['retried_ports']}")
+        
+        if history:
+            try:
+                if diff_against:
+                    results['changes'] = history.diff(results, ports, diff_against)
+                if history_config.get('enabled', True) and not args.no_history:
+                    scan_id = history.record(results, ports)
+                    print_info(f"Scan enregistré dans l'historique (#{scan_id})")
+            except (sqlite3.Error, ValueError) as e:
+                print_warning(f"Historique: {e}")
+            finally:
+                history.close()
+        
+        if results.get('changes'):
+            changes = results['changes']
+            print_success(f"Changements: {len(changes['opened'])} port(s) ouvert(s), "
+                          f"{len(changes['closed'])} port(s) fermé(s)")
         
         # Générer les rapports
         if not args.no_report:
@@ -192,6 +603,7 @@ def main():
             # Rapport console (toujours affiché sauf si --json-only ou --html-only)
             if not (args.json_only or args.html_only):
                 reporter.print_console_report()
+                reporter.print_changes()
             
             # Rapports fichiers
             if not args.json_only and not args.html_only:
@@ -211,12 +623,25 @@ def main():
             print_warning(f"\nATTENTION: {len(dangerous_found)} port(s) potentiellement dangereux détecté(s)!")
             for port_data in dangerous_found:
                 port_info = get_port_info(port_data['port'])
-                print_warning(f"  Port {port_data['port']}: {port_info['danger_info']}")
+                host_prefix = f"{port_data['host']} " if len(targets) > 1 else ""
+                print_warning(f"  {host_prefix}Port {port_data['port']}: {port_info['danger_info']}")
         
     except KeyboardInterrupt:
         print_error("\nScan interrompu par l'utilisateur")
+        if stats:
+            stats.stop()
+        if stream:
+            stream.close()
+        if checkpoint:
+            checkpoint.close()
+            print_warning(f"Progression sauvegardée, reprendre avec: --resume {checkpoint_path}")
         sys.exit(1)
     except Exception as e:
+        if stream:
+            stream.close()
+        if checkpoint:
+            checkpoint.close()
+            print_warning(f"Progression sauvegardée, reprendre avec: --resume {checkpoint_path}")
         print_error(f"Erreur lors du scan: {e}")
         if args.verbose:
             import traceback
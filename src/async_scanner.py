@@ -0,0 +1,183 @@
+"""
+Moteur de scan asynchrone (asyncio)
+"""
+import asyncio
+import time
+from datetime import datetime
+from scanner import PortScanner
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from fd_budget import EXHAUSTED_BACKOFF, is_exhausted
+
+class AsyncPortScanner(PortScanner):
+    engine = 'async'
+
+    def __init__(self, target, ports, timeout=1, concurrency=1000, **kwargs):
+        """
+        Initialise le scanner asynchrone
+
+        Args:
+            target: Adresse IP ou nom d'hôte cible, ou liste de cibles
+            ports: Liste des ports à scanner
+            timeout: Timeout pour chaque connexion (secondes)
+            concurrency: Nombre maximum de connexions simultanées
+        """
+        super().__init__(target, ports, timeout=timeout, **kwargs)
+        self.concurrency = concurrency
+
+    async def scan_port_async(self, host, port):
+        """
+        Scan un port unique sans bloquer la boucle d'événements
+
+        Retourne True si la connexion a été confiée à l'étape des bannières
+        (qui libère alors sa place dans le budget de descripteurs).
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.connect_started()
+        while True:
+            started = time.monotonic()
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port),
+                    timeout=self.get_timeout(host)
+                )
+            except asyncio.TimeoutError:
+                if metrics is not None:
+                    metrics.connect_finished('timeout')
+                self.record(host, port, STATE_FILTERED)
+                return False
+            except ConnectionRefusedError as e:
+                rtt = time.monotonic() - started
+                self.observe_rtt(host, rtt)
+                if metrics is not None:
+                    metrics.connect_finished(e.errno, rtt)
+                self.record(host, port, STATE_CLOSED)
+                return False
+            except OSError as e:
+                if is_exhausted(e) and not self.cancelled:
+                    # Plus de descripteurs: attendre qu'une socket se libère, puis retenter
+                    if self.fd_budget:
+                        self.fd_budget.shrink()
+                    await asyncio.sleep(EXHAUSTED_BACKOFF)
+                    continue
+                if metrics is not None:
+                    metrics.connect_finished(e.errno if e.errno is not None else 'exception')
+                # Hôte injoignable, réseau absent...: aucune réponse du port (comme le moteur à threads)
+                self.record(host, port, STATE_FILTERED)
+                return False
+            except BaseException:
+                # Annulation de la tâche: la connexion n'est plus en vol
+                if metrics is not None:
+                    metrics.connect_finished('cancelled')
+                raise
+            break
+
+        rtt = time.monotonic() - started
+        self.observe_rtt(host, rtt)
+        if metrics is not None:
+            metrics.connect_finished(None, rtt)
+
+        if writer.get_extra_info('sockname') == writer.get_extra_info('peername'):
+            # Auto-connexion TCP sur un port éphémère local: rien n'écoute
+            writer.close()
+            self.record(host, port, STATE_CLOSED)
+            return False
+
+        if self.banner_grabber:
+            # Étape séparée: libère tout de suite la place de découverte
+            task = asyncio.ensure_future(self.grab_banner_async(host, port, reader, writer))
+            self.banner_tasks.add(task)
+            task.add_done_callback(self.banner_tasks.discard)
+            return True
+
+        self.record(host, port, STATE_OPEN)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return False
+
+    async def grab_banner_async(self, host, port, reader, writer):
+        """
+        Lit la bannière d'un port ouvert, avec sa propre limite de concurrence
+        """
+        banner = ''
+        try:
+            async with self.banner_semaphore:
+                banner = await self.banner_grabber.grab_async(reader, writer, host, port)
+        finally:
+            # Toujours enregistré: libère aussi la place de la socket dans le budget
+            self.record_banner(host, port, banner)
+
+    async def _run(self, progress_bar):
+        """
+        Lance les connexions en limitant le nombre en vol par un sémaphore
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        self.banner_tasks = set()
+        if self.banner_grabber:
+            self.banner_semaphore = asyncio.Semaphore(self.banner_grabber.concurrency)
+
+        budget = self.fd_budget
+
+        async def bounded_scan(host, port):
+            handed_off = False
+            try:
+                handed_off = await self.scan_port_async(host, port)
+            finally:
+                if budget and not handed_off:
+                    budget.release()
+                semaphore.release()
+                progress_bar.update(1)
+
+        for host, port in self.work_items():
+            if self.rate_limiter:
+                delay = self.rate_limiter.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await semaphore.acquire()
+            if budget:
+                await budget.acquire_async()
+            task = asyncio.ensure_future(bounded_scan(host, port))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        if self.banner_tasks:
+            await asyncio.gather(*self.banner_tasks)
+
+    def run_pass(self, progress_bar):
+        """
+        Sonde les paires dans une boucle asyncio
+        """
+        asyncio.run(self._run(progress_bar))
+
+    def scan(self, verbose=True):
+        """
+        Lance le scan de tous les ports dans une boucle asyncio
+        """
+        self.start_time = datetime.now()
+        total = self.remaining_ports()
+
+        if verbose:
+            print(f"\n[*] Démarrage du scan asynchrone sur {self.target}")
+            print(f"[*] Nombre de ports à scanner: {total}")
+            print(f"[*] Connexions simultanées: {self.concurrency}")
+            print(f"[*] Timeout: {self.timeout}s\n")
+
+        progress_bar = self.create_progress(total)
+
+        self.run_pass(progress_bar)
+
+        progress_bar.close()
+
+        self.retry_filtered(verbose)
+        self.end_time = datetime.now()
+
+        self.store.merge()
+        self.flush_sinks()
+
+        return self.get_results()
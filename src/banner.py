@@ -0,0 +1,238 @@
+"""
+Récupération des bannières, étape séparée de la découverte des ports
+
+La découverte ne fait que transmettre les connexions ouvertes: la lecture des
+bannières dispose de son propre pool, de son propre timeout de lecture et
+d'une sonde adaptée au service (voir port_db.BANNER_PROBES).
+"""
+import asyncio
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from port_db import get_banner_probe
+
+MAX_BANNER = 1024
+HTTP_HEAD = 'HEAD / HTTP/1.0\r\nHost: {host}\r\nUser-Agent: port-scanner\r\n\r\n'
+NUDGE = b'\r\n'
+
+# Nom de la sonde: (poignée de main TLS, requête envoyée, relance si le serveur reste muet)
+PROBES = {
+    'greeting': (False, None, False),
+    'generic': (False, None, True),
+    'http': (False, HTTP_HEAD, False),
+    'tls': (True, None, False),
+    'tls-http': (True, HTTP_HEAD, False)
+}
+
+_tls_context = None
+
+def tls_context():
+    """
+    Contexte TLS client sans vérification (on identifie le service, on ne s'y fie pas)
+    """
+    global _tls_context
+    if _tls_context is None:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        _tls_context = context
+    return _tls_context
+
+def build_request(payload, host):
+    """
+    Prépare la requête d'une sonde pour un hôte
+    """
+    if ':' in host:
+        host = f'[{host}]'
+    return payload.format(host=host).encode('ascii', errors='ignore')
+
+def describe_tls(ssl_object):
+    """
+    Résumé de la session TLS négociée (version et suite de chiffrement)
+    """
+    if ssl_object is None:
+        return ''
+    cipher = ssl_object.cipher()
+    version = ssl_object.version() or 'TLS'
+    return f"{version} {cipher[0]}" if cipher else version
+
+def format_banner(data, tls_info=None):
+    """
+    Met en forme une bannière (ligne de statut et en-tête Server pour HTTP)
+    """
+    text = data.decode('utf-8', errors='ignore').strip()
+    if text.startswith('HTTP/'):
+        lines = text.splitlines()
+        parts = [lines[0].strip()]
+        for line in lines[1:]:
+            if line.lower().startswith('server:'):
+                parts.append(line.strip())
+                break
+        text = ' | '.join(parts)
+    if tls_info:
+        return f"[{tls_info}] {text}" if text else tls_info
+    return text
+
+class BannerGrabber:
+    """
+    Étape de récupération des bannières
+
+    Les connexions ouvertes lui sont confiées par les workers de découverte
+    (submit) ou par la boucle asyncio (grab_async); le résultat est transmis
+    à on_banner(hôte, port, bannière).
+    """
+
+    def __init__(self, on_banner, read_timeout=0.5, concurrency=50, executor=None):
+        """
+        Args:
+            on_banner: Fonction appelée avec (hôte, port, bannière)
+            read_timeout: Timeout de lecture de la bannière (secondes)
+            concurrency: Nombre de bannières lues simultanément
+            executor: Pool de lecture partagé et persistant (défaut: pool propre au scan)
+        """
+        self.on_banner = on_banner
+        self.read_timeout = read_timeout
+        self.concurrency = concurrency
+        self.shared_executor = executor
+        self.executor = None
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def _recv(self, sock, http):
+        data = b''
+        try:
+            while len(data) < MAX_BANNER:
+                chunk = sock.recv(MAX_BANNER - len(data))
+                if not chunk:
+                    break
+                data += chunk
+                if not http or b'\r\n\r\n' in data:
+                    break
+        except OSError:
+            pass
+        return data
+
+    def grab(self, sock, host, port):
+        """
+        Lit la bannière d'une connexion établie (bloquant) puis ferme la socket
+        """
+        use_tls, payload, nudge = PROBES[get_banner_probe(port)]
+        data = b''
+        tls_info = None
+        try:
+            sock.settimeout(self.read_timeout)
+            if use_tls:
+                sock = tls_context().wrap_socket(sock)
+                tls_info = describe_tls(sock)
+            if payload:
+                sock.sendall(build_request(payload, host))
+            data = self._recv(sock, http=bool(payload))
+            if not data and nudge:
+                sock.sendall(NUDGE)
+                data = self._recv(sock, http=False)
+        except OSError:
+            pass
+        finally:
+            sock.close()
+        return format_banner(data, tls_info)
+
+    def _grab_and_report(self, sock, host, port):
+        banner = None
+        try:
+            banner = self.grab(sock, host, port)
+        finally:
+            # Rapporté même en cas d'erreur: on_banner libère le créneau de la socket
+            self.on_banner(host, port, banner)
+
+    def submit(self, sock, host, port):
+        """
+        Confie une connexion ouverte au pool de lecture (la socket lui appartient)
+        """
+        if self.shared_executor is not None:
+            future = self.shared_executor.submit(self._grab_and_report, sock, host, port)
+            with self.lock:
+                self.pending.add(future)
+            future.add_done_callback(self._discard)
+            return
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                   thread_name_prefix='banner')
+            self.executor.submit(self._grab_and_report, sock, host, port)
+
+    def _discard(self, future):
+        with self.lock:
+            self.pending.discard(future)
+
+    def wait(self):
+        """
+        Attend la fin des lectures en cours
+        """
+        if self.shared_executor is not None:
+            # Pool partagé: attendre seulement les lectures de ce scan
+            while True:
+                with self.lock:
+                    pending = list(self.pending)
+                if not pending:
+                    return
+                futures_wait(pending)
+        with self.lock:
+            executor = self.executor
+            self.executor = None
+        if executor:
+            executor.shutdown(wait=True)
+
+    async def _read_async(self, reader, http):
+        data = b''
+        try:
+            while len(data) < MAX_BANNER:
+                chunk = await asyncio.wait_for(reader.read(MAX_BANNER - len(data)),
+                                               timeout=self.read_timeout)
+                if not chunk:
+                    break
+                data += chunk
+                if not http or b'\r\n\r\n' in data:
+                    break
+        except (asyncio.TimeoutError, OSError):
+            pass
+        return data
+
+    async def grab_async(self, reader, writer, host, port):
+        """
+        Lit la bannière d'une connexion asyncio établie puis la ferme
+        """
+        use_tls, payload, nudge = PROBES[get_banner_probe(port)]
+        data = b''
+        tls_info = None
+        try:
+            if use_tls and hasattr(writer, 'start_tls'):
+                # Python 3.11+: mise à niveau TLS de la connexion déjà ouverte
+                await asyncio.wait_for(writer.start_tls(tls_context()), timeout=self.read_timeout)
+                tls_info = describe_tls(writer.get_extra_info('ssl_object'))
+            elif use_tls:
+                # Nouvelle connexion chiffrée, ouverte une fois la socket en clair
+                # fermée: elle reprend sa place dans le budget de descripteurs
+                writer.close()
+                await asyncio.wait_for(writer.wait_closed(), timeout=self.read_timeout)
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=tls_context()),
+                    timeout=self.read_timeout
+                )
+                tls_info = describe_tls(writer.get_extra_info('ssl_object'))
+            if payload:
+                writer.write(build_request(payload, host))
+                await writer.drain()
+            data = await self._read_async(reader, http=bool(payload))
+            if not data and nudge:
+                writer.write(NUDGE)
+                await writer.drain()
+                data = await self._read_async(reader, http=False)
+        except (asyncio.TimeoutError, OSError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), timeout=self.read_timeout)
+            except (asyncio.TimeoutError, OSError):
+                pass
+        return format_banner(data, tls_info)
@@ -0,0 +1,139 @@
+"""
+Points de reprise (checkpoints) des scans
+
+Le fichier est en ajout seul: une ligne d'en-tête puis des enregistrements
+binaires compacts. Les hôtes sont déclarés une seule fois (enregistrement
+'H') puis référencés par leur index dans les enregistrements de port ('P').
+Un enregistrement tronqué (arrêt brutal pendant l'écriture) est ignoré à la
+relecture.
+
+    H | index (I) | longueur (H) | nom
+    P | index (I) | port (H) | état (B) | longueur bannière (H) | bannière
+"""
+import os
+import struct
+from sinks import BatchedSink
+
+MAGIC = b'PORTSCAN-CHECKPOINT 1\n'
+
+HOST_RECORD = b'H'
+PORT_RECORD = b'P'
+HOST_FORMAT = struct.Struct('!IH')
+PORT_FORMAT = struct.Struct('!IHBH')
+
+MAX_BANNER = 1024
+
+class CheckpointWriter(BatchedSink):
+    """
+    Sink de résultats qui écrit les paires (hôte, port) terminées par lots
+    """
+
+    def __init__(self, path, interval=5.0, batch_size=4096):
+        """
+        Args:
+            path: Fichier de checkpoint (complété s'il existe déjà)
+            interval: Période d'écriture des lots (secondes)
+            batch_size: Nombre de résultats en attente déclenchant une écriture
+        """
+        super().__init__(interval=interval, batch_size=batch_size)
+        self.path = path
+        self.host_index = {}
+        self.next_index = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # Reprendre la numérotation des hôtes déjà déclarés et écarter
+            # un éventuel enregistrement tronqué avant d'ajouter la suite
+            hosts, valid_end = load_checkpoint(path)
+            self.host_index = {host: index for index, host in enumerate(hosts)
+                               if host is not None}
+            self.next_index = len(hosts)
+            self.file = open(path, 'r+b')
+            self.file.truncate(valid_end)
+            self.file.seek(valid_end)
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(MAGIC)
+            self.file.flush()
+
+        self.start()
+
+    def write_batch(self, batch):
+        """
+        Encode et écrit un lot de résultats
+        """
+        chunks = []
+        for host, port, state, banner in batch:
+            index = self.host_index.get(host)
+            if index is None:
+                index = self.next_index
+                self.next_index += 1
+                self.host_index[host] = index
+                name = host.encode('utf-8')
+                chunks.append(HOST_RECORD + HOST_FORMAT.pack(index, len(name)) + name)
+
+            data = (banner or '').encode('utf-8', errors='ignore')[:MAX_BANNER]
+            chunks.append(PORT_RECORD + PORT_FORMAT.pack(index, port, state, len(data)) + data)
+
+        if chunks:
+            self.file.write(b''.join(chunks))
+            self.file.flush()
+
+    def close_output(self):
+        self.file.close()
+
+def load_checkpoint(path, on_record=None):
+    """
+    Relit un fichier de checkpoint
+
+    Args:
+        path: Fichier de checkpoint
+        on_record: Fonction appelée pour chaque port (hôte, port, état, bannière)
+
+    Retourne (hôtes, fin_valide): la liste des hôtes déclarés et la position
+    de la fin du dernier enregistrement complet
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Fichier de checkpoint invalide: {path}")
+
+    hosts = []
+    offset = valid_end = len(MAGIC)
+    size = len(data)
+
+    while offset < size:
+        kind = data[offset:offset + 1]
+        offset += 1
+        if kind == HOST_RECORD:
+            if offset + HOST_FORMAT.size > size:
+                break
+            index, length = HOST_FORMAT.unpack_from(data, offset)
+            offset += HOST_FORMAT.size
+            if offset + length > size:
+                break
+            name = data[offset:offset + length].decode('utf-8')
+            offset += length
+            hosts.extend([None] * (index + 1 - len(hosts)))
+            hosts[index] = name
+        elif kind == PORT_RECORD:
+            if offset + PORT_FORMAT.size > size:
+                break
+            index, port, state, length = PORT_FORMAT.unpack_from(data, offset)
+            offset += PORT_FORMAT.size
+            if offset + length > size:
+                break
+            banner = data[offset:offset + length].decode('utf-8', errors='ignore')
+            offset += length
+            if on_record and index < len(hosts) and hosts[index] is not None:
+                on_record(hosts[index], port, state, banner)
+        else:
+            # Enregistrement corrompu: ignorer la fin du fichier
+            break
+        valid_end = offset
+
+    return hosts, valid_end
@@ -0,0 +1,210 @@
+"""
+Découverte des hôtes actifs avant le scan de ports
+
+Trois sondes complémentaires, lancées en parallèle sur toutes les cibles:
+    - connexion TCP vers quelques ports courants: une acceptation ou un RST
+      suffit à prouver que l'hôte répond
+    - écho ICMP (socket ICMP non privilégiée ou socket brute) si le système
+      le permet
+    - table ARP du noyau (/proc/net/arp): sur le segment local, une adresse
+      résolue pendant les sondes est active même si elle ne répond à rien
+"""
+import asyncio
+import errno
+import os
+import select
+import socket
+import struct
+import threading
+import time
+from syn_scanner import checksum, is_ipv4
+
+DEFAULT_DISCOVERY_PORTS = (80, 443, 22, 445, 3389)
+ARP_TABLE = '/proc/net/arp'
+ARP_COMPLETE = 0x2
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# Erreurs de connexion prouvant que l'hôte a répondu
+ALIVE_ERRORS = (errno.ECONNREFUSED, errno.ECONNRESET)
+
+def build_echo_request(identifier, sequence, payload=b'portscan'):
+    """
+    Paquet ICMP echo request
+    """
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, identifier, sequence)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum(header + payload),
+                       identifier, sequence) + payload
+
+def open_icmp_socket():
+    """
+    Socket ICMP: non privilégiée si net.ipv4.ping_group_range le permet,
+    sinon brute (CAP_NET_RAW); None si aucune n'est disponible
+
+    Retourne (socket, brute)
+    """
+    for kind, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+        try:
+            return socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP), raw
+        except OSError:
+            continue
+    return None, False
+
+def read_arp_table(path=ARP_TABLE):
+    """
+    Adresses IPv4 résolues dans la table ARP du noyau
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()[1:]
+    except OSError:
+        return set()
+
+    resolved = set()
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 4 and int(fields[2], 16) & ARP_COMPLETE \
+                and fields[3] != '00:00:00:00:00:00':
+            resolved.add(fields[0])
+    return resolved
+
+class HostDiscovery:
+    """
+    Découverte des hôtes actifs parmi une liste de cibles
+    """
+
+    def __init__(self, timeout=1.0, ports=DEFAULT_DISCOVERY_PORTS, concurrency=256,
+                 icmp=True, arp=True):
+        """
+        Args:
+            timeout: Délai d'attente des réponses (secondes)
+            ports: Ports TCP sondés sur chaque hôte
+            concurrency: Connexions TCP simultanées
+            icmp: Envoyer des échos ICMP (si le système le permet)
+            arp: Consulter la table ARP pour les hôtes du segment local
+        """
+        self.timeout = timeout
+        self.ports = list(ports)
+        self.concurrency = concurrency
+        self.icmp = icmp
+        self.arp = arp
+        self.alive = {}
+        self.lock = threading.Lock()
+
+    def mark_alive(self, host, method):
+        with self.lock:
+            self.alive.setdefault(host, method)
+
+    async def tcp_probe(self, host, port, semaphore):
+        """
+        Connexion TCP: True si l'hôte a répondu (acceptation ou RST)
+        """
+        async with semaphore:
+            if host in self.alive:
+                return True
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+            except OSError as e:
+                return e.errno in ALIVE_ERRORS
+            writer.close()
+            return True
+
+    async def probe_host(self, host, semaphore):
+        """
+        Sonde les ports TCP d'un hôte jusqu'à la première réponse
+        """
+        tasks = [asyncio.ensure_future(self.tcp_probe(host, port, semaphore))
+                 for port in self.ports]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                if await next_result:
+                    self.mark_alive(host, 'tcp')
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def tcp_sweep(self, hosts):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self.probe_host(host, semaphore) for host in hosts))
+
+    def icmp_sweep(self, hosts, stop_event):
+        """
+        Envoie un écho ICMP à chaque hôte IPv4 et collecte les réponses
+        jusqu'à stop_event
+        """
+        sock, raw = open_icmp_socket()
+        if sock is None:
+            return
+        identifier = os.getpid() & 0xffff
+        targets = set(host for host in hosts if is_ipv4(host))
+
+        try:
+            sock.setblocking(False)
+            for sequence, host in enumerate(targets):
+                try:
+                    sock.sendto(build_echo_request(identifier, sequence & 0xffff), (host, 0))
+                except OSError:
+                    continue
+
+            while not stop_event.is_set():
+                readable, _, _ = select.select([sock], [], [], 0.05)
+                if not readable:
+                    continue
+                try:
+                    packet, address = sock.recvfrom(2048)
+                except OSError:
+                    continue
+                if raw:
+                    # Socket brute: en-tête IP avant le message ICMP
+                    packet = packet[(packet[0] & 0x0f) * 4:]
+                if len(packet) < 8:
+                    continue
+                icmp_type, _, _, reply_id, _ = struct.unpack('!BBHHH', packet[:8])
+                if icmp_type != ICMP_ECHO_REPLY or (raw and reply_id != identifier):
+                    continue
+                if address[0] in targets:
+                    self.mark_alive(address[0], 'icmp')
+        finally:
+            sock.close()
+
+    def discover(self, hosts):
+        """
+        Hôtes actifs parmi `hosts`, dans l'ordre d'origine
+
+        La méthode de détection de chaque hôte est disponible dans `alive`
+        ('tcp', 'icmp' ou 'arp').
+        """
+        hosts = list(hosts)
+        self.alive = {}
+        stop_event = threading.Event()
+        pinger = None
+        if self.icmp:
+            pinger = threading.Thread(target=self.icmp_sweep, args=(hosts, stop_event), daemon=True)
+            pinger.start()
+
+        started = time.monotonic()
+        try:
+            asyncio.run(self.tcp_sweep(hosts))
+            # Laisser aux échos ICMP au moins un timeout complet
+            remaining = self.timeout - (time.monotonic() - started)
+            if pinger and remaining > 0 and len(self.alive) < len(hosts):
+                stop_event.wait(remaining)
+        finally:
+            stop_event.set()
+            if pinger:
+                pinger.join()
+
+        if self.arp:
+            targets = set(hosts)
+            for host in read_arp_table():
+                if host not in self.alive and host in targets:
+                    self.mark_alive(host, 'arp')
+
+        return [host for host in hosts if host in self.alive]
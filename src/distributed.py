@@ -0,0 +1,518 @@
+"""
+Scan distribué: un coordinateur et des workers
+
+Le coordinateur découpe l'espace cibles x ports en baux (leases) et les sert
+en HTTP/JSON. Chaque worker demande un bail, le scanne avec son propre moteur,
+renouvelle le bail tant qu'il travaille puis renvoie un résultat compact (un
+octet d'état par paire, bannières des ports ouverts). Un bail non renouvelé à
+temps (worker arrêté) est réattribué; un résultat arrivé après la fin du bail,
+ou envoyé par un autre worker que celui qui le détient, est ignoré. Chaque
+requête porte le secret partagé du scan (en-tête X-Scan-Token): sans lui, le
+coordinateur répond 403.
+
+    POST /lease   {worker}                          -> bail, {wait} ou {done}
+    POST /renew   {worker, lease}                   -> {renewed}
+    POST /result  {worker, lease, states, banners}  -> {accepted}
+"""
+import base64
+import hmac
+import json
+import multiprocessing
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scanner import PortScanner, LOCAL_OPTIONS
+from results import STATE_OPEN, STATE_FILTERED, STATE_UNKNOWN
+
+DEFAULT_PORT = 8765
+TOKEN_HEADER = 'X-Scan-Token'
+# Hôtes par bail au plus: chaque hôte coûte au worker une table d'états et un
+# estimateur de RTT, quelle que soit la taille du bail
+MAX_LEASE_HOSTS = 256
+
+class CoordinatorError(Exception):
+    """
+    Requête refusée par le coordinateur (jeton invalide, requête mal formée):
+    erreur fatale pour le worker, contrairement à un coordinateur injoignable
+    """
+
+def parse_address(address, default_port=DEFAULT_PORT):
+    """
+    Convertit 'hôte:port' (ou '[ipv6]:port') en tuple (hôte, port)
+    """
+    host, port = address, default_port
+    if address.startswith('['):
+        host, _, rest = address[1:].partition(']')
+        if rest.startswith(':'):
+            port = int(rest[1:])
+    elif address.count(':') == 1:
+        host, port = address.split(':')
+        port = int(port)
+    return host or '127.0.0.1', port
+
+def encode_results(scanner, targets, ports):
+    """
+    Résultat compact d'un bail: états dans l'ordre (port, hôte) et bannières
+    des ports ouverts indexées par position
+    """
+    scanner.store.merge()
+    tables = [scanner.store.table(host) for host in targets]
+    states = bytearray()
+    banners = {}
+    for port in ports:
+        for table in tables:
+            state = table.get(port)
+            if state == STATE_OPEN and table.banners.get(port):
+                banners[str(len(states))] = table.banners[port]
+            states.append(state)
+    return {
+        'states': base64.b64encode(bytes(states)).decode('ascii'),
+        'banners': banners
+    }
+
+def decode_results(targets, ports, payload):
+    """
+    Génère les résultats (hôte, port, état, bannière) d'un bail
+    """
+    states = base64.b64decode(payload['states'])
+    if len(states) != len(targets) * len(ports):
+        raise ValueError("Taille de résultat incohérente avec le bail")
+    if states and max(states) > STATE_FILTERED:
+        raise ValueError("État de port invalide")
+    banners = payload.get('banners') or {}
+    index = 0
+    for port in ports:
+        for host in targets:
+            yield host, port, states[index], banners.get(str(index))
+            index += 1
+
+class Lease:
+    """
+    Portion cibles x ports confiée à un worker
+    """
+    __slots__ = ('id', 'targets', 'ports', 'worker', 'deadline', 'attempts', 'done')
+
+    def __init__(self, lease_id, targets, ports):
+        self.id = lease_id
+        self.targets = targets
+        self.ports = ports
+        self.worker = None
+        self.deadline = 0.0
+        self.attempts = 0
+        self.done = False
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """
+    Requêtes JSON des workers
+    """
+
+    def do_POST(self):
+        coordinator = self.server.coordinator
+        routes = {
+            '/lease': coordinator.assign,
+            '/renew': coordinator.renew,
+            '/result': coordinator.complete
+        }
+        route = routes.get(self.path)
+        if route is None:
+            self.reply(404, {'error': 'route inconnue'})
+            return
+        token = self.headers.get(TOKEN_HEADER, '')
+        if not hmac.compare_digest(token.encode('utf-8'), coordinator.token.encode('utf-8')):
+            self.reply(403, {'error': 'jeton invalide'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            self.reply(200, route(request))
+        except (ValueError, KeyError, TypeError) as e:
+            self.reply(400, {'error': str(e)})
+
+    def reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class CoordinatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+class CoordinatorServer6(CoordinatorServer):
+    address_family = socket.AF_INET6
+
+class ScanCoordinator(PortScanner):
+    """
+    Scanner qui confie le travail à des workers distants et fusionne leurs résultats
+    """
+
+    def __init__(self, target, ports, timeout=1, engine='thread', threads=100,
+                 concurrency=None, rate=None, retries=None, listen=('127.0.0.1', DEFAULT_PORT),
+                 lease_size=4096, lease_timeout=30.0, local_workers=0, token=None, **kwargs):
+        """
+        Args:
+            target: Adresse IP ou nom d'hôte cible, ou liste de cibles
+            ports: Liste des ports à scanner
+            timeout: Timeout pour chaque connexion (secondes)
+            engine: Moteur utilisé par les workers
+            threads, concurrency: Parallélisme de chaque worker
+            rate: Paquets par seconde de chaque worker (moteurs syn/udp)
+            retries: Retransmissions (moteur udp)
+            listen: Adresse d'écoute (hôte, port); port 0 pour un port libre
+            lease_size: Nombre de paires (hôte, port) par bail
+            lease_timeout: Délai sans renouvellement avant réattribution (secondes)
+            local_workers: Workers à lancer sur cette machine (processus locaux)
+            token: Secret partagé exigé des workers (défaut: tiré au hasard)
+            kwargs: Options communes des scanners, transmises aux workers
+        """
+        super().__init__(target, ports, timeout=timeout, threads=threads, **kwargs)
+        self.engine = engine
+        self.protocol = 'udp' if engine == 'udp' else 'tcp'
+        self.listen = listen
+        self.lease_size = max(1, lease_size)
+        self.lease_timeout = lease_timeout
+        self.local_workers = local_workers
+        self.token = token or secrets.token_urlsafe(16)
+        self.job = {
+            'engine': engine,
+            'settings': {
+                'timeout': timeout,
+                'threads': threads,
+                'concurrency': concurrency,
+                'rate': rate,
+                'retries': retries
+            },
+            'options': {key: value for key, value in kwargs.items() if key not in LOCAL_OPTIONS}
+        }
+
+        self.leases = []
+        self.pending = deque()
+        self.active = {}
+        self.recorded = 0
+        self.workers_seen = set()
+        self.workers_done = set()
+        self.finished = threading.Event()
+        self.ready = threading.Event()
+        self.server = None
+
+        # Le coordinateur ne fait qu'enregistrer: ni cadence ni bannières ici
+        self.rate_limiter = None
+        self.rate_controller = None
+        self.banner_grabber = None
+
+    @property
+    def address(self):
+        """
+        Adresse effective du coordinateur ('hôte:port')
+        """
+        host, port = self.server.server_address[:2]
+        return f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+
+    def build_leases(self):
+        """
+        Découpe les paires restantes en baux d'environ lease_size paires
+        (et d'au plus MAX_LEASE_HOSTS hôtes)
+        """
+        host_chunk = min(len(self.targets), self.lease_size, MAX_LEASE_HOSTS)
+        port_chunk = max(1, self.lease_size // host_chunk)
+        for start in range(0, len(self.targets), host_chunk):
+            targets = self.targets[start:start + host_chunk]
+            tables = [self.store.table(host) for host in targets]
+            for offset in range(0, len(self.ports), port_chunk):
+                ports = self.ports[offset:offset + port_chunk]
+                if self.resumed_count and all(table.get(port) != STATE_UNKNOWN
+                                              for port in ports for table in tables):
+                    continue
+                lease = Lease(len(self.leases), targets, ports)
+                self.leases.append(lease)
+                self.pending.append(lease)
+        if not self.leases:
+            self.finished.set()
+
+    def assign(self, request):
+        """
+        Attribue un bail libre ou expiré au worker
+        """
+        worker = str(request['worker'])
+        now = time.monotonic()
+        with self.lock:
+            self.workers_seen.add(worker)
+            if self.finished.is_set():
+                self.workers_done.add(worker)
+                return {'done': True}
+
+            for lease in list(self.active.values()):
+                if lease.deadline <= now:
+                    # Worker silencieux: le bail repart dans la file
+                    del self.active[lease.id]
+                    self.pending.append(lease)
+
+            if not self.pending:
+                return {'wait': min(1.0, self.lease_timeout / 2)}
+
+            lease = self.pending.popleft()
+            lease.worker = worker
+            lease.deadline = now + self.lease_timeout
+            lease.attempts += 1
+            self.active[lease.id] = lease
+
+        return {
+            'lease': lease.id,
+            'targets': lease.targets,
+            'ports': lease.ports,
+            'renew_interval': self.lease_timeout / 3,
+            **self.job
+        }
+
+    def renew(self, request):
+        """
+        Prolonge un bail tant que son worker travaille
+        """
+        with self.lock:
+            lease = self.active.get(int(request['lease']))
+            if lease is None or lease.worker != str(request['worker']):
+                return {'renewed': False}
+            lease.deadline = time.monotonic() + self.lease_timeout
+        return {'renewed': True}
+
+    def complete(self, request):
+        """
+        Enregistre le résultat d'un bail envoyé par le worker qui le détient
+        (le premier reçu l'emporte)
+        """
+        lease_id = int(request['lease'])
+        if not 0 <= lease_id < len(self.leases):
+            raise ValueError(f"Bail inconnu: {lease_id}")
+        lease = self.leases[lease_id]
+        items = list(decode_results(lease.targets, lease.ports, request))
+
+        with self.lock:
+            if lease.done or lease.worker != str(request['worker']):
+                return {'accepted': False}
+            lease.done = True
+            self.active.pop(lease.id, None)
+            if lease in self.pending:
+                self.pending.remove(lease)
+
+        for host, port, state, banner in items:
+            self.record(host, port, state, banner)
+        if self.progress:
+            self.progress.update(len(items))
+
+        with self.lock:
+            self.recorded += 1
+            if self.recorded == len(self.leases):
+                self.finished.set()
+        return {'accepted': True}
+
+    def start_server(self):
+        """
+        Démarre le serveur HTTP des workers
+        """
+        server_class = CoordinatorServer6 if ':' in self.listen[0] else CoordinatorServer
+        self.server = server_class(self.listen, CoordinatorHandler)
+        self.server.coordinator = self
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.ready.set()
+
+    def stop_server(self, linger=2.0):
+        """
+        Laisse aux workers connus le temps d'apprendre la fin du scan puis arrête le serveur
+        """
+        deadline = time.monotonic() + linger
+        while time.monotonic() < deadline:
+            with self.lock:
+                if self.workers_seen <= self.workers_done:
+                    break
+            time.sleep(0.05)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def scan(self, verbose=True):
+        """
+        Sert les baux jusqu'à ce que toutes les paires aient un résultat
+        """
+        self.start_time = datetime.now()
+        total = self.remaining_ports()
+        self.build_leases()
+        self.start_server()
+
+        if verbose:
+            print(f"\n[*] Coordinateur du scan sur {self.target}: {self.address}")
+            print(f"[*] Nombre de ports à scanner: {total}")
+            print(f"[*] Baux: {len(self.leases)} (moteur {self.engine})")
+            print(f"[*] Workers: python main.py --worker --coordinator {self.address} "
+                  f"--token {self.token}\n")
+
+        processes = spawn_local_workers(self.address, self.local_workers, self.token)
+        progress = self.create_progress(total)
+        try:
+            while not self.finished.wait(0.5):
+                if self.cancelled:
+                    # Les workers apprennent la fin du scan à leur prochaine demande
+                    self.finished.set()
+            self.stop_server()
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            progress.close()
+
+        self.end_time = datetime.now()
+
+        self.store.merge()
+        self.flush_sinks()
+
+        return self.get_results()
+
+class ScanWorker:
+    """
+    Worker qui scanne les baux d'un coordinateur
+    """
+
+    def __init__(self, coordinator, worker_id=None, connect_timeout=30.0, token=None):
+        """
+        Args:
+            coordinator: Adresse du coordinateur ('hôte:port')
+            worker_id: Identifiant du worker (défaut: nom d'hôte et PID)
+            connect_timeout: Durée maximale sans réponse du coordinateur (secondes)
+            token: Secret partagé du coordinateur
+        """
+        host, port = parse_address(coordinator)
+        if ':' in host:
+            host = f"[{host}]"
+        self.url = f"http://{host}:{port}"
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.connect_timeout = connect_timeout
+        self.headers = {'Content-Type': 'application/json'}
+        if token:
+            self.headers[TOKEN_HEADER] = token
+        self.leases_done = 0
+        self.error = None
+
+    def request(self, route, payload):
+        """
+        Envoie une requête au coordinateur, en réessayant tant qu'il est injoignable
+        """
+        payload = dict(payload, worker=self.worker_id)
+        data = json.dumps(payload).encode('utf-8')
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            request = urllib.request.Request(self.url + route, data=data, headers=self.headers)
+            try:
+                with urllib.request.urlopen(request, timeout=self.connect_timeout) as response:
+                    return json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                # Requête refusée par le coordinateur: inutile de réessayer
+                try:
+                    detail = json.loads(e.read()).get('error', e.reason)
+                except (ValueError, AttributeError, OSError):
+                    detail = e.reason
+                raise CoordinatorError(
+                    f"{route} refusé par le coordinateur (HTTP {e.code}: {detail})"
+                ) from None
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.5)
+
+    def keep_alive(self, lease_id, interval, stop_event):
+        """
+        Renouvelle le bail en cours jusqu'à la fin du scan
+        """
+        while not stop_event.wait(interval):
+            try:
+                self.request('/renew', {'lease': lease_id})
+            except CoordinatorError as e:
+                # Remontée par scan_lease(): le worker ne doit pas continuer
+                self.error = e
+                return
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                return
+
+    def scan_lease(self, lease):
+        """
+        Scanne un bail et retourne son résultat compact
+        """
+        from engines import create_scanner
+
+        scanner = create_scanner(
+            lease['engine'], target=lease['targets'], ports=lease['ports'],
+            **lease['settings'], **lease['options']
+        )
+        stop_event = threading.Event()
+        renewer = threading.Thread(
+            target=self.keep_alive,
+            args=(lease['lease'], lease['renew_interval'], stop_event),
+            daemon=True
+        )
+        renewer.start()
+        try:
+            scanner.scan(verbose=False)
+        finally:
+            stop_event.set()
+        if self.error is not None:
+            raise self.error
+        return encode_results(scanner, lease['targets'], lease['ports'])
+
+    def run(self):
+        """
+        Traite les baux jusqu'à la fin du scan
+
+        Retourne le nombre de baux traités. Lève CoordinatorError si le
+        coordinateur refuse une requête (jeton invalide, ...).
+        """
+        while True:
+            try:
+                lease = self.request('/lease', {})
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                # Coordinateur arrêté: le scan est terminé ou abandonné
+                break
+            if lease.get('done'):
+                break
+            if 'wait' in lease:
+                time.sleep(lease['wait'])
+                continue
+
+            result = self.scan_lease(lease)
+            self.request('/result', {'lease': lease['lease'], **result})
+            self.leases_done += 1
+        return self.leases_done
+
+def run_worker(coordinator, worker_id=None, quiet=False, token=None):
+    """
+    Point d'entrée d'un processus worker
+    """
+    if quiet:
+        # Workers locaux: pas de barres de progression mêlées à celle du coordinateur
+        sys.stderr = open(os.devnull, 'w')
+    return ScanWorker(coordinator, worker_id, token=token).run()
+
+def spawn_local_workers(coordinator, count, token=None):
+    """
+    Lance des workers dans des processus locaux
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    for index in range(count):
+        process = context.Process(
+            target=run_worker, args=(coordinator, f"local-{os.getpid()}-{index}", True, token),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+    return processes
@@ -0,0 +1,99 @@
+"""
+Sélection du moteur de scan
+"""
+from scanner import PortScanner
+from async_scanner import AsyncPortScanner
+from syn_scanner import SynScanner, has_raw_socket_capability, is_ipv4
+from udp_scanner import UdpScanner
+from sharding import ShardedScanner
+
+ENGINES = {
+    'thread': PortScanner,
+    'async': AsyncPortScanner,
+    'syn': SynScanner,
+    'udp': UdpScanner
+}
+
+DEFAULT_ENGINE = 'thread'
+
+def create_scanner(engine, target, ports, timeout=1, threads=100, concurrency=None, rate=None,
+                   retries=None, workers=1, **options):
+    """
+    Crée un scanner pour le moteur demandé
+
+    Le moteur 'syn' retombe sur le moteur 'thread' (connexion complète) si
+    CAP_NET_RAW est absent ou si une cible n'est pas IPv4; l'attribut `engine`
+    du scanner retourné indique le moteur effectivement utilisé.
+
+    Args:
+        engine: Nom du moteur ('thread', 'async', 'syn' ou 'udp')
+        target: Adresse IP ou nom d'hôte cible, ou liste de cibles
+        ports: Liste des ports à scanner
+        timeout: Timeout pour chaque connexion (secondes)
+        threads: Nombre de threads (moteur 'thread')
+        concurrency: Connexions simultanées (moteur 'async')
+        rate: Paquets par seconde (moteurs 'syn' et 'udp')
+        retries: Retransmissions sans réponse (moteur 'udp')
+        workers: Nombre de processus; au-delà de 1, le travail est réparti
+                 entre plusieurs processus exécutant chacun ce moteur
+        options: Options communes transmises au scanner (adaptive_timeout, ...)
+    """
+    engine = engine or DEFAULT_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur inconnu: {engine}")
+
+    if workers and workers > 1:
+        return ShardedScanner(
+            target=target,
+            ports=ports,
+            timeout=timeout,
+            workers=workers,
+            engine=engine,
+            threads=threads,
+            concurrency=concurrency,
+            rate=rate,
+            retries=retries,
+            **options
+        )
+
+    if engine == 'syn':
+        targets = [target] if isinstance(target, str) else target
+        if has_raw_socket_capability() and all(is_ipv4(host) for host in targets):
+            return SynScanner(
+                target=target,
+                ports=ports,
+                timeout=timeout,
+                threads=threads,
+                rate=rate or 1000,
+                **options
+            )
+        engine = 'thread'
+
+    if engine == 'udp':
+        return UdpScanner(
+            target=target,
+            ports=ports,
+            timeout=timeout,
+            threads=threads,
+            rate=200 if rate is None else rate,
+            retries=2 if retries is None else retries,
+            **options
+        )
+
+    if engine == 'async':
+        return AsyncPortScanner(
+            target=target,
+            ports=ports,
+            timeout=timeout,
+            threads=threads,
+            concurrency=concurrency or 1000,
+            **options
+        )
+
+    return PortScanner(
+        target=target,
+        ports=ports,
+        timeout=timeout,
+        threads=threads,
+        **options
+    )
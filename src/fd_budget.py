@@ -0,0 +1,189 @@
+"""
+Budget de descripteurs de fichiers du processus
+
+Chaque sonde TCP occupe un descripteur, de même que chaque connexion ouverte
+en attente de sa bannière. Le budget, dérivé de la limite RLIMIT_NOFILE,
+plafonne les sockets en vol: au-delà, les workers attendent qu'une socket se
+libère. Si le système refuse malgré tout une socket (EMFILE/ENFILE), le budget
+se resserre et la sonde est retentée: l'épuisement des ressources ralentit
+le scan au lieu de fausser ses résultats. Le resserrement est temporaire:
+chaque socket libérée rend une place, jusqu'à la capacité dérivée de la limite.
+"""
+import asyncio
+import errno
+import os
+import threading
+
+try:
+    import resource
+except ImportError:
+    # Windows: pas de RLIMIT_NOFILE, budget désactivé
+    resource = None
+
+# Descripteurs laissés au reste du processus (fichiers, journaux, DNS, ...)
+DEFAULT_RESERVE = 64
+# Limite visée par raise_fd_limit quand la limite dure est illimitée
+DEFAULT_FD_TARGET = 65536
+# Attente avant de retenter une socket refusée (secondes)
+EXHAUSTED_BACKOFF = 0.05
+
+EXHAUSTED_ERRORS = (errno.EMFILE, errno.ENFILE)
+
+def is_exhausted(error):
+    """
+    True si l'erreur signale un manque de descripteurs
+    """
+    return isinstance(error, OSError) and error.errno in EXHAUSTED_ERRORS
+
+def get_fd_limit():
+    """
+    Limites (souple, dure) de RLIMIT_NOFILE, None si inconnues
+    """
+    if resource is None:
+        return None
+    return resource.getrlimit(resource.RLIMIT_NOFILE)
+
+def raise_fd_limit(target=None):
+    """
+    Relève la limite souple de descripteurs vers la limite dure
+
+    Args:
+        target: Limite souhaitée (défaut: limite dure, ou DEFAULT_FD_TARGET si illimitée)
+
+    Retourne la limite souple en vigueur (None si inconnue).
+    """
+    limits = get_fd_limit()
+    if limits is None:
+        return None
+    soft, hard = limits
+    wanted = target or (DEFAULT_FD_TARGET if hard == resource.RLIM_INFINITY else hard)
+    if hard != resource.RLIM_INFINITY:
+        wanted = min(wanted, hard)
+    if soft != resource.RLIM_INFINITY and wanted > soft:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+        except (ValueError, OSError):
+            # macOS: plafond OPEN_MAX inférieur à la limite dure annoncée
+            pass
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+def count_open_fds():
+    """
+    Nombre de descripteurs ouverts par le processus (estimation hors Linux)
+    """
+    for path in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return 16
+
+class FdBudget:
+    """
+    Sémaphore des sockets en vol, partagé par tous les scans du processus
+    """
+
+    def __init__(self, capacity=None, reserve=DEFAULT_RESERVE):
+        """
+        Args:
+            capacity: Nombre maximum de sockets en vol (défaut: d'après RLIMIT_NOFILE)
+            reserve: Descripteurs laissés au reste du processus
+        """
+        self.reserve = reserve
+        self.used = 0
+        self.waits = 0
+        self.exhausted = 0
+        self.condition = threading.Condition()
+        # Capacité nominale; `capacity` descend en dessous après un refus du système
+        self.limit = capacity if capacity is not None else self.limit_capacity()
+        self.capacity = self.limit
+
+    def limit_capacity(self):
+        """
+        Capacité permise par la limite souple actuelle (None si inconnue)
+        """
+        limits = get_fd_limit()
+        if limits is None:
+            return None
+        soft = limits[0]
+        if soft == resource.RLIM_INFINITY:
+            soft = DEFAULT_FD_TARGET
+        # Les sockets déjà comptées dans le budget sont ouvertes aussi
+        return max(1, soft - self.reserve - max(0, count_open_fds() - self.used))
+
+    def refresh(self):
+        """
+        Recalcule la capacité (après raise_fd_limit)
+        """
+        capacity = self.limit_capacity()
+        with self.condition:
+            self.limit = self.capacity = capacity
+            self.condition.notify_all()
+        return capacity
+
+    def try_acquire(self):
+        with self.condition:
+            if self.used >= self.capacity:
+                return False
+            self.used += 1
+            return True
+
+    def acquire(self):
+        """
+        Réserve une socket, en attendant qu'une place se libère
+        """
+        with self.condition:
+            if self.used >= self.capacity:
+                self.waits += 1
+                while self.used >= self.capacity:
+                    self.condition.wait()
+            self.used += 1
+
+    async def acquire_async(self):
+        """
+        Réserve une socket sans bloquer la boucle d'événements
+        """
+        if not self.try_acquire():
+            with self.condition:
+                self.waits += 1
+            while not self.try_acquire():
+                await asyncio.sleep(0.005)
+
+    def release(self):
+        with self.condition:
+            self.used -= 1
+            if self.capacity < self.limit:
+                # Le budget resserré regagne une place par socket libérée
+                self.capacity += 1
+                self.condition.notify()
+            self.condition.notify()
+
+    def shrink(self):
+        """
+        Le système a refusé une socket: la limite réelle est plus basse que
+        prévu (autres descripteurs du processus), le budget se resserre
+        jusqu'à ce que des sockets soient libérées
+        """
+        with self.condition:
+            self.exhausted += 1
+            self.capacity = max(1, min(self.capacity, self.used - 1))
+
+    def wait_release(self, timeout=EXHAUSTED_BACKOFF):
+        """
+        Attend qu'une socket se libère (au plus `timeout` secondes)
+        """
+        with self.condition:
+            self.condition.wait(timeout)
+
+    def stats(self):
+        with self.condition:
+            return {
+                'capacity': self.capacity,
+                'limit': self.limit,
+                'used': self.used,
+                'waits': self.waits,
+                'exhausted': self.exhausted
+            }
+
+# Budget du processus, partagé par tous les scanners
+default_fd_budget = FdBudget()
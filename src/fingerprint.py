@@ -0,0 +1,177 @@
+"""
+Identification des services à partir des bannières
+
+Les signatures (config/fingerprints.yaml) sont chargées une seule fois et
+compilées en deux structures:
+    - un index des signatures ancrées par leur préfixe littéral: seules les
+      quelques signatures partageant le début de la bannière sont essayées
+    - une expression combinée (alternance) pour toutes les autres: une seule
+      recherche par bannière, quel que soit le nombre de signatures
+"""
+import re
+import threading
+from pathlib import Path
+import yaml
+
+DEFAULT_DATABASE = Path(__file__).parent.parent / 'config' / 'fingerprints.yaml'
+PREFIX_LENGTH = 3
+CACHE_SIZE = 4096
+
+REGEX_SPECIAL = set('.^$*+?{}[]\\|()')
+QUANTIFIERS = set('*+?{')
+
+def literal_prefix(pattern):
+    """
+    Préfixe littéral d'une expression ancrée ('' si non ancrée)
+
+    '^SSH-[\\d.]+' -> 'SSH-', '^\\+OK ' -> '+OK '
+    """
+    if not pattern.startswith('^'):
+        return ''
+    prefix = []
+    i = 1
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            char = pattern[i + 1]
+            i += 2
+        elif char in REGEX_SPECIAL:
+            break
+        else:
+            i += 1
+        if i < len(pattern) and pattern[i] in QUANTIFIERS:
+            # Le caractère précédent est optionnel ou répété
+            break
+        prefix.append(char)
+    return ''.join(prefix)
+
+class Signature:
+    """
+    Signature de bannière compilée
+    """
+    __slots__ = ('index', 'service', 'product', 'version_group', 'regex', 'source')
+
+    def __init__(self, index, entry):
+        self.index = index
+        self.service = entry['service']
+        self.product = entry.get('product')
+        self.version_group = entry.get('version')
+        self.source = entry['pattern']
+        flags = re.IGNORECASE if entry.get('ignore_case') else 0
+        self.regex = re.compile(self.source, flags)
+
+    def result(self, match):
+        """
+        Empreinte issue d'une correspondance
+        """
+        version = None
+        if self.version_group:
+            version = match.group(self.version_group) or None
+        return {'service': self.service, 'product': self.product, 'version': version}
+
+class FingerprintMatcher:
+    """
+    Moteur de correspondance bannière -> service
+    """
+
+    def __init__(self, signatures):
+        """
+        Args:
+            signatures: Liste de signatures ({'service', 'pattern', ...})
+        """
+        self.signatures = [Signature(index, entry) for index, entry in enumerate(signatures)]
+        self.prefix_index = {}
+        fallback = []
+
+        for signature in self.signatures:
+            prefix = literal_prefix(signature.source)
+            if len(prefix) >= PREFIX_LENGTH:
+                key = prefix[:PREFIX_LENGTH].lower()
+                self.prefix_index.setdefault(key, []).append(signature)
+            else:
+                fallback.append(signature)
+
+        self.fallback = fallback
+        self.combined = None
+        if fallback:
+            # Un groupe nommé par signature: lastgroup désigne la signature trouvée
+            alternatives = []
+            for signature in fallback:
+                pattern = signature.source
+                if signature.regex.flags & re.IGNORECASE:
+                    pattern = f'(?i:{pattern})'
+                alternatives.append(f'(?P<s{signature.index}>{pattern})')
+            self.combined = re.compile('|'.join(alternatives))
+
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def _match(self, banner):
+        for signature in self.prefix_index.get(banner[:PREFIX_LENGTH].lower(), ()):
+            match = signature.regex.match(banner)
+            if match:
+                return signature.result(match)
+
+        if self.combined:
+            match = self.combined.search(banner)
+            if match:
+                signature = self.signatures[int(match.lastgroup[1:])]
+                # Réappliquer la signature seule pour ses groupes de version
+                own_match = signature.regex.search(banner, match.start())
+                return signature.result(own_match or match)
+
+        return None
+
+    def match(self, banner):
+        """
+        Identifie le service d'une bannière
+
+        Retourne {'service', 'product', 'version'} ou None
+        """
+        if not banner:
+            return None
+        with self.lock:
+            if banner in self.cache:
+                return self.cache[banner]
+
+        result = self._match(banner)
+
+        with self.lock:
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.clear()
+            self.cache[banner] = result
+        return result
+
+def load_signatures(path=DEFAULT_DATABASE):
+    """
+    Lit un fichier de signatures YAML
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or {}
+    return data.get('signatures', [])
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_matcher():
+    """
+    Moteur de correspondance par défaut (chargé au premier appel)
+    """
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                try:
+                    signatures = load_signatures()
+                except (OSError, yaml.YAMLError):
+                    signatures = []
+                _matcher = FingerprintMatcher(signatures)
+    return _matcher
+
+def match_banner(banner):
+    """
+    Identifie le service d'une bannière avec la base par défaut
+    """
+    return get_matcher().match(banner)
@@ -0,0 +1,232 @@
+"""
+Historique des scans (SQLite) et comparaison entre deux scans
+
+Chaque scan enregistre la liste des ports scannés (array 'H' compacte), les
+hôtes couverts et leurs ports ouverts. Les comparaisons portent, hôte par
+hôte, sur les ports scannés à la fois par le scan courant et par le scan de
+référence: un port ouvert absent de la référence est nouveau, un port ouvert
+dans la référence qui ne l'est plus est fermé.
+"""
+import os
+import random
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+
+DEFAULT_HISTORY = Path(__file__).parent.parent / 'results' / 'history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT NOT NULL,
+    protocol TEXT NOT NULL,
+    total_ports INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    ports BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scan_hosts (
+    host TEXT NOT NULL,
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    open_count INTEGER NOT NULL,
+    closed_count INTEGER NOT NULL,
+    filtered_count INTEGER NOT NULL,
+    PRIMARY KEY (host, scan_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS open_ports (
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    host TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    service TEXT,
+    banner TEXT,
+    PRIMARY KEY (scan_id, host, port)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_scans_started_at ON scans(started_at);
+CREATE INDEX IF NOT EXISTS idx_open_ports_host_port ON open_ports(host, port, scan_id);
+"""
+
+def pack_ports(ports):
+    """
+    Encode une liste de ports (triée, sans doublons) en blob compact
+    """
+    return array('H', sorted(set(ports))).tobytes()
+
+def unpack_ports(blob):
+    """
+    Décode un blob de ports
+    """
+    ports = array('H')
+    ports.frombytes(blob)
+    return ports
+
+def prioritize_ports(ports, known_open, sample_ratio=0.1, seed=None):
+    """
+    Ordre de scan d'un scan différentiel: les ports déjà connus ouverts
+    d'abord, puis un échantillon aléatoire des autres ports
+
+    Args:
+        ports: Ports demandés
+        known_open: Ports ouverts lors des scans précédents
+        sample_ratio: Part des autres ports à échantillonner (0 à 1)
+        seed: Graine du tirage (tests)
+    """
+    known_open = set(known_open)
+    first = [port for port in ports if port in known_open]
+    rest = [port for port in ports if port not in known_open]
+    count = min(len(rest), int(round(len(rest) * sample_ratio)))
+    sample = random.Random(seed).sample(rest, count) if count else []
+    return first + sorted(sample)
+
+class ScanHistory:
+    """
+    Base SQLite des scans passés
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY):
+        """
+        Args:
+            path: Fichier de la base (créé au besoin)
+        """
+        self.path = str(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, results, ports):
+        """
+        Enregistre un scan (résultats de get_results()) et retourne son identifiant
+        """
+        hosts = results.get('hosts') or {results['target']: results}
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO scans (started_at, finished_at, protocol, total_ports, duration, ports) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (results['start_time'].isoformat(), results['end_time'].isoformat(),
+                 results.get('protocol', 'tcp'), results['total_ports'],
+                 results['duration'], pack_ports(ports))
+            )
+            scan_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO scan_hosts (host, scan_id, open_count, closed_count, filtered_count) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(host, scan_id, len(data['open_ports']), data['closed_ports'], data['filtered_ports'])
+                 for host, data in hosts.items()]
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO open_ports (scan_id, host, port, service, banner) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(scan_id, port_data.get('host', host), port_data['port'],
+                  (port_data.get('fingerprint') or {}).get('service'), port_data.get('banner'))
+                 for host, data in hosts.items() for port_data in data['open_ports']]
+            )
+        return scan_id
+
+    def baseline(self, host, protocol='tcp', against='last'):
+        """
+        Scan de référence d'un hôte: (identifiant, ports scannés) ou None
+
+        Args:
+            host: Hôte
+            protocol: Protocole ('tcp' ou 'udp')
+            against: 'last' (dernier scan de l'hôte) ou identifiant de scan
+        """
+        with self.lock:
+            if str(against) == 'last':
+                row = self.connection.execute(
+                    'SELECT s.id, s.ports FROM scan_hosts h JOIN scans s ON s.id = h.scan_id '
+                    'WHERE h.host = ? AND s.protocol = ? ORDER BY h.scan_id DESC LIMIT 1',
+                    (host, protocol)
+                ).fetchone()
+            else:
+                row = self.connection.execute(
+                    'SELECT s.id, s.ports FROM scan_hosts h JOIN scans s ON s.id = h.scan_id '
+                    'WHERE h.host = ? AND h.scan_id = ?',
+                    (host, int(against))
+                ).fetchone()
+        if row is None:
+            return None
+        return row[0], unpack_ports(row[1])
+
+    def open_ports(self, scan_id, host):
+        """
+        Ports ouverts d'un hôte lors d'un scan ({port: bannière})
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT port, banner FROM open_ports WHERE scan_id = ? AND host = ?',
+                (scan_id, host)
+            ).fetchall()
+        return dict(rows)
+
+    def known_open_ports(self, hosts, protocol='tcp', ports=None):
+        """
+        Ports ouverts connus: pour chaque hôte et chaque port, état relevé par
+        le scan le plus récent qui a couvert ce port
+
+        Un scan différentiel ne couvre qu'une partie des ports: le dernier scan
+        seul oublierait les ports ouverts hors de son échantillon.
+
+        Args:
+            hosts: Hôtes
+            protocol: Protocole ('tcp' ou 'udp')
+            ports: Ports recherchés (défaut: tous)
+        """
+        wanted = set(ports) if ports is not None else set(range(65536))
+        known = set()
+        for host in hosts:
+            with self.lock:
+                rows = self.connection.execute(
+                    'SELECT s.id, s.ports FROM scan_hosts h JOIN scans s ON s.id = h.scan_id '
+                    'WHERE h.host = ? AND s.protocol = ? ORDER BY h.scan_id DESC',
+                    (host, protocol)
+                ).fetchall()
+            remaining = set(wanted)
+            for scan_id, blob in rows:
+                covered = remaining.intersection(unpack_ports(blob))
+                if not covered:
+                    continue
+                known.update(covered.intersection(self.open_ports(scan_id, host)))
+                remaining -= covered
+                if not remaining:
+                    break
+        return sorted(known)
+
+    def diff(self, results, ports, against='last'):
+        """
+        Compare un scan à un scan de référence, hôte par hôte
+
+        Retourne {'baselines': {hôte: identifiant}, 'opened': [...], 'closed': [...],
+        'new_hosts': [...]}; seuls les ports scannés par les deux scans sont comparés.
+        """
+        hosts = results.get('hosts') or {results['target']: results}
+        protocol = results.get('protocol', 'tcp')
+        scanned = set(ports)
+        changes = {'baselines': {}, 'opened': [], 'closed': [], 'new_hosts': []}
+
+        for host, data in hosts.items():
+            reference = self.baseline(host, protocol, against)
+            if reference is None:
+                changes['new_hosts'].append(host)
+                continue
+            scan_id, reference_ports = reference
+            changes['baselines'][host] = scan_id
+            compared = scanned.intersection(reference_ports)
+            before = {port for port in self.open_ports(scan_id, host) if port in compared}
+            now = {port_data['port']: port_data.get('banner') for port_data in data['open_ports']
+                   if port_data['port'] in compared}
+
+            for port in sorted(now.keys() - before):
+                changes['opened'].append({'host': host, 'port': port, 'banner': now[port]})
+            for port in sorted(before - now.keys()):
+                changes['closed'].append({'host': host, 'port': port})
+
+        return changes
@@ -0,0 +1,264 @@
+"""
+File d'attente des scans du service web
+
+Les scans sont des jobs exécutés sous un budget global de threads (une
+connexion en vol par thread, donc autant de descripteurs): un job démarre
+quand le budget libre lui accorde au moins `min_threads` threads, avec au plus
+le nombre demandé. Les clients sont servis à tour de rôle (une file par client)
+et limités en scans simultanés et en attente. Les jobs terminés sont conservés
+`retention` secondes, et au plus `max_retained`, pour les consultations REST.
+"""
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from progress import CancelToken
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_CANCELLED = 'cancelled'
+STATUS_FAILED = 'failed'
+
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_CANCELLED, STATUS_FAILED)
+
+class QuotaExceeded(Exception):
+    """
+    Trop de scans en attente pour ce client
+    """
+
+class ScanJob:
+    """
+    Scan soumis au planificateur
+    """
+
+    def __init__(self, job_id, client, request, threads):
+        """
+        Args:
+            job_id: Identifiant du job
+            client: Identifiant du client (adresse IP, ...)
+            request: Paramètres du scan (transmis tels quels à l'exécuteur)
+            threads: Nombre de threads demandés
+        """
+        self.id = job_id
+        self.client = client
+        self.request = request
+        self.threads = threads
+        self.granted = 0
+        self.status = STATUS_QUEUED
+        self.cancel_token = CancelToken()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = None
+        self.results = None
+        self.error = None
+
+    def snapshot(self):
+        """
+        État du job au format JSON
+        """
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'target': self.request.get('target'),
+            'ports_count': len(self.request.get('ports') or ()),
+            'threads': self.granted or self.threads,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'progress': self.progress
+        }
+        if self.results is not None:
+            data['results'] = self.results
+        if self.error:
+            data['error'] = self.error
+        return data
+
+class ScanJobScheduler:
+    """
+    Planificateur des scans: budget de threads partagé, quotas et équité entre clients
+    """
+
+    def __init__(self, runner, max_threads=1000, min_threads=10, max_running=4,
+                 per_client_running=1, per_client_queued=5, retention=3600,
+                 max_retained=200, spawn=None):
+        """
+        Args:
+            runner: Fonction exécutant un job (retourne ses résultats)
+            max_threads: Budget global de threads (connexions simultanées)
+            min_threads: Threads minimum pour démarrer un job
+            max_running: Nombre maximum de scans simultanés
+            per_client_running: Scans simultanés par client
+            per_client_queued: Scans en attente par client
+            retention: Durée de conservation des jobs terminés (secondes)
+            max_retained: Nombre maximum de jobs terminés conservés
+            spawn: Lance une fonction en arrière-plan (défaut: thread démon)
+        """
+        self.runner = runner
+        self.max_threads = max_threads
+        self.min_threads = min_threads
+        self.max_running = max_running
+        self.per_client_running = per_client_running
+        self.per_client_queued = per_client_queued
+        self.retention = retention
+        self.max_retained = max_retained
+        self.spawn = spawn or (lambda task: threading.Thread(target=task, daemon=True).start())
+
+        self.jobs = {}
+        self.finished = OrderedDict()
+        self.queues = OrderedDict()
+        self.running = {}
+        self.served = {}
+        self.sequence = itertools.count()
+        self.used_threads = 0
+        self.lock = threading.RLock()
+
+    def submit(self, client, request, threads):
+        """
+        Ajoute un scan à la file de son client et le démarre si possible
+
+        L'identifiant du job est tiré par le serveur (uuid4), jamais fourni par
+        le client. Lève QuotaExceeded si le client a déjà trop de scans en attente.
+        """
+        with self.lock:
+            queue = self.queues.get(client)
+            if queue is not None and len(queue) >= self.per_client_queued:
+                raise QuotaExceeded(
+                    f"{self.per_client_queued} scan(s) déjà en attente pour ce client"
+                )
+            job = ScanJob(uuid.uuid4().hex, client, request, max(1, threads))
+            self.jobs[job.id] = job
+            self.queues.setdefault(client, deque()).append(job)
+            self._dispatch()
+        return job
+
+    def get(self, job_id):
+        """
+        Job par identifiant (None s'il est inconnu ou évincé)
+        """
+        with self.lock:
+            self._evict()
+            return self.jobs.get(job_id)
+
+    def position(self, job):
+        """
+        Rang du job dans sa file (0 s'il n'est pas en attente)
+        """
+        with self.lock:
+            queue = self.queues.get(job.client) or ()
+            for index, queued in enumerate(queue):
+                if queued is job:
+                    return index + 1
+        return 0
+
+    def cancel(self, job_id, client=None):
+        """
+        Annule un job en attente ou en cours
+
+        Si `client` est précisé, seul le client qui a soumis le job peut
+        l'annuler. Retourne False si le job est inconnu, appartient à un autre
+        client ou est déjà terminé.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATUSES:
+                return False
+            if client is not None and job.client != client:
+                return False
+            job.cancel_token.cancel()
+            if job.status == STATUS_QUEUED:
+                queue = self.queues[job.client]
+                queue.remove(job)
+                if not queue:
+                    del self.queues[job.client]
+                self._finish(job, STATUS_CANCELLED)
+        return True
+
+    def _next_job(self):
+        """
+        Premier job démarrable, en servant d'abord le client servi le moins récemment
+        """
+        running_by_client = {}
+        for job in self.running.values():
+            running_by_client[job.client] = running_by_client.get(job.client, 0) + 1
+
+        free = self.max_threads - self.used_threads
+        for client in sorted(self.queues, key=lambda client: self.served.get(client, -1)):
+            if running_by_client.get(client, 0) >= self.per_client_running:
+                continue
+            job = self.queues[client][0]
+            if min(job.threads, free) >= min(job.threads, self.min_threads):
+                return job
+        return None
+
+    def _dispatch(self):
+        while len(self.running) < self.max_running:
+            job = self._next_job()
+            if job is None:
+                return
+
+            queue = self.queues[job.client]
+            queue.popleft()
+            if not queue:
+                del self.queues[job.client]
+            # Le client repasse en fin de tour
+            self.served[job.client] = next(self.sequence)
+
+            job.granted = min(job.threads, self.max_threads - self.used_threads)
+            job.status = STATUS_RUNNING
+            job.started_at = time.time()
+            self.used_threads += job.granted
+            self.running[job.id] = job
+            self.spawn(lambda job=job: self._run(job))
+
+    def _run(self, job):
+        try:
+            results = self.runner(job)
+        except Exception as e:
+            job.error = str(e)
+            status = STATUS_FAILED
+        else:
+            job.results = results
+            status = STATUS_CANCELLED if job.cancel_token.cancelled else STATUS_COMPLETED
+        with self.lock:
+            self.running.pop(job.id, None)
+            self.used_threads -= job.granted
+            if job.client not in self.queues and all(
+                    other.client != job.client for other in self.running.values()):
+                # Client inactif: inutile de garder son rang
+                self.served.pop(job.client, None)
+            self._finish(job, status)
+            self._dispatch()
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        self.finished[job.id] = job
+        self._evict()
+
+    def _evict(self):
+        """
+        Supprime les jobs terminés trop anciens ou en surnombre
+        """
+        limit = time.time() - self.retention
+        while self.finished:
+            job = next(iter(self.finished.values()))
+            if len(self.finished) <= self.max_retained and job.finished_at >= limit:
+                break
+            self.finished.popitem(last=False)
+            self.jobs.pop(job.id, None)
+
+    def stats(self):
+        """
+        Occupation du planificateur
+        """
+        with self.lock:
+            return {
+                'running': len(self.running),
+                'queued': sum(len(queue) for queue in self.queues.values()),
+                'used_threads': self.used_threads,
+                'max_threads': self.max_threads,
+                'retained': len(self.finished)
+            }
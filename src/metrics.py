@@ -0,0 +1,242 @@
+"""
+Instrumentation des moteurs de scan
+
+Les moteurs appellent les crochets d'un objet métriques (option `metrics`);
+sans métriques, le chemin critique ne paie qu'un test `is not None`.
+ScanMetrics garde des compteurs en mémoire et les expose en résumé texte
+ou au format d'exposition Prometheus. Pour brancher un autre système
+(statsd, OpenTelemetry, ...), il suffit de surcharger les crochets:
+
+    connect_started()                 connexion lancée
+    connect_finished(error, latency)  connexion terminée (errno, 'timeout' ou None)
+    outcome(state)                    résultat d'une paire (hôte, port)
+    retry(count)                      sondes retransmises ou relancées
+    add_pending(count)                paires en attente de sonde
+"""
+import bisect
+import errno
+import sys
+import threading
+from results import STATE_NAMES, STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+
+# Bornes des seaux de latence de connexion (secondes)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def error_name(error):
+    """
+    Nom symbolique d'une erreur de connexion (ECONNREFUSED, timeout, ...)
+    """
+    if isinstance(error, int):
+        return errno.errorcode.get(error, str(error))
+    return str(error)
+
+def prometheus_metric(name, kind, help_text, samples):
+    """
+    Lignes d'exposition Prometheus d'une métrique
+
+    Args:
+        name: Nom complet de la métrique
+        kind: Type ('counter', 'gauge', 'histogram')
+        help_text: Description
+        samples: Liste de (suffixe, [(étiquette, valeur), ...], valeur)
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+        label_text = f"{{{label_text}}}" if label_text else ""
+        lines.append(f"{name}{suffix}{label_text} {value}")
+    return lines
+
+class Histogram:
+    """
+    Histogramme à seaux fixes (cumulés à l'export, comme Prometheus)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        Paires (borne, nombre d'observations <= borne), borne '+Inf' comprise
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """
+        Borne supérieure du seau contenant le quantile q (None sans observation)
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float('inf')
+
+class ScanMetrics:
+    """
+    Compteurs d'un ou plusieurs scans (cumulés, partageables entre scans)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.outcomes = {STATE_OPEN: 0, STATE_CLOSED: 0, STATE_FILTERED: 0}
+        self.errors = {}
+        self.latency = Histogram(buckets)
+        self.connects = 0
+        self.in_flight = 0
+        self.pending = 0
+        self.retries = 0
+        self.lock = threading.Lock()
+
+    def connect_started(self):
+        with self.lock:
+            self.connects += 1
+            self.in_flight += 1
+
+    def connect_finished(self, error=None, latency=None):
+        """
+        Args:
+            error: errno de l'échec, 'timeout', nom de l'exception, ou None si la connexion a abouti
+            latency: Durée de la connexion (acceptation ou refus), en secondes
+        """
+        with self.lock:
+            self.in_flight -= 1
+            if error is not None:
+                name = error_name(error)
+                self.errors[name] = self.errors.get(name, 0) + 1
+            if latency is not None:
+                self.latency.observe(latency)
+
+    def outcome(self, state):
+        with self.lock:
+            self.outcomes[state] = self.outcomes.get(state, 0) + 1
+
+    def retry(self, count=1):
+        with self.lock:
+            self.retries += count
+
+    def add_pending(self, count):
+        with self.lock:
+            self.pending += count
+
+    def snapshot(self):
+        """
+        Copie cohérente des compteurs
+        """
+        with self.lock:
+            return {
+                'outcomes': {STATE_NAMES[state]: count for state, count in self.outcomes.items()},
+                'errors': dict(self.errors),
+                'connects': self.connects,
+                'in_flight': self.in_flight,
+                'queue_depth': self.pending,
+                'retries': self.retries,
+                'latency': {
+                    'buckets': self.latency.cumulative(),
+                    'sum': self.latency.sum,
+                    'count': self.latency.count,
+                    'p50': self.latency.quantile(0.5),
+                    'p95': self.latency.quantile(0.95)
+                }
+            }
+
+    def summary(self):
+        """
+        Résumé d'une ligne pour l'affichage en direct
+        """
+        data = self.snapshot()
+        outcomes = data['outcomes']
+        line = (f"[stats] {sum(outcomes.values())} résultats "
+                f"(ouverts {outcomes['open']}, fermés {outcomes['closed']}, "
+                f"filtrés {outcomes['filtered']}) | en vol {data['in_flight']} "
+                f"| en attente {data['queue_depth']} | relances {data['retries']}")
+        latency = data['latency']
+        if latency['count']:
+            line += (f" | latence p50 <= {latency['p50'] * 1000:g}ms"
+                     f", p95 <= {latency['p95'] * 1000:g}ms")
+        if data['errors']:
+            errors = sorted(data['errors'].items(), key=lambda item: -item[1])
+            line += " | " + ", ".join(f"{name} {count}" for name, count in errors[:4])
+        return line
+
+    def render_prometheus(self, prefix='portscan'):
+        """
+        Compteurs au format d'exposition texte de Prometheus
+        """
+        data = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.extend(prometheus_metric(f"{prefix}_{name}", kind, help_text, samples))
+
+        metric('results_total', 'counter', 'Paires (hôte, port) scannées par état',
+               [('', [('state', state)], count) for state, count in data['outcomes'].items()])
+        metric('connect_errors_total', 'counter', 'Échecs de connexion par errno',
+               [('', [('errno', name)], count) for name, count in sorted(data['errors'].items())])
+        metric('connects_total', 'counter', 'Connexions lancées', [('', [], data['connects'])])
+        metric('retries_total', 'counter', 'Sondes retransmises', [('', [], data['retries'])])
+        metric('in_flight', 'gauge', 'Connexions en vol', [('', [], data['in_flight'])])
+        metric('queue_depth', 'gauge', 'Paires en attente de sonde', [('', [], data['queue_depth'])])
+
+        latency = data['latency']
+        samples = [('_bucket', [('le', '+Inf' if bound == float('inf') else f"{bound:g}")], total)
+                   for bound, total in latency['buckets']]
+        samples.append(('_sum', [], f"{latency['sum']:.6f}"))
+        samples.append(('_count', [], latency['count']))
+        metric('connect_latency_seconds', 'histogram',
+               'Latence des connexions abouties ou refusées', samples)
+        return "\n".join(lines) + "\n"
+
+class StatsReporter:
+    """
+    Affiche périodiquement le résumé des métriques pendant un scan
+    """
+
+    def __init__(self, metrics, interval, write=None):
+        """
+        Args:
+            metrics: Métriques à résumer
+            interval: Période d'affichage (secondes)
+            write: Fonction d'affichage d'une ligne (défaut: stderr, sans casser la barre tqdm)
+        """
+        self.metrics = metrics
+        self.interval = interval
+        self.write = write or self._write
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def _write(line):
+        from tqdm import tqdm
+        tqdm.write(line, file=sys.stderr)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.write(self.metrics.summary())
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Arrête l'affichage et écrit le résumé final
+        """
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        self.write(self.metrics.summary())
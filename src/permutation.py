@@ -0,0 +1,63 @@
+"""
+Permutation pseudo-aléatoire à mémoire constante
+
+Un réseau de Feistel à clés aléatoires est une bijection sur [0, 2^b); en
+réappliquant la permutation tant que le résultat dépasse la taille voulue
+(cycle walking), on obtient une bijection sur [0, taille). Chaque indice est
+calculé à la demande: aucune liste n'est matérialisée, quelle que soit la taille.
+"""
+import random
+
+class FeistelPermutation:
+    """
+    Permutation pseudo-aléatoire de range(size), calculée à la demande
+    """
+
+    def __init__(self, size, seed=None, rounds=4):
+        """
+        Args:
+            size: Taille de l'espace à permuter
+            seed: Graine (même graine, même ordre)
+            rounds: Nombre de tours du réseau de Feistel
+        """
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits & 1
+        self.half_bits = bits // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        rng = random.Random(seed)
+        self.keys = [rng.getrandbits(32) for _ in range(rounds)]
+
+    def _encrypt(self, value):
+        half_bits = self.half_bits
+        mask = self.half_mask
+        left = value >> half_bits
+        right = value & mask
+        for key in self.keys:
+            # Fonction de tour: mélange multiplicatif (type murmur) de la moitié droite
+            mixed = (right * 0x9E3779B1 + key) & 0xffffffff
+            mixed ^= mixed >> 15
+            mixed = (mixed * 0x85EBCA77) & 0xffffffff
+            mixed ^= mixed >> 13
+            left, right = right, left ^ (mixed & mask)
+        return (left << half_bits) | right
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def __iter__(self):
+        size = self.size
+        encrypt = self._encrypt
+        for index in range(size):
+            value = encrypt(index)
+            while value >= size:
+                value = encrypt(value)
+            yield value
@@ -0,0 +1,202 @@
+"""
+Moteur de scan persistant pour les scans répétés
+
+Un ScanPool garde ses threads de sonde, son pool de lecture des bannières et
+les estimations de RTT des hôtes déjà scannés d'un scan à l'autre. Chaque scan
+reste un PortScanner indépendant (résultats, sinks, annulation, progression)
+dont la passe de sonde est confiée aux workers du pool: plusieurs scans
+simultanés se partagent les threads à tour de rôle, chacun dans la limite de
+son propre nombre de threads.
+"""
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from results import STATE_FILTERED
+from rtt import RttEstimator
+
+class PoolJob:
+    """
+    Passe de sonde d'un scanner, exécutée par les workers du pool
+    """
+    __slots__ = ('scanner', 'progress_bar', 'limit', 'in_flight', 'exhausted', 'done')
+
+    def __init__(self, scanner, progress_bar, limit):
+        self.scanner = scanner
+        self.progress_bar = progress_bar
+        self.limit = limit
+        self.in_flight = 0
+        self.exhausted = False
+        self.done = threading.Event()
+
+class ScanPool:
+    """
+    Pool de workers persistant, partagé par des scans successifs ou simultanés
+    """
+
+    def __init__(self, threads=500, banner_concurrency=50, max_jobs=8, max_hosts=4096):
+        """
+        Args:
+            threads: Nombre maximum de workers de sonde (démarrés à la demande)
+            banner_concurrency: Nombre de bannières lues simultanément, tous scans confondus
+            max_jobs: Scans exécutés simultanément par submit()
+            max_hosts: Nombre d'hôtes dont l'estimation de RTT est conservée
+        """
+        self.threads = threads
+        self.max_hosts = max_hosts
+        self.banner_executor = ThreadPoolExecutor(max_workers=banner_concurrency,
+                                                  thread_name_prefix='pool-banner')
+        self.job_executor = ThreadPoolExecutor(max_workers=max_jobs,
+                                               thread_name_prefix='pool-job')
+        self.jobs = deque()
+        self.workers = []
+        self.idle = 0
+        self.estimators = OrderedDict()
+        self.closed = False
+        self.condition = threading.Condition()
+        self.estimators_lock = threading.Lock()
+
+    def scan(self, target, ports, verbose=False, **options):
+        """
+        Scan complet exécuté par le pool (bloquant), retourne ses résultats
+
+        Les options sont celles de PortScanner (threads limite la part du pool
+        utilisée par ce scan).
+        """
+        from scanner import PortScanner
+        scanner = PortScanner(target, ports, pool=self, **options)
+        return scanner.scan(verbose=verbose)
+
+    def submit(self, target, ports, **options):
+        """
+        Lance un scan en arrière-plan: retourne un Future de ses résultats
+        """
+        if self.closed:
+            raise RuntimeError("Pool de scan fermé")
+        return self.job_executor.submit(self.scan, target, ports, **options)
+
+    def rtt_estimator(self, host, initial_timeout, min_timeout, max_timeout):
+        """
+        Estimation de RTT d'un hôte, conservée d'un scan à l'autre
+        """
+        key = (host, min_timeout, max_timeout)
+        with self.estimators_lock:
+            estimator = self.estimators.get(key)
+            if estimator is None:
+                estimator = RttEstimator(initial_timeout, min_timeout, max_timeout)
+                self.estimators[key] = estimator
+                if len(self.estimators) > self.max_hosts:
+                    self.estimators.popitem(last=False)
+            else:
+                self.estimators.move_to_end(key)
+            return estimator
+
+    def run(self, scanner, progress_bar):
+        """
+        Exécute une passe de sonde de `scanner` (paires de work_items()) sur
+        les workers du pool; retourne quand toutes les sondes sont terminées
+        """
+        if self.closed:
+            raise RuntimeError("Pool de scan fermé")
+        scanner.items = iter(scanner.work_items())
+        job = PoolJob(scanner, progress_bar, max(1, min(scanner.threads, self.threads)))
+        with self.condition:
+            self.jobs.append(job)
+            self._grow(job.limit)
+            self.condition.notify_all()
+        job.done.wait()
+
+    def _grow(self, wanted):
+        """
+        Démarre des workers si les workers inactifs ne suffisent pas
+        """
+        missing = min(wanted - self.idle, self.threads - len(self.workers))
+        for _ in range(max(0, missing)):
+            worker = threading.Thread(target=self._worker, name='pool-worker', daemon=True)
+            self.workers.append(worker)
+            self.idle += 1
+            worker.start()
+
+    def _next_job(self):
+        """
+        Prochain scan ayant de la place (à tour de rôle), None si aucun
+        """
+        for _ in range(len(self.jobs)):
+            job = self.jobs[0]
+            self.jobs.rotate(-1)
+            if not job.exhausted and job.in_flight < job.limit:
+                return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                job = self._next_job()
+                while job is None:
+                    if self.closed:
+                        self.idle -= 1
+                        return
+                    self.condition.wait()
+                    job = self._next_job()
+                job.in_flight += 1
+                self.idle -= 1
+
+            item = job.scanner.next_item()
+            try:
+                if item is not None:
+                    host, port = item
+                    self._probe(job.scanner, host, port)
+                    job.progress_bar.update(1)
+            finally:
+                with self.condition:
+                    self.idle += 1
+                    job.in_flight -= 1
+                    if item is None:
+                        job.exhausted = True
+                    if job.exhausted:
+                        if job.in_flight == 0 and not job.done.is_set():
+                            self.jobs.remove(job)
+                            job.done.set()
+                    else:
+                        # Une place s'est libérée dans ce scan
+                        self.condition.notify()
+
+    @staticmethod
+    def _probe(scanner, host, port):
+        """
+        Sonde une paire; une exception (sonde, sink) ne tue pas le worker:
+        la paire est enregistrée filtrée, faute de réponse exploitable
+        """
+        try:
+            if scanner.rate_limiter:
+                scanner.rate_limiter.acquire()
+            scanner.scan_port(port, host)
+        except Exception:
+            try:
+                scanner.record(host, port, STATE_FILTERED)
+            except Exception:
+                # Sink défaillant: le résultat est déjà dans le store
+                pass
+
+    def stats(self):
+        """
+        Occupation du pool
+        """
+        with self.condition:
+            return {
+                'workers': len(self.workers),
+                'idle': self.idle,
+                'jobs': len(self.jobs),
+                'warm_hosts': len(self.estimators)
+            }
+
+    def close(self):
+        """
+        Arrête les workers (les scans en cours se terminent d'abord)
+        """
+        self.job_executor.shutdown(wait=True)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        for worker in self.workers:
+            worker.join()
+        self.banner_executor.shutdown(wait=True)
@@ -1,6 +1,8 @@
 """
 Base de données des ports connus et leurs services associés
 """
+import threading
+from registry import ServiceRegistry
 
 COMMON_PORTS = {
     20: "FTP Data",
@@ -38,35 +40,97 @@ DANGEROUS_PORTS = {
     5900: "VNC - Souvent mal configuré"
 }
 
+# Sonde de bannière par port (voir banner.PROBES), 'generic' par défaut:
+#   greeting: le serveur parle en premier (SSH, SMTP, FTP...)
+#   http: requête HEAD
+#   tls / tls-http: poignée de main TLS, puis attente ou requête HEAD
+BANNER_PROBES = {
+    21: "greeting",
+    22: "greeting",
+    23: "greeting",
+    25: "greeting",
+    80: "http",
+    110: "greeting",
+    143: "greeting",
+    443: "tls-http",
+    465: "tls",
+    587: "greeting",
+    993: "tls",
+    995: "tls",
+    3306: "greeting",
+    5900: "greeting",
+    8080: "http",
+    8443: "tls-http",
+    9200: "http"
+}
+
 PORT_RANGES = {
     "well-known": (0, 1023),
     "registered": (1024, 49151),
     "dynamic": (49152, 65535)
 }
 
-def get_port_info(port):
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """
+    Registre complet des services (chargé au premier appel)
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ServiceRegistry(PORT_RANGES, DANGEROUS_PORTS)
+    return _registry
+
+def get_port_info(port, fingerprint=None, protocol="tcp"):
     """
     Retourne les informations sur un port donné
+    
+    Si une empreinte de bannière est fournie (fingerprint.match_banner), le
+    service identifié remplace celui déduit du numéro de port.
     """
-    service = COMMON_PORTS.get(port, "Unknown")
-    is_dangerous = port in DANGEROUS_PORTS
+    registry = get_registry()
+    service = COMMON_PORTS.get(port) or registry.service(port, protocol) or "Unknown"
+    product = ""
+    if fingerprint:
+        service = fingerprint['service']
+        product = " ".join(part for part in (fingerprint.get('product'),
+                                             fingerprint.get('version')) if part)
+    is_dangerous = registry.is_dangerous(port)
     danger_info = DANGEROUS_PORTS.get(port, "") if is_dangerous else ""
     
-    # Déterminer la catégorie du port
-    category = "dynamic"
-    for cat, (start, end) in PORT_RANGES.items():
-        if start <= port <= end:
-            category = cat
-            break
-    
     return {
         "port": port,
         "service": service,
-        "category": category,
+        "product": product,
+        "category": registry.category(port),
         "is_dangerous": is_dangerous,
         "danger_info": danger_info
     }
 
+def service_label(info):
+    """
+    Libellé d'affichage d'un service (avec le produit identifié s'il est connu)
+    """
+    if info.get('product'):
+        return f"{info['service']} ({info['product']})"
+    return info['service']
+
+def get_banner_probe(port):
+    """
+    Retourne le nom de la sonde de bannière adaptée à un port
+    """
+    return BANNER_PROBES.get(port, "generic")
+
+def get_top_ports(count, protocol="tcp"):
+    """
+    Retourne les `count` ports les plus fréquemment ouverts (au plus les ports
+    classés du registre, voir get_registry().ranked_count())
+    """
+    return get_registry().top_ports(count, protocol)
+
 def get_common_ports_list():
     """
     Retourne la liste des ports communs à scanner
@@ -0,0 +1,101 @@
+"""
+Contrôle d'un scan en cours: annulation coopérative et suivi de progression
+"""
+import threading
+import time
+from tqdm import tqdm
+
+class CancelToken:
+    """
+    Jeton d'annulation partagé entre le demandeur et le scanner
+
+    Les moteurs consultent `cancelled` entre deux sondes: l'annulation prend
+    effet après les sondes en vol, les threads et sockets sont libérés normalement.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self.event = threading.Event()
+
+    def cancel(self):
+        """
+        Demande l'arrêt du scan
+        """
+        self.cancelled = True
+        self.event.set()
+
+    def wait(self, timeout=None):
+        """
+        Attend l'annulation (retourne True si le scan a été annulé)
+        """
+        return self.event.wait(timeout)
+
+class ScanProgress:
+    """
+    Barre de progression du scan, doublée d'un callback limité en fréquence
+
+    Le callback reçoit au plus une mise à jour toutes les `interval` secondes:
+    {'progress', 'total', 'percentage', 'open_ports'}, où open_ports ne contient
+    que les ports ouverts trouvés depuis la mise à jour précédente.
+    """
+
+    def __init__(self, total, callback=None, interval=0.1, show_bar=True):
+        """
+        Args:
+            total: Nombre de paires (hôte, port) à scanner
+            callback: Fonction appelée avec chaque mise à jour (None: barre seule)
+            interval: Période minimale entre deux appels du callback (secondes)
+            show_bar: Afficher la barre tqdm
+        """
+        self.total = total
+        self.callback = callback
+        self.interval = interval
+        self.done = 0
+        self.findings = []
+        self.last_emit = 0.0
+        self.lock = threading.Lock()
+        self.bar = tqdm(total=total, desc="Scan en cours", unit="port") if show_bar else None
+
+    def update(self, count=1):
+        """
+        Compte des paires terminées
+        """
+        if self.bar is not None:
+            self.bar.update(count)
+        if self.callback:
+            with self.lock:
+                self.done += count
+            self.maybe_emit()
+
+    def found(self, host, port, banner=None):
+        """
+        Signale un port ouvert (transmis avec la prochaine mise à jour)
+        """
+        if self.callback:
+            with self.lock:
+                self.findings.append({'host': host, 'port': port, 'banner': banner or ''})
+            self.maybe_emit()
+
+    def maybe_emit(self, force=False):
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self.last_emit < self.interval:
+                return
+            self.last_emit = now
+            done = min(self.done, self.total)
+            findings, self.findings = self.findings, []
+        self.callback({
+            'progress': done,
+            'total': self.total,
+            'percentage': done * 100.0 / self.total if self.total else 100.0,
+            'open_ports': findings
+        })
+
+    def close(self):
+        """
+        Ferme la barre et transmet la dernière mise à jour
+        """
+        if self.bar is not None:
+            self.bar.close()
+        if self.callback:
+            self.maybe_emit(force=True)
@@ -0,0 +1,110 @@
+"""
+Limitation de cadence (seau à jetons) et contrôle de congestion AIMD
+"""
+import threading
+import time
+
+class TokenBucket:
+    """
+    Seau à jetons thread-safe: limite le nombre de sondes par seconde
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Args:
+            rate: Nombre de sondes autorisées par seconde
+            burst: Taille maximale d'une rafale (défaut: rate / 10, au moins 1)
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate / 10)
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        """
+        Modifie la cadence (la taille de rafale est conservée)
+        """
+        with self.lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def reserve(self):
+        """
+        Réserve un jeton et retourne le délai d'attente avant d'envoyer (secondes)
+
+        Les jetons manquants sont comptés en dette, ce qui espace les appelants
+        concurrents sans qu'ils aient à boucler.
+        """
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """
+        Bloque jusqu'à obtention d'un jeton
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+class AimdController:
+    """
+    Ajuste la cadence d'un TokenBucket selon le taux de ports sans réponse:
+    diminution multiplicative quand le ratio de timeouts/filtrés dépasse le
+    seuil sur une fenêtre, augmentation additive quand les réponses sont nettes
+    """
+
+    def __init__(self, bucket, min_rate, max_rate, window=50, threshold=0.3,
+                 decrease=0.5, increase=None):
+        """
+        Args:
+            bucket: TokenBucket à piloter
+            min_rate: Cadence plancher (sondes/s)
+            max_rate: Cadence plafond (sondes/s)
+            window: Nombre de résultats par évaluation
+            threshold: Ratio de filtrés au-delà duquel la cadence est réduite
+            decrease: Facteur multiplicatif de réduction
+            increase: Pas d'augmentation additive (défaut: 5% du plafond)
+        """
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.window = window
+        self.threshold = threshold
+        self.decrease = decrease
+        self.increase = increase or max(1.0, max_rate * 0.05)
+        self.samples = 0
+        self.filtered = 0
+        self.lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def observe(self, filtered):
+        """
+        Enregistre le résultat d'une sonde (filtered: pas de réponse)
+        """
+        with self.lock:
+            self.samples += 1
+            if filtered:
+                self.filtered += 1
+            if self.samples < self.window:
+                return
+            ratio = self.filtered / self.samples
+            self.samples = 0
+            self.filtered = 0
+
+        if ratio > self.threshold:
+            self.bucket.set_rate(max(self.min_rate, self.rate * self.decrease))
+        else:
+            self.bucket.set_rate(min(self.max_rate, self.rate + self.increase))
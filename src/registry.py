@@ -0,0 +1,212 @@
+"""
+Registre complet des services TCP/UDP (config/services.txt)
+
+Le fichier est précompilé (python src/registry.py) en config/services.bin:
+tables de 65536 entrées indexées par numéro de port (identifiant de service
+par protocole), listes des ports classés et noms des services. Le fichier
+compilé est projeté en mémoire (mmap) au premier usage, sans analyse du texte;
+s'il manque ou ne correspond plus au texte (empreinte SHA-1), le texte est
+analysé à la place. Les attributs (catégorie, port dangereux) tiennent dans un
+octet par port. Chaque recherche est un accès direct, sans boucle ni dictionnaire.
+"""
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+DEFAULT_REGISTRY = Path(__file__).parent.parent / 'config' / 'services.txt'
+PORT_COUNT = 65536
+PROTOCOLS = ('tcp', 'udp')
+
+# En-tête du fichier compilé: signature, empreinte du texte, taille des noms
+# puis nombre de ports classés par protocole (entiers little-endian)
+COMPILED_MAGIC = b'PSREG001'
+COMPILED_HEADER = struct.Struct('<8s20sIII')
+
+CATEGORY_MASK = 0x3
+FLAG_DANGEROUS = 0x4
+
+class ServiceRegistry:
+    """
+    Tables de correspondance port -> service, catégorie et danger
+    """
+
+    def __init__(self, port_ranges, dangerous_ports=(), path=DEFAULT_REGISTRY):
+        """
+        Args:
+            port_ranges: Catégories {nom: (début, fin)} (4 au plus)
+            dangerous_ports: Ports à signaler comme dangereux
+            path: Fichier du registre (nom  port/protocole  [rang]); sa version
+                  compilée (même nom, extension .bin) est utilisée si elle est à jour
+        """
+        self.categories = list(port_ranges)
+        self.flags = bytearray(PORT_COUNT)
+
+        # Les catégories sont appliquées dans l'ordre: la première l'emporte
+        for code, (start, end) in reversed(list(enumerate(port_ranges.values()))):
+            start, end = max(0, start), min(PORT_COUNT - 1, end)
+            self.flags[start:end + 1] = bytes([code]) * (end - start + 1)
+        for port in dangerous_ports:
+            self.flags[port] |= FLAG_DANGEROUS
+
+        compiled = load_compiled(path)
+        self.memory_mapped = compiled is not None
+        self.names, self.tables, self.ranked = compiled or parse_registry(path)
+
+    def service(self, port, protocol='tcp'):
+        """
+        Nom du service enregistré pour un port (None si inconnu)
+        """
+        return self.names[self.tables[protocol][port]] or None
+
+    def category(self, port):
+        """
+        Catégorie d'un port (well-known, registered, dynamic)
+        """
+        return self.categories[self.flags[port] & CATEGORY_MASK]
+
+    def is_dangerous(self, port):
+        """
+        Indique si le port figure parmi les ports dangereux
+        """
+        return bool(self.flags[port] & FLAG_DANGEROUS)
+
+    def top_ports(self, count, protocol='tcp'):
+        """
+        Les `count` ports les plus fréquemment ouverts
+
+        Limité aux ports classés du registre (rang renseigné): au-delà, l'ordre
+        ne refléterait plus aucune fréquence. Voir ranked_count().
+        """
+        return list(self.ranked[protocol][:max(0, count)])
+
+    def ranked_count(self, protocol='tcp'):
+        """
+        Nombre de ports classés, plafond des listes top_ports()
+        """
+        return len(self.ranked[protocol])
+
+def read_source(path):
+    """
+    Contenu du registre texte (b'' s'il est absent)
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return b''
+
+def compiled_path(path):
+    """
+    Fichier compilé associé à un registre texte
+    """
+    return Path(path).with_suffix('.bin')
+
+def parse_registry(path):
+    """
+    Analyse le registre texte: (noms, tables par protocole, ports classés)
+    """
+    names = ['']
+    name_ids = {'': 0}
+    tables = {protocol: array('H', bytes(2 * PORT_COUNT)) for protocol in PROTOCOLS}
+    ranks = {protocol: [] for protocol in PROTOCOLS}
+
+    for line in read_source(path).decode('utf-8').splitlines():
+        fields = line.split('#', 1)[0].split()
+        if len(fields) < 2 or '/' not in fields[1]:
+            continue
+        port, protocol = fields[1].split('/', 1)
+        if protocol not in tables or not port.isdigit():
+            continue
+        port = int(port)
+        if port >= PORT_COUNT:
+            continue
+
+        name = fields[0] if fields[0] != 'unknown' else ''
+        service_id = name_ids.get(name)
+        if service_id is None:
+            service_id = name_ids[name] = len(names)
+            names.append(name)
+        if not tables[protocol][port]:
+            tables[protocol][port] = service_id
+
+        if len(fields) > 2 and fields[2].isdigit():
+            ranks[protocol].append((int(fields[2]), port))
+
+    ranked = {protocol: [port for _, port in sorted(entries)]
+              for protocol, entries in ranks.items()}
+    return names, tables, ranked
+
+def compile_registry(path=DEFAULT_REGISTRY, output=None):
+    """
+    Précompile le registre texte en fichier binaire (voir load_compiled)
+
+    Retourne le chemin du fichier écrit.
+    """
+    output = Path(output) if output else compiled_path(path)
+    names, tables, ranked = parse_registry(path)
+    name_data = '\n'.join(names).encode('utf-8')
+    header = COMPILED_HEADER.pack(
+        COMPILED_MAGIC, hashlib.sha1(read_source(path)).digest(), len(name_data),
+        *(len(ranked[protocol]) for protocol in PROTOCOLS)
+    )
+    with open(output, 'wb') as f:
+        f.write(header)
+        for protocol in PROTOCOLS:
+            table = array('H', tables[protocol])
+            if sys.byteorder != 'little':
+                table.byteswap()
+            f.write(table.tobytes())
+        for protocol in PROTOCOLS:
+            ports = array('H', ranked[protocol])
+            if sys.byteorder != 'little':
+                ports.byteswap()
+            f.write(ports.tobytes())
+        f.write(name_data)
+    return output
+
+def load_compiled(path):
+    """
+    Projette en mémoire le registre compilé de `path`
+
+    Retourne (noms, tables, ports classés), ou None si le fichier compilé est
+    absent, invalide ou périmé (texte modifié depuis la compilation).
+    """
+    try:
+        with open(compiled_path(path), 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) < COMPILED_HEADER.size:
+        return None
+    magic, digest, name_size, *ranked_counts = COMPILED_HEADER.unpack_from(data)
+    if magic != COMPILED_MAGIC or digest != hashlib.sha1(read_source(path)).digest():
+        return None
+
+    view = memoryview(data)
+
+    def words(offset, count):
+        chunk = view[offset:offset + 2 * count]
+        if sys.byteorder == 'little':
+            # Lecture directe dans la projection, sans copie
+            return chunk.cast('H')
+        table = array('H', chunk)
+        table.byteswap()
+        return table
+
+    offset = COMPILED_HEADER.size
+    tables = {}
+    for protocol in PROTOCOLS:
+        tables[protocol] = words(offset, PORT_COUNT)
+        offset += 2 * PORT_COUNT
+    ranked = {}
+    for protocol, count in zip(PROTOCOLS, ranked_counts):
+        ranked[protocol] = list(words(offset, count))
+        offset += 2 * count
+    names = bytes(view[offset:offset + name_size]).decode('utf-8').split('\n')
+    return names, tables, ranked
+
+if __name__ == '__main__':
+    print(f"Registre compilé: {compile_registry()}")
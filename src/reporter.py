@@ -4,7 +4,7 @@ Module de génération de rapports
 import json
 from datetime import datetime
 from colorama import Fore, Style
-from port_db import get_port_info
+from port_db import get_port_info, service_label
 
 class Reporter:
     def __init__(self, results):
@@ -16,6 +16,83 @@ class Reporter:
         """
         self.results = results
     
+    def host_results(self):
+        """
+        Retourne la liste des résultats par hôte (un seul élément pour un scan mono-cible)
+        """
+        hosts = self.results.get('hosts')
+        if hosts and len(hosts) > 1:
+            return list(hosts.values())
+        return [self.results]
+    
+    def protocol(self):
+        """
+        Protocole scanné ('tcp' ou 'udp')
+        """
+        return self.results.get('protocol', 'tcp')
+    
+    def is_multi_target(self):
+        """
+        Indique si le rapport consolide plusieurs cibles
+        """
+        return len(self.host_results()) > 1
+    
+    def _default_filename(self, extension):
+        """
+        Nom de fichier par défaut dans le dossier results/
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if self.is_multi_target():
+            name = f"multi_{len(self.host_results())}"
+        else:
+            name = self.results['target'].replace(':', '_')
+        return f"results/scan_{name}_{timestamp}.{extension}"
+    
+    def _open_port_entries(self, host_results):
+        """
+        Prépare les détails des ports ouverts d'un hôte
+        """
+        entries = []
+        for port_data in host_results['open_ports']:
+            port = port_data['port']
+            info = get_port_info(port, port_data.get('fingerprint'), self.protocol())
+            entries.append({
+                'port': port,
+                'service': info['service'],
+                'product': info['product'],
+                'category': info['category'],
+                'is_dangerous': info['is_dangerous'],
+                'danger_info': info['danger_info'],
+                'banner': port_data['banner'],
+                'fingerprint': port_data.get('fingerprint')
+            })
+        return entries
+    
+    def _print_console_ports(self, open_ports):
+        """
+        Affiche la table des ports ouverts d'un hôte
+        """
+        print(f"{'PORT':<8} {'SERVICE':<30} {'CATÉGORIE':<15} {'BANNIÈRE'}")
+        print("-" * 80)
+        
+        for port_data in open_ports:
+            port = port_data['port']
+            banner = port_data['banner'][:30] if port_data['banner'] else "N/A"
+            info = get_port_info(port, port_data.get('fingerprint'), self.protocol())
+            
+            # Coloration selon le danger
+            if info['is_dangerous']:
+                color = Fore.RED
+                warning = " [ATTENTION]"
+            else:
+                color = Fore.GREEN
+                warning = ""
+            
+            print(f"{color}{port:<8} {service_label(info)[:30]:<30} {info['category']:<15} {banner}{warning}{Style.RESET_ALL}")
+            
+            if info['is_dangerous']:
+                print(f"  {Fore.YELLOW}⚠ {info['danger_info']}{Style.RESET_ALL}")
+    
     def print_console_report(self):
         """
         Affiche le rapport dans la console
@@ -24,8 +101,14 @@ class Reporter:
         print(f"                    RÉSULTATS DU SCAN")
         print(f"{'='*70}{Style.RESET_ALL}\n")
         
+        hosts = self.host_results()
+        
         # Informations générales
         print(f"{Fore.YELLOW}Cible:{Style.RESET_ALL} {self.results['target']}")
+        if self.protocol() != 'tcp':
+            print(f"{Fore.YELLOW}Protocole:{Style.RESET_ALL} {self.protocol().upper()}")
+        if len(hosts) > 1:
+            print(f"{Fore.YELLOW}Hôtes:{Style.RESET_ALL} {len(hosts)}")
         print(f"{Fore.YELLOW}Début du scan:{Style.RESET_ALL} {self.results['start_time'].strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{Fore.YELLOW}Fin du scan:{Style.RESET_ALL} {self.results['end_time'].strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{Fore.YELLOW}Durée:{Style.RESET_ALL} {self.results['duration']:.2f} secondes")
@@ -39,44 +122,65 @@ class Reporter:
         print(f"Ports filtrés: {self.results['filtered_ports']}\n")
         
         # Liste des ports ouverts
-        if self.results['open_ports']:
+        if self.results['open_ports'] and len(hosts) > 1:
+            hosts_without_ports = 0
+            for host_results in hosts:
+                if not host_results['open_ports']:
+                    hosts_without_ports += 1
+                    continue
+                print(f"{Fore.CYAN}--- {host_results['target']} : "
+                      f"{len(host_results['open_ports'])} PORT(S) OUVERT(S) ---{Style.RESET_ALL}\n")
+                self._print_console_ports(host_results['open_ports'])
+                print()
+            if hosts_without_ports:
+                print(f"{Fore.YELLOW}Hôtes sans port ouvert: {hosts_without_ports}{Style.RESET_ALL}")
+        elif self.results['open_ports']:
             print(f"{Fore.CYAN}--- PORTS OUVERTS ---{Style.RESET_ALL}\n")
-            print(f"{'PORT':<8} {'SERVICE':<20} {'CATÉGORIE':<15} {'BANNIÈRE'}")
-            print("-" * 70)
-            
-            for port_data in self.results['open_ports']:
-                port = port_data['port']
-                banner = port_data['banner'][:30] if port_data['banner'] else "N/A"
-                info = get_port_info(port)
-                
-                # Coloration selon le danger
-                if info['is_dangerous']:
-                    color = Fore.RED
-                    warning = " [ATTENTION]"
-                else:
-                    color = Fore.GREEN
-                    warning = ""
-                
-                print(f"{color}{port:<8} {info['service']:<20} {info['category']:<15} {banner}{warning}{Style.RESET_ALL}")
-                
-                if info['is_dangerous']:
-                    print(f"  {Fore.YELLOW}⚠ {info['danger_info']}{Style.RESET_ALL}")
+            self._print_console_ports(self.results['open_ports'])
         else:
             print(f"{Fore.YELLOW}Aucun port ouvert détecté.{Style.RESET_ALL}")
         
         print(f"\n{Fore.CYAN}{'='*70}{Style.RESET_ALL}\n")
     
+    def print_changes(self):
+        """
+        Affiche les ports ouverts ou fermés depuis le scan de référence
+        """
+        changes = self.results.get('changes')
+        if not changes:
+            return
+        
+        print(f"\n{Fore.CYAN}{'='*70}")
+        print(f"{'CHANGEMENTS DEPUIS LE SCAN DE RÉFÉRENCE':^70}")
+        print(f"{'='*70}{Style.RESET_ALL}\n")
+        
+        multi = self.is_multi_target()
+        for entry in changes['opened']:
+            host_prefix = f"{entry['host']} " if multi else ""
+            info = get_port_info(entry['port'], protocol=self.protocol())
+            print(f"{Fore.RED}+ {host_prefix}{entry['port']:<8} {service_label(info)}{Style.RESET_ALL}")
+        for entry in changes['closed']:
+            host_prefix = f"{entry['host']} " if multi else ""
+            info = get_port_info(entry['port'], protocol=self.protocol())
+            print(f"{Fore.GREEN}- {host_prefix}{entry['port']:<8} {service_label(info)}{Style.RESET_ALL}")
+        
+        if not changes['opened'] and not changes['closed']:
+            print("Aucun changement")
+        if changes['new_hosts']:
+            print(f"{Fore.YELLOW}Hôtes sans scan de référence: {', '.join(changes['new_hosts'])}{Style.RESET_ALL}")
+        print()
+    
     def generate_json_report(self, filename=None):
         """
         Génère un rapport au format JSON
         """
         if filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"results/scan_{self.results['target']}_{timestamp}.json"
+            filename = self._default_filename('json')
         
         # Préparer les données pour JSON
         json_data = {
             'target': self.results['target'],
+            'protocol': self.protocol(),
             'start_time': self.results['start_time'].isoformat(),
             'end_time': self.results['end_time'].isoformat(),
             'duration_seconds': self.results['duration'],
@@ -86,22 +190,31 @@ class Reporter:
                 'closed_ports_count': self.results['closed_ports'],
                 'filtered_ports_count': self.results['filtered_ports'],
                 'scan_speed': self.results['scan_speed']
-            },
-            'open_ports': []
+            }
         }
         
-        # Ajouter les détails des ports ouverts
-        for port_data in self.results['open_ports']:
-            port = port_data['port']
-            info = get_port_info(port)
-            json_data['open_ports'].append({
-                'port': port,
-                'service': info['service'],
-                'category': info['category'],
-                'is_dangerous': info['is_dangerous'],
-                'danger_info': info['danger_info'],
-                'banner': port_data['banner']
-            })
+        # Ajouter les détails des ports ouverts (par hôte pour un scan multi-cibles)
+        hosts = self.host_results()
+        if len(hosts) > 1:
+            json_data['statistics']['hosts_count'] = len(hosts)
+            json_data['hosts'] = []
+            for host_results in hosts:
+                json_data['hosts'].append({
+                    'target': host_results['target'],
+                    'statistics': {
+                        'total_ports_scanned': host_results['total_ports'],
+                        'open_ports_count': len(host_results['open_ports']),
+                        'closed_ports_count': host_results['closed_ports'],
+                        'filtered_ports_count': host_results['filtered_ports']
+                    },
+                    'open_ports': self._open_port_entries(host_results)
+                })
+        else:
+            json_data['open_ports'] = self._open_port_entries(self.results)
+        
+        # Changements par rapport au scan de référence (--diff-against)
+        if self.results.get('changes'):
+            json_data['changes'] = self.results['changes']
         
         # Écrire le fichier JSON
         try:
@@ -122,8 +235,10 @@ class Reporter:
         Génère un rapport au format HTML
         """
         if filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"results/scan_{self.results['target']}_{timestamp}.html"
+            filename = self._default_filename('html')
+        
+        hosts = self.host_results()
+        hosts_line = f"<p><strong>Hôtes:</strong> {len(hosts)}</p>" if len(hosts) > 1 else ""
         
         html_content = f"""<!DOCTYPE html>
 <html lang="fr">
@@ -152,6 +267,7 @@ class Reporter:
         
         <div class="info">
             <p><strong>Cible:</strong> {self.results['target']}</p>
+            {hosts_line}
             <p><strong>Date:</strong> {self.results['start_time'].strftime('%Y-%m-%d %H:%M:%S')}</p>
             <p><strong>Durée:</strong> {self.results['duration']:.2f} secondes</p>
         </div>
@@ -175,8 +291,18 @@ class Reporter:
                 <p>Ports Filtrés</p>
             </div>
         </div>
+"""
         
-        <h2>Ports Ouverts</h2>
+        for host_results in hosts:
+            if len(hosts) > 1:
+                if not host_results['open_ports']:
+                    continue
+                title = f"{host_results['target']} - Ports Ouverts"
+            else:
+                title = "Ports Ouverts"
+            
+            html_content += f"""
+        <h2>{title}</h2>
         <table>
             <thead>
                 <tr>
@@ -189,27 +315,30 @@ class Reporter:
             </thead>
             <tbody>
 """
-        
-        for port_data in self.results['open_ports']:
-            port = port_data['port']
-            info = get_port_info(port)
-            banner = port_data['banner'][:50] if port_data['banner'] else "N/A"
-            status_class = "dangerous" if info['is_dangerous'] else "safe"
-            status_text = "ATTENTION" if info['is_dangerous'] else "OK"
             
-            html_content += f"""
+            for port_data in host_results['open_ports']:
+                port = port_data['port']
+                info = get_port_info(port, port_data.get('fingerprint'), self.protocol())
+                banner = port_data['banner'][:50] if port_data['banner'] else "N/A"
+                status_class = "dangerous" if info['is_dangerous'] else "safe"
+                status_text = "ATTENTION" if info['is_dangerous'] else "OK"
+                
+                html_content += f"""
                 <tr>
                     <td><strong>{port}</strong></td>
-                    <td>{info['service']}</td>
+                    <td>{service_label(info)}</td>
                     <td>{info['category']}</td>
                     <td><span class="{status_class}">{status_text}</span></td>
                     <td>{banner}</td>
                 </tr>
 """
-        
-        html_content += """
+            
+            html_content += """
             </tbody>
         </table>
+"""
+        
+        html_content += """
     </div>
 </body>
 </html>
@@ -0,0 +1,124 @@
+"""
+Résolution DNS concurrente avec cache (TTL, LRU et cache négatif)
+"""
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+class DnsResolver:
+    """
+    Résolveur de noms d'hôtes thread-safe
+
+    Les réponses (y compris les échecs) sont conservées dans un cache LRU
+    borné: une réponse positive expire après `ttl` secondes, un échec après
+    `negative_ttl` secondes. Les adresses littérales ne sont jamais résolues.
+    """
+
+    def __init__(self, ttl=300, negative_ttl=30, max_entries=1024, max_workers=32,
+                 family=socket.AF_UNSPEC):
+        """
+        Args:
+            ttl: Durée de vie d'une résolution réussie (secondes)
+            negative_ttl: Durée de vie d'un échec de résolution (secondes)
+            max_entries: Nombre maximal de noms conservés
+            max_workers: Nombre de résolutions simultanées pour resolve_many()
+            family: AF_UNSPEC (IPv4 puis IPv6), AF_INET ou AF_INET6
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self.family = family
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _lookup(self, name):
+        """
+        Interroge le système (bloquant) et retourne les adresses, IPv4 en premier
+        """
+        try:
+            infos = socket.getaddrinfo(name, None, self.family, socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return []
+
+        addresses = []
+        for family, _, _, _, sockaddr in infos:
+            address = sockaddr[0].split('%', 1)[0]
+            if address not in addresses:
+                addresses.append(address)
+        addresses.sort(key=lambda address: ':' in address)
+        return addresses
+
+    def resolve_all(self, name):
+        """
+        Retourne toutes les adresses d'un nom d'hôte (liste vide si échec)
+        """
+        name = name.strip()
+        try:
+            return [str(ipaddress.ip_address(name))]
+        except ValueError:
+            pass
+
+        key = name.lower()
+        now = time.monotonic()
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry and entry[0] > now:
+                self.cache.move_to_end(key)
+                return list(entry[1])
+
+        addresses = self._lookup(name)
+        expires = now + (self.ttl if addresses else self.negative_ttl)
+        with self.lock:
+            self.cache[key] = (expires, tuple(addresses))
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        return addresses
+
+    def resolve(self, name):
+        """
+        Retourne l'adresse préférée d'un nom d'hôte, ou None si échec
+        """
+        addresses = self.resolve_all(name)
+        return addresses[0] if addresses else None
+
+    def resolve_many(self, names):
+        """
+        Résout une liste de noms en parallèle
+
+        Retourne un dictionnaire {nom: adresse ou None} dans l'ordre des noms
+        """
+        names = list(dict.fromkeys(names))
+        pending = []
+        for name in names:
+            try:
+                ipaddress.ip_address(name.strip())
+            except ValueError:
+                pending.append(name)
+
+        resolved = {}
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                resolved = dict(zip(pending, pool.map(self.resolve, pending)))
+
+        return {name: resolved[name] if name in resolved else self.resolve(name)
+                for name in names}
+
+    def clear(self):
+        """
+        Vide le cache
+        """
+        with self.lock:
+            self.cache.clear()
+
+default_resolver = DnsResolver()
+
+def address_family(host):
+    """
+    Famille de socket à utiliser pour une adresse (AF_INET6 si IPv6)
+    """
+    return socket.AF_INET6 if ':' in host else socket.AF_INET
@@ -0,0 +1,231 @@
+"""
+Stockage compact des résultats de scan
+
+Chaque hôte dispose d'une table d'un octet par port scanné (65536 octets pour
+un scan de tous les ports, indexée par la liste des ports sinon) et d'un
+dictionnaire de bannières limité aux ports ouverts. Les workers écrivent sans
+verrou dans un tampon local (array d'entiers 64 bits encodant hôte, port et
+état); les tampons sont fusionnés dans les tables par merge().
+"""
+import threading
+from array import array
+
+STATE_UNKNOWN = 0
+STATE_OPEN = 1
+STATE_CLOSED = 2
+STATE_FILTERED = 3
+
+STATE_NAMES = {
+    STATE_UNKNOWN: 'unknown',
+    STATE_OPEN: 'open',
+    STATE_CLOSED: 'closed',
+    STATE_FILTERED: 'filtered'
+}
+
+STATE_VALUES = {name: value for value, name in STATE_NAMES.items()}
+
+def parse_state(state):
+    """
+    Convertit un nom d'état ('open', 'closed', 'filtered') en constante
+    """
+    if isinstance(state, str):
+        if state not in STATE_VALUES:
+            raise ValueError(f"État inconnu: {state}")
+        return STATE_VALUES[state]
+    return state
+
+class PortIndex:
+    """
+    Position de chaque port scanné dans les tables d'états, partagée par tous
+    les hôtes d'un scan
+    """
+    __slots__ = ('ports', 'slots')
+
+    def __init__(self, ports):
+        self.ports = sorted(set(ports))
+        self.slots = {port: slot for slot, port in enumerate(self.ports)}
+
+    def __len__(self):
+        return len(self.ports)
+
+class HostStateTable:
+    """
+    États des ports d'un hôte et bannières des ports ouverts
+
+    Sans index, la table couvre les 65536 ports; avec un PortIndex, elle ne
+    couvre que les ports du scan (les autres restent inconnus).
+    """
+    __slots__ = ('states', 'banners', 'index')
+
+    def __init__(self, index=None):
+        self.index = index
+        self.states = bytearray(65536 if index is None else len(index))
+        self.banners = {}
+
+    def set(self, port, state, banner=None):
+        """
+        Enregistre l'état d'un port (ignoré s'il n'est pas couvert par l'index)
+        """
+        if self.index is None:
+            self.states[port] = state
+        else:
+            slot = self.index.slots.get(port)
+            if slot is None:
+                return
+            self.states[slot] = state
+        if state == STATE_OPEN:
+            self.banners[port] = banner or ''
+        else:
+            self.banners.pop(port, None)
+
+    def get(self, port):
+        """
+        Retourne l'état d'un port
+        """
+        if self.index is None:
+            return self.states[port]
+        slot = self.index.slots.get(port)
+        return STATE_UNKNOWN if slot is None else self.states[slot]
+
+    def count(self, state):
+        """
+        Nombre de ports dans un état donné
+        """
+        return self.states.count(state)
+
+    def ports(self, state):
+        """
+        Génère les ports (triés) dans un état donné
+        """
+        ports = self.index.ports if self.index is not None else None
+        slot = self.states.find(state)
+        while slot != -1:
+            yield slot if ports is None else ports[slot]
+            slot = self.states.find(state, slot + 1)
+
+class ResultBuffer:
+    """
+    Tampon de résultats propre à un worker (écritures sans verrou)
+    """
+    __slots__ = ('entries', 'banners')
+
+    def __init__(self):
+        self.entries = array('Q')
+        self.banners = {}
+
+    def add(self, host_index, port, state, banner=None):
+        """
+        Ajoute un résultat encodé (hôte << 18 | port << 2 | état)
+        """
+        if state == STATE_OPEN:
+            self.banners[(host_index, port)] = banner or ''
+        self.entries.append((host_index << 18) | (port << 2) | state)
+
+class ScanResultStore:
+    """
+    Résultats d'un scan multi-cibles: une table compacte par hôte
+    """
+
+    def __init__(self, hosts, ports=None):
+        """
+        Args:
+            hosts: Hôtes du scan
+            ports: Ports du scan (défaut: tables de 65536 ports); les tables sont
+                   alors dimensionnées au nombre de ports, un /16 scanné sur
+                   quelques ports ne coûte que quelques octets par hôte
+        """
+        self.hosts = list(hosts)
+        self.host_index = {host: index for index, host in enumerate(self.hosts)}
+        index = None
+        if ports is not None:
+            index = PortIndex(ports)
+            if len(index) == 65536:
+                # Tous les ports: la table directe évite le dictionnaire
+                index = None
+        self.tables = [HostStateTable(index) for _ in self.hosts]
+        self.buffers = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def buffer(self):
+        """
+        Retourne le tampon du thread courant (créé au premier appel)
+        """
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            buffer = ResultBuffer()
+            self.local.buffer = buffer
+            with self.lock:
+                self.buffers.append(buffer)
+        return buffer
+
+    def record(self, host, port, state, banner=None):
+        """
+        Enregistre un résultat dans le tampon du thread courant
+        """
+        self.buffer().add(self.host_index[host], port, state, banner)
+
+    def merge(self):
+        """
+        Fusionne les tampons des workers dans les tables par hôte
+
+        Peut être appelé pendant le scan: seules les entrées déjà présentes
+        sont consommées, les ajouts concurrents restent dans les tampons.
+        """
+        with self.lock:
+            for buffer in self.buffers:
+                count = len(buffer.entries)
+                if not count:
+                    continue
+                entries = buffer.entries[:count]
+                del buffer.entries[:count]
+
+                for entry in entries:
+                    state = entry & 0x3
+                    port = (entry >> 2) & 0xffff
+                    host_index = entry >> 18
+                    banner = None
+                    if state == STATE_OPEN:
+                        banner = buffer.banners.pop((host_index, port), '')
+                    self.tables[host_index].set(port, state, banner)
+
+    def table(self, host):
+        """
+        Table d'états d'un hôte
+        """
+        return self.tables[self.host_index[host]]
+
+    def count(self, state, host=None):
+        """
+        Nombre de ports dans un état donné (pour un hôte ou pour tous)
+        """
+        state = parse_state(state)
+        if host is not None:
+            return self.table(host).count(state)
+        return sum(table.count(state) for table in self.tables)
+
+    def open_ports(self, host=None):
+        """
+        Liste des ports ouverts au format des résultats ({'host', 'port', 'banner'})
+        """
+        hosts = [host] if host is not None else self.hosts
+        open_ports = []
+        for name in hosts:
+            table = self.table(name)
+            for port in table.ports(STATE_OPEN):
+                open_ports.append({
+                    'host': name,
+                    'port': port,
+                    'banner': table.banners.get(port, '')
+                })
+        return open_ports
+
+    def ports_by_state(self, state, host=None):
+        """
+        Ports dans un état donné: liste de ports pour un hôte,
+        liste de paires (hôte, port) sinon
+        """
+        state = parse_state(state)
+        if host is not None:
+            return list(self.table(host).ports(state))
+        return [(name, port) for name in self.hosts for port in self.table(name).ports(state)]
@@ -0,0 +1,52 @@
+"""
+Estimation du temps d'aller-retour (RTT) et timeout adaptatif
+"""
+import threading
+
+class RttEstimator:
+    """
+    Calcule un timeout adaptatif à partir des RTT mesurés, comme le RTO de TCP
+    (RFC 6298): RTO = SRTT + max(G, K * RTTVAR), borné par [min_timeout, max_timeout]
+    """
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+    GRANULARITY = 0.001
+
+    def __init__(self, initial_timeout, min_timeout=0.05, max_timeout=3.0):
+        """
+        Args:
+            initial_timeout: Timeout utilisé tant qu'aucun RTT n'a été mesuré
+            min_timeout: Plancher du timeout (secondes)
+            max_timeout: Plafond du timeout (secondes)
+        """
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max(max_timeout, min_timeout)
+        self.srtt = None
+        self.rttvar = None
+        self.samples = 0
+        self.lock = threading.Lock()
+
+    def observe(self, rtt):
+        """
+        Intègre une mesure de RTT (secondes)
+        """
+        with self.lock:
+            if self.srtt is None:
+                self.srtt = rtt
+                self.rttvar = rtt / 2
+            else:
+                self.rttvar = (1 - self.BETA) * self.rttvar + self.BETA * abs(self.srtt - rtt)
+                self.srtt = (1 - self.ALPHA) * self.srtt + self.ALPHA * rtt
+            self.samples += 1
+
+    def timeout(self):
+        """
+        Retourne le timeout courant (secondes)
+        """
+        if self.srtt is None:
+            rto = self.initial_timeout
+        else:
+            rto = self.srtt + max(self.GRANULARITY, self.K * self.rttvar)
+        return min(max(rto, self.min_timeout), self.max_timeout)
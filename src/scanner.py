@@ -1,150 +1,642 @@
 """
 Module principal de scan de ports
 """
+import errno
+import itertools
+import random
 import socket
 import threading
 import time
 from datetime import datetime
-from tqdm import tqdm
-from queue import Queue
+from rtt import RttEstimator
+from rate_limiter import TokenBucket, AimdController
+from results import (
+    ScanResultStore, STATE_UNKNOWN, STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+)
+from checkpoint import load_checkpoint
+from resolver import address_family
+from banner import BannerGrabber
+from fingerprint import match_banner
+from permutation import FeistelPermutation
+from progress import CancelToken, ScanProgress
+from fd_budget import default_fd_budget, is_exhausted
+
+# Options propres au processus courant, jamais transmises à d'autres processus
+LOCAL_OPTIONS = ('cancel_token', 'on_progress', 'progress_interval', 'metrics', 'fd_budget', 'pool')
 
 class PortScanner:
-    def __init__(self, target, ports, timeout=1, threads=100):
+    engine = 'thread'
+    protocol = 'tcp'
+    
+    def __init__(self, target, ports, timeout=1, threads=100,
+                 adaptive_timeout=False, min_timeout=0.05, max_timeout=3.0,
+                 max_rate=None, min_rate=None, banner_grabbing=True,
+                 banner_timeout=0.5, banner_concurrency=50, randomize=True, seed=None,
+                 cancel_token=None, on_progress=None, progress_interval=0.1,
+                 metrics=None, retry_passes=0, retry_timeout_factor=2.0,
+                 retry_rate_factor=0.5, retry_max_ratio=0.5, fd_budget=None, pool=None,
+                 priority_ports=None):
         """
         Initialise le scanner de ports
         
         Args:
-            target: Adresse IP ou nom d'hôte cible
+            target: Adresse IP ou nom d'hôte cible, ou liste de cibles
             ports: Liste des ports à scanner
             timeout: Timeout pour chaque connexion (secondes)
             threads: Nombre de threads pour le scan parallèle
+            adaptive_timeout: Ajuster le timeout de chaque cible selon les RTT mesurés
+            min_timeout: Plancher du timeout adaptatif (secondes)
+            max_timeout: Plafond du timeout adaptatif (secondes)
+            max_rate: Cadence maximale en sondes par seconde (None: illimitée)
+            min_rate: Cadence plancher du contrôle AIMD (défaut: 5% de max_rate)
+            banner_grabbing: Récupérer les bannières des ports ouverts
+            banner_timeout: Timeout de lecture des bannières (secondes)
+            banner_concurrency: Nombre de bannières lues simultanément
+            randomize: Scanner les paires (hôte, port) dans un ordre pseudo-aléatoire
+            seed: Graine de l'ordre pseudo-aléatoire (défaut: tirée au hasard)
+            cancel_token: Jeton d'annulation partagé (défaut: jeton propre, voir cancel())
+            on_progress: Callback de progression ({'progress', 'total', 'percentage', 'open_ports'})
+            progress_interval: Période minimale entre deux appels de on_progress (secondes)
+            metrics: Instrumentation du scan (voir metrics.ScanMetrics, None: désactivée)
+            retry_passes: Passes de relance des ports filtrés après la passe principale
+            retry_timeout_factor: Multiplicateur du timeout à chaque passe de relance
+            retry_rate_factor: Multiplicateur de la cadence à chaque passe de relance
+            retry_max_ratio: Part maximale de ports filtrés d'un hôte pour le relancer
+            fd_budget: Budget de sockets en vol (défaut: budget partagé du processus)
+            pool: Moteur persistant (pool.ScanPool) exécutant les sondes à la place
+                  de threads propres au scan
+            priority_ports: Ports placés en tête de `ports` (ouverts connus d'un
+                            scan différentiel), sondés avant l'ordre pseudo-aléatoire
         """
-        self.target = target
+        self.targets = [target] if isinstance(target, str) else list(target)
+        if len(self.targets) == 1:
+            self.target = self.targets[0]
+        else:
+            self.target = f"{len(self.targets)} hôtes"
         self.ports = ports
         self.timeout = timeout
         self.threads = threads
-        self.open_ports = []
-        self.closed_ports = []
-        self.filtered_ports = []
-        self.queue = Queue()
+        self.store = ScanResultStore(self.targets, ports)
+        self.randomize = randomize
+        self.priority_ports = set(priority_ports or ())
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.items = None
+        self.items_lock = threading.Lock()
+        self.cancel_token = cancel_token or CancelToken()
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.progress = None
+        self.metrics = metrics
+        self.retry_passes = retry_passes
+        self.retry_timeout_factor = retry_timeout_factor
+        self.retry_rate_factor = retry_rate_factor
+        self.retry_max_ratio = retry_max_ratio
+        self.retry_items = None
+        self.retried_count = 0
+        self.timeout_scale = 1.0
+        self.fd_budget = fd_budget or default_fd_budget
+        if self.fd_budget.capacity is None:
+            # Limite de descripteurs inconnue (Windows)
+            self.fd_budget = None
         self.lock = threading.Lock()
         self.start_time = None
         self.end_time = None
-        
-    def scan_port(self, port):
+        self.pool = pool
+        self.adaptive_timeout = adaptive_timeout
+        if adaptive_timeout and pool is not None:
+            # Estimations conservées par le pool depuis les scans précédents
+            self.rtt_estimators = {
+                host: pool.rtt_estimator(host, timeout, min_timeout, max_timeout)
+                for host in self.targets
+            }
+        else:
+            self.rtt_estimators = {
+                host: RttEstimator(timeout, min_timeout, max_timeout)
+                for host in self.targets
+            } if adaptive_timeout else {}
+        self.sinks = []
+        self.resumed_count = 0
+        self.rate_limiter = None
+        self.rate_controller = None
+        if max_rate:
+            self.rate_limiter = TokenBucket(max_rate)
+            self.rate_controller = AimdController(
+                self.rate_limiter,
+                min_rate=min(min_rate or max(1.0, max_rate * 0.05), max_rate),
+                max_rate=max_rate
+            )
+        self.banner_grabber = BannerGrabber(
+            self.record_banner, banner_timeout, banner_concurrency,
+            executor=pool.banner_executor if pool is not None else None
+        ) if banner_grabbing else None
+    
+    def get_timeout(self, host):
+        """
+        Timeout de connexion pour une cible (adaptatif ou fixe)
+        """
+        estimator = self.rtt_estimators.get(host)
+        timeout = estimator.timeout() if estimator else self.timeout
+        return timeout * self.timeout_scale
+    
+    def observe_rtt(self, host, rtt):
+        """
+        Enregistre le RTT d'une réponse rapide (acceptation ou RST)
         """
-        Scan un port unique
+        estimator = self.rtt_estimators.get(host)
+        if estimator:
+            estimator.observe(rtt)
+    
+    def scan_port(self, port, host=None):
+        """
+        Scan un port unique (sur la première cible si host n'est pas précisé)
+        
+        Les connexions ouvertes sont confiées à l'étape de récupération des
+        bannières: le worker passe aussitôt au port suivant.
         """
+        host = host or self.targets[0]
+        metrics = self.metrics
+        sock = self.open_socket(host)
+        if sock is None:
+            if not self.cancelled:
+                self.record(host, port, STATE_FILTERED)
+            return
+        
+        connecting = False
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            result = sock.connect_ex((self.target, port))
+            sock.settimeout(self.get_timeout(host))
+            if metrics is not None:
+                metrics.connect_started()
+                connecting = True
+            started = time.monotonic()
+            result = sock.connect_ex((host, port))
             
-            if result == 0:
-                # Port ouvert
-                try:
-                    # Tenter de récupérer la bannière
-                    sock.send(b'Hello\r\n')
-                    banner = sock.recv(1024).decode('utf-8', errors='ignore').strip()
-                except:
-                    banner = ""
-                
-                with self.lock:
-                    self.open_ports.append({
-                        'port': port,
-                        'banner': banner
-                    })
-            else:
-                with self.lock:
-                    self.closed_ports.append(port)
+            if result in (0, errno.ECONNREFUSED):
+                rtt = time.monotonic() - started
+                self.observe_rtt(host, rtt)
+                if connecting:
+                    connecting = False
+                    metrics.connect_finished(result or None, rtt)
+            elif connecting:
+                connecting = False
+                metrics.connect_finished('timeout' if result == errno.EAGAIN else result)
             
-            sock.close()
+            if result == 0 and sock.getsockname() == sock.getpeername():
+                # Auto-connexion TCP sur un port éphémère local: rien n'écoute
+                self.record(host, port, STATE_CLOSED)
+            elif result == 0:
+                if self.banner_grabber:
+                    self.banner_grabber.submit(sock, host, port)
+                    sock = None
+                else:
+                    self.record(host, port, STATE_OPEN)
+            elif result == errno.ECONNREFUSED:
+                self.record(host, port, STATE_CLOSED)
+            else:
+                # Timeout (EAGAIN) ou hôte injoignable: aucune réponse
+                self.record(host, port, STATE_FILTERED)
             
         except socket.timeout:
-            with self.lock:
-                self.filtered_ports.append(port)
+            self.record(host, port, STATE_FILTERED)
         except socket.error:
-            with self.lock:
-                self.filtered_ports.append(port)
+            self.record(host, port, STATE_FILTERED)
         except Exception as e:
-            with self.lock:
-                self.closed_ports.append(port)
+            # Erreur inattendue: aucune réponse exploitable, le port n'est pas
+            # déclaré fermé; l'erreur est comptée par l'instrumentation (--stats-interval)
+            if connecting:
+                connecting = False
+                metrics.connect_finished(type(e).__name__)
+            self.record(host, port, STATE_FILTERED)
+        finally:
+            if connecting:
+                # Exception pendant la connexion
+                metrics.connect_finished('exception')
+            if sock:
+                sock.close()
+                if self.fd_budget:
+                    self.fd_budget.release()
+    
+    def open_socket(self, host):
+        """
+        Socket TCP prise sur le budget de descripteurs
+        
+        Attend une place libre dans le budget; si le système refuse la socket
+        faute de descripteurs (EMFILE/ENFILE), le budget se resserre et la
+        création est retentée dès qu'une socket se libère: l'épuisement
+        ralentit le scan sans produire de faux résultats. Retourne None en
+        cas d'autre erreur (ou d'annulation).
+        """
+        budget = self.fd_budget
+        if budget:
+            budget.acquire()
+        while True:
+            try:
+                return socket.socket(address_family(host), socket.SOCK_STREAM)
+            except OSError as e:
+                if budget and is_exhausted(e) and not self.cancelled:
+                    budget.shrink()
+                    budget.wait_release()
+                    continue
+                if budget:
+                    budget.release()
+                return None
+    
+    def record(self, host, port, state, banner=None):
+        """
+        Enregistre le résultat d'un port (tampon local au thread, sans verrou)
+        """
+        self.store.record(host, port, state, banner)
+        for sink in self.sinks:
+            sink.write(host, port, state, banner)
+        if self.rate_controller:
+            self.rate_controller.observe(state == STATE_FILTERED)
+        if self.metrics is not None:
+            self.metrics.outcome(state)
+        if state == STATE_OPEN and self.progress is not None:
+            self.progress.found(host, port, banner)
+    
+    def cancel(self):
+        """
+        Demande l'arrêt du scan: plus aucune sonde n'est lancée, les sondes en
+        vol se terminent et les résultats partiels restent disponibles
+        """
+        self.cancel_token.cancel()
+    
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+    
+    def create_progress(self, total):
+        """
+        Barre de progression du scan, reliée au callback on_progress
+        """
+        self.progress = ScanProgress(total, self.on_progress, self.progress_interval)
+        return self.progress
+    
+    def record_banner(self, host, port, banner):
+        """
+        Enregistre un port ouvert une fois sa bannière lue (et sa socket fermée)
+        """
+        if self.fd_budget:
+            self.fd_budget.release()
+        self.record(host, port, STATE_OPEN, banner)
+    
+    def wait_banners(self):
+        """
+        Attend la fin de l'étape de récupération des bannières
+        """
+        if self.banner_grabber:
+            self.banner_grabber.wait()
+    
+    def add_sink(self, sink):
+        """
+        Ajoute un sink qui reçoit chaque résultat au fil du scan
+        
+        Un sink expose write(host, port, state, banner), appelé depuis les
+        workers (il doit donc rester non bloquant), et flush(), appelé en fin de scan.
+        """
+        self.sinks.append(sink)
+    
+    def flush_sinks(self):
+        """
+        Vide les sinks de résultats
+        """
+        for sink in self.sinks:
+            sink.flush()
+    
+    def resume_from(self, path):
+        """
+        Recharge les résultats d'un checkpoint: les paires (hôte, port) déjà
+        scannées ne seront pas rescannées
+        
+        Retourne le nombre de paires reprises
+        """
+        ports = set(self.ports)
+        
+        def restore(host, port, state, banner):
+            if host not in self.store.host_index or port not in ports:
+                return
+            table = self.store.table(host)
+            if table.get(port) == STATE_UNKNOWN:
+                self.resumed_count += 1
+            table.set(port, state, banner)
+        
+        load_checkpoint(path, restore)
+        return self.resumed_count
+    
+    def work_items(self):
+        """
+        Génère les paires (hôte, port) à scanner, à la demande
+
+        L'espace des paires est indexé port par port (index = rang du port x
+        nombre d'hôtes + rang de l'hôte). Avec randomize, les index sont parcourus
+        selon une permutation pseudo-aléatoire à mémoire constante, ce qui
+        répartit aussi la charge entre les cibles; sinon dans l'ordre, en
+        entrelaçant les hôtes. Les ports prioritaires en tête de la liste sont
+        toujours sondés en premier: seule la suite est permutée.
+        
+        Les paires reprises d'un checkpoint sont ignorées; la génération
+        s'arrête dès que le scan est annulé. Pendant une passe de relance,
+        seules les paires à relancer sont générées.
+        """
+        if self.retry_items is not None:
+            yield from self.retry_work_items()
+            return
+        tables = [self.store.table(host) for host in self.targets]
+        cancel_token = self.cancel_token
+        host_count = len(self.targets)
+        total = self.total_ports()
+        if self.randomize:
+            lead = self.priority_count() * host_count
+            order = itertools.chain(
+                range(lead),
+                (lead + index for index in FeistelPermutation(total - lead, self.seed))
+            )
+        else:
+            order = range(total)
+        metrics = self.metrics
+        pending = self.remaining_ports()
+        if metrics is not None:
+            metrics.add_pending(pending)
+        try:
+            for index in order:
+                if cancel_token.cancelled:
+                    return
+                port_index, host_index = divmod(index, host_count)
+                port = self.ports[port_index]
+                if self.resumed_count and tables[host_index].get(port) != STATE_UNKNOWN:
+                    continue
+                if metrics is not None:
+                    pending -= 1
+                    metrics.add_pending(-1)
+                yield self.targets[host_index], port
+        finally:
+            if metrics is not None and pending:
+                # Paires jamais sondées (annulation)
+                metrics.add_pending(-pending)
+    
+    def retry_work_items(self):
+        """
+        Paires de la passe de relance en cours
+        """
+        cancel_token = self.cancel_token
+        metrics = self.metrics
+        pending = len(self.retry_items)
+        if metrics is not None:
+            metrics.add_pending(pending)
+        try:
+            for item in self.retry_items:
+                if cancel_token.cancelled:
+                    return
+                if metrics is not None:
+                    pending -= 1
+                    metrics.add_pending(-1)
+                yield item
+        finally:
+            if metrics is not None and pending:
+                metrics.add_pending(-pending)
+    
+    def retry_candidates(self):
+        """
+        Paires filtrées à relancer
+        
+        Un hôte n'est relancé que s'il a répondu pendant la passe principale
+        (port ouvert ou fermé) et que ses ports filtrés ne dépassent pas
+        retry_max_ratio: au-delà, le filtrage vient d'un pare-feu, pas de
+        sondes perdues, et une relance doublerait la durée du scan pour rien.
+        """
+        self.store.merge()
+        limit = self.retry_max_ratio * len(self.ports)
+        pairs = []
+        for host in self.targets:
+            table = self.store.table(host)
+            filtered = table.count(STATE_FILTERED)
+            if not filtered or filtered > limit:
+                continue
+            if not table.count(STATE_OPEN) and not table.count(STATE_CLOSED):
+                continue
+            pairs.extend((host, port) for port in table.ports(STATE_FILTERED))
+        if self.randomize:
+            random.Random(self.seed).shuffle(pairs)
+        return pairs
+    
+    def retry_filtered(self, verbose=True):
+        """
+        Relance les ports filtrés après la passe principale
+        
+        Les sondes perdues ne bloquent pas les workers pendant la passe
+        principale: les paires filtrées sont relancées ensuite, avec un timeout
+        plus long et une cadence réduite (par rapport au débit mesuré de la
+        passe principale si aucune cadence n'est imposée). Le contrôle AIMD est
+        suspendu pendant les relances: il relèverait la cadence réduite.
+        """
+        if not self.retry_passes or self.cancelled:
+            return
+        
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+        rate_limiter = self.rate_limiter
+        base_rate = rate_limiter.rate if rate_limiter else \
+            self.remaining_ports() / elapsed if elapsed > 0 else None
+        rate_controller = self.rate_controller
+        self.rate_controller = None
+        try:
+            for attempt in range(1, self.retry_passes + 1):
+                pairs = self.retry_candidates()
+                if not pairs or self.cancelled:
+                    break
+                
+                self.timeout_scale = self.retry_timeout_factor ** attempt
+                if base_rate:
+                    rate = max(1.0, base_rate * self.retry_rate_factor ** attempt)
+                    if rate_limiter:
+                        rate_limiter.set_rate(rate)
+                    else:
+                        self.rate_limiter = TokenBucket(rate)
+                if verbose:
+                    print(f"\n[*] Relance {attempt}: {len(pairs)} port(s) filtré(s), "
+                          f"timeout x{self.timeout_scale:g}"
+                          + (f", {rate:g} ports/s" if base_rate else ""))
+                if self.metrics is not None:
+                    self.metrics.retry(len(pairs))
+                
+                self.retry_items = pairs
+                self.retried_count += len(pairs)
+                progress_bar = self.create_progress(len(pairs))
+                self.run_pass(progress_bar)
+                progress_bar.close()
+                self.wait_banners()
+        finally:
+            self.retry_items = None
+            self.timeout_scale = 1.0
+            if rate_limiter:
+                rate_limiter.set_rate(base_rate)
+            self.rate_limiter = rate_limiter
+            self.rate_controller = rate_controller
+    
+    def next_item(self):
+        """
+        Prochaine paire (hôte, port) à scanner (None en fin de scan)
+        """
+        with self.items_lock:
+            return next(self.items, None)
     
     def worker(self, progress_bar):
         """
-        Fonction worker pour les threads
+        Fonction worker pour les threads: tire les paires une à une
         """
         while True:
-            port = self.queue.get()
-            if port is None:
+            item = self.next_item()
+            if item is None:
                 break
             
-            self.scan_port(port)
+            host, port = item
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            self.scan_port(port, host)
             progress_bar.update(1)
-            self.queue.task_done()
     
-    def scan(self, verbose=True):
+    def run_pass(self, progress_bar):
         """
-        Lance le scan de tous les ports
+        Fait tirer les paires à la demande par le pool de threads (celui du
+        moteur persistant s'il y en a un)
         """
-        self.start_time = datetime.now()
+        if self.pool is not None:
+            self.pool.run(self, progress_bar)
+            return
         
-        if verbose:
-            print(f"\n[*] Démarrage du scan sur {self.target}")
-            print(f"[*] Nombre de ports à scanner: {len(self.ports)}")
-            print(f"[*] Threads: {self.threads}")
-            print(f"[*] Timeout: {self.timeout}s\n")
-        
-        # Ajouter tous les ports à la queue
-        for port in self.ports:
-            self.queue.put(port)
-        
-        # Créer la barre de progression
-        progress_bar = tqdm(total=len(self.ports), desc="Scan en cours", unit="port")
+        self.items = iter(self.work_items())
         
         # Créer et démarrer les threads
         threads_list = []
-        for _ in range(min(self.threads, len(self.ports))):
+        for _ in range(min(self.threads, progress_bar.total)):
             thread = threading.Thread(target=self.worker, args=(progress_bar,))
             thread.daemon = True
             thread.start()
             threads_list.append(thread)
         
-        # Attendre que tous les ports soient scannés
-        self.queue.join()
-        
-        # Arrêter les threads
-        for _ in range(len(threads_list)):
-            self.queue.put(None)
-        
+        # Attendre que toutes les paires soient scannées
         for thread in threads_list:
             thread.join()
+    
+    def scan(self, verbose=True):
+        """
+        Lance le scan de tous les ports
+        """
+        self.start_time = datetime.now()
+        
+        total = self.remaining_ports()
+        
+        if verbose:
+            print(f"\n[*] Démarrage du scan sur {self.target}")
+            print(f"[*] Nombre de ports à scanner: {total}")
+            if self.resumed_count:
+                print(f"[*] Repris d'un checkpoint: {self.resumed_count}")
+            print(f"[*] Threads: {self.threads}")
+            if self.rate_limiter:
+                print(f"[*] Cadence maximale: {self.rate_limiter.rate:g} ports/s")
+            print(f"[*] Timeout: {self.timeout}s\n")
+        
+        # Créer la barre de progression
+        progress_bar = self.create_progress(total)
+        
+        self.run_pass(progress_bar)
         
         progress_bar.close()
         
+        self.wait_banners()
+        self.retry_filtered(verbose)
         self.end_time = datetime.now()
         
-        # Trier les ports ouverts
-        self.open_ports.sort(key=lambda x: x['port'])
+        # Fusionner les tampons des workers
+        self.store.merge()
+        self.flush_sinks()
         
         return self.get_results()
     
+    def priority_count(self):
+        """
+        Nombre de ports prioritaires en tête de la liste des ports
+        """
+        count = 0
+        for port in self.ports:
+            if port not in self.priority_ports:
+                break
+            count += 1
+        return count
+    
+    def total_ports(self):
+        """
+        Nombre total de paires (hôte, port) à scanner
+        """
+        return len(self.ports) * len(self.targets)
+    
+    def remaining_ports(self):
+        """
+        Nombre de paires restant à scanner (hors reprise de checkpoint)
+        """
+        return self.total_ports() - self.resumed_count
+    
+    def get_ports_by_state(self, state, host=None):
+        """
+        Ports dans un état donné ('open', 'closed', 'filtered')
+        
+        Retourne la liste triée des ports d'un hôte si host est précisé,
+        sinon la liste des paires (hôte, port) de toutes les cibles
+        """
+        self.store.merge()
+        return self.store.ports_by_state(state, host)
+    
+    def fingerprint_ports(self, open_ports):
+        """
+        Ajoute à chaque port ouvert l'empreinte de service tirée de sa bannière
+        """
+        for port_data in open_ports:
+            port_data['fingerprint'] = match_banner(port_data['banner'])
+        return open_ports
+    
     def get_results(self):
         """
         Retourne les résultats du scan
+        
+        Les compteurs globaux cumulent toutes les cibles; le détail par hôte
+        (même structure) est disponible sous la clé 'hosts'.
         """
         duration = (self.end_time - self.start_time).total_seconds()
         
+        self.store.merge()
+        
+        hosts = {}
+        for host in self.targets:
+            table = self.store.table(host)
+            hosts[host] = {
+                'target': host,
+                'start_time': self.start_time,
+                'end_time': self.end_time,
+                'duration': duration,
+                'total_ports': len(self.ports),
+                'open_ports': self.fingerprint_ports(self.store.open_ports(host)),
+                'closed_ports': table.count(STATE_CLOSED),
+                'filtered_ports': table.count(STATE_FILTERED),
+                'scan_speed': len(self.ports) / duration if duration > 0 else 0
+            }
+        
+        total = self.total_ports()
+        
         return {
             'target': self.target,
+            'targets': self.targets,
+            'protocol': self.protocol,
             'start_time': self.start_time,
             'end_time': self.end_time,
             'duration': duration,
-            'total_ports': len(self.ports),
-            'open_ports': self.open_ports,
-            'closed_ports': len(self.closed_ports),
-            'filtered_ports': len(self.filtered_ports),
-            'scan_speed': len(self.ports) / duration if duration > 0 else 0
+            'total_ports': total,
+            'open_ports': [port_data for host in self.targets
+                           for port_data in hosts[host]['open_ports']],
+            'closed_ports': sum(h['closed_ports'] for h in hosts.values()),
+            'filtered_ports': sum(h['filtered_ports'] for h in hosts.values()),
+            'scan_speed': total / duration if duration > 0 else 0,
+            'cancelled': self.cancelled,
+            'retried_ports': self.retried_count,
+            'hosts': hosts
         }
     
     def quick_scan(self, common_ports_only=True):
@@ -155,5 +647,6 @@ class PortScanner:
         
         if common_ports_only:
             self.ports = get_common_ports_list()
+            self.store = ScanResultStore(self.targets, self.ports)
         
         return self.scan()
\ No newline at end of file
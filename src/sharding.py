@@ -0,0 +1,219 @@
+"""
+Scan réparti sur plusieurs processus
+
+L'espace (hôte, port) est découpé en tranches, chacune scannée par un
+processus avec son propre moteur. Les résultats remontent par lots dans une
+queue multiprocessing et sont enregistrés par le processus principal, qui
+produit un get_results() et des sinks (flux, checkpoint) identiques à ceux
+d'un scan en un seul processus.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+from datetime import datetime
+from scanner import PortScanner, LOCAL_OPTIONS
+from sinks import BatchedSink
+from results import STATE_FILTERED
+
+class QueueSink(BatchedSink):
+    """
+    Sink d'un processus de scan: transmet les résultats par lots au parent
+
+    Avec hold_filtered, les ports filtrés sont retenus jusqu'à la fin des
+    passes de relance (release_filtered): le parent ne reçoit que l'état final
+    de chaque paire, une seule fois, et sa progression ne dépasse pas le total.
+    """
+
+    def __init__(self, result_queue, interval=0.2, batch_size=1024, hold_filtered=False):
+        super().__init__(interval=interval, batch_size=batch_size)
+        self.result_queue = result_queue
+        self.hold_filtered = hold_filtered
+        self.start()
+
+    def write(self, host, port, state, banner=None):
+        if self.hold_filtered and state == STATE_FILTERED:
+            return
+        super().write(host, port, state, banner)
+
+    def release_filtered(self, scanner):
+        """
+        Transmet les paires restées filtrées après les relances de `scanner`
+        """
+        scanner.store.merge()
+        for host in scanner.targets:
+            for port in scanner.store.table(host).ports(STATE_FILTERED):
+                super().write(host, port, STATE_FILTERED)
+
+    def write_batch(self, batch):
+        if batch:
+            self.result_queue.put(('batch', batch))
+
+def shard_work(targets, ports, workers):
+    """
+    Découpe le travail en tranches (cibles, ports)
+
+    Les ports sont répartis en entrelacs (chaque tranche couvre toute la
+    plage); s'il y a moins de ports que de processus, ce sont les cibles
+    qui sont réparties.
+    """
+    if len(ports) >= workers or len(targets) < 2:
+        shards = [(targets, ports[index::workers]) for index in range(workers)]
+    else:
+        shards = [(targets[index::workers], ports) for index in range(workers)]
+    return [(shard_targets, shard_ports) for shard_targets, shard_ports in shards
+            if shard_targets and shard_ports]
+
+def run_shard(index, engine, targets, ports, settings, options, result_queue, resume_path):
+    """
+    Point d'entrée d'un processus de scan
+    """
+    from engines import create_scanner
+
+    # Le parent gère Ctrl+C et arrête les processus; pas de barre de progression ici
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.stderr = open(os.devnull, 'w')
+
+    try:
+        scanner = create_scanner(engine, target=targets, ports=ports, **settings, **options)
+        if resume_path:
+            scanner.resume_from(resume_path)
+        sink = QueueSink(result_queue, hold_filtered=bool(scanner.retry_passes))
+        scanner.add_sink(sink)
+        scanner.scan(verbose=False)
+        if sink.hold_filtered:
+            sink.release_filtered(scanner)
+        sink.close()
+        result_queue.put(('done', index, scanner.engine, scanner.retried_count))
+    except Exception as e:
+        result_queue.put(('error', index, f"{type(e).__name__}: {e}"))
+
+class ShardedScanner(PortScanner):
+    """
+    Scanner qui répartit le travail sur plusieurs processus
+    """
+
+    def __init__(self, target, ports, timeout=1, workers=2, engine='thread', threads=100,
+                 concurrency=None, rate=None, retries=None, **kwargs):
+        """
+        Args:
+            target: Adresse IP ou nom d'hôte cible, ou liste de cibles
+            ports: Liste des ports à scanner
+            timeout: Timeout pour chaque connexion (secondes)
+            workers: Nombre de processus
+            engine: Moteur utilisé par chaque processus
+            threads, concurrency: Parallélisme de chaque processus
+            rate: Paquets par seconde (moteurs syn/udp), répartis entre les processus
+            retries: Retransmissions (moteur udp)
+            kwargs: Options communes des scanners (max_rate est réparti)
+        """
+        super().__init__(target, ports, timeout=timeout, threads=threads, **kwargs)
+        self.workers = max(1, workers)
+        self.engine = engine
+        self.protocol = 'udp' if engine == 'udp' else 'tcp'
+        self.concurrency = concurrency
+        self.resume_path = None
+
+        # Cadences réparties entre les processus
+        options = {key: value for key, value in kwargs.items() if key not in LOCAL_OPTIONS}
+        for key in ('max_rate', 'min_rate'):
+            if options.get(key):
+                options[key] = options[key] / self.workers
+        self.child_options = options
+        self.child_settings = {
+            'timeout': timeout,
+            'threads': threads,
+            'concurrency': concurrency,
+            'rate': rate / self.workers if rate else rate,
+            'retries': retries
+        }
+
+        # Le parent ne fait qu'enregistrer: ni cadence ni bannières ici
+        self.rate_limiter = None
+        self.rate_controller = None
+        self.banner_grabber = None
+
+    def resume_from(self, path):
+        self.resume_path = path
+        return super().resume_from(path)
+
+    def _collect(self, result_queue, processes, progress_bar):
+        """
+        Enregistre les lots reçus jusqu'à la fin de tous les processus
+        """
+        pending = set(processes)
+        engines = set()
+
+        while pending and not self.cancelled:
+            try:
+                message = result_queue.get(timeout=0.5)
+            except queue.Empty:
+                for index in list(pending):
+                    if not processes[index].is_alive() and processes[index].exitcode != 0:
+                        raise RuntimeError(f"Le processus de scan {index} s'est arrêté "
+                                           f"(code {processes[index].exitcode})")
+                continue
+
+            kind = message[0]
+            if kind == 'batch':
+                for host, port, state, banner in message[1]:
+                    self.record(host, port, state, banner)
+                progress_bar.update(len(message[1]))
+            elif kind == 'done':
+                pending.discard(message[1])
+                engines.add(message[2])
+                # Paires relancées par le processus (passes de relance des filtrés)
+                self.retried_count += message[3]
+                if self.metrics is not None and message[3]:
+                    self.metrics.retry(message[3])
+            elif kind == 'error':
+                raise RuntimeError(f"Processus de scan {message[1]}: {message[2]}")
+
+        if len(engines) == 1 and not pending:
+            # Moteur effectivement utilisé (repli éventuel de syn vers thread)
+            self.engine = engines.pop()
+
+    def scan(self, verbose=True):
+        """
+        Lance le scan réparti et fusionne les résultats
+        """
+        self.start_time = datetime.now()
+        total = self.remaining_ports()
+        shards = shard_work(self.targets, self.ports, self.workers)
+
+        if verbose:
+            print(f"\n[*] Démarrage du scan réparti sur {self.target}")
+            print(f"[*] Nombre de ports à scanner: {total}")
+            print(f"[*] Processus: {len(shards)} (moteur {self.engine})")
+            print(f"[*] Timeout: {self.timeout}s\n")
+
+        context = multiprocessing.get_context('spawn')
+        result_queue = context.Queue()
+        processes = {}
+        for index, (targets, ports) in enumerate(shards):
+            process = context.Process(
+                target=run_shard,
+                args=(index, self.engine, targets, ports, self.child_settings,
+                      self.child_options, result_queue, self.resume_path),
+                daemon=True
+            )
+            process.start()
+            processes[index] = process
+
+        progress_bar = self.create_progress(total)
+        try:
+            self._collect(result_queue, processes, progress_bar)
+        finally:
+            for process in processes.values():
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            progress_bar.close()
+
+        self.end_time = datetime.now()
+
+        self.store.merge()
+        self.flush_sinks()
+
+        return self.get_results()
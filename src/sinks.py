@@ -0,0 +1,87 @@
+"""
+Sinks de résultats écrits par lots en arrière-plan
+"""
+import threading
+from collections import deque
+
+class BatchedSink:
+    """
+    Base des sinks de résultats: write() n'ajoute qu'à une deque (sans verrou
+    ni E/S), un thread d'arrière-plan transmet les lots à write_batch() toutes
+    les `interval` secondes ou dès que `batch_size` résultats sont en attente.
+    """
+
+    def __init__(self, interval=1.0, batch_size=1024):
+        """
+        Args:
+            interval: Période maximale entre deux écritures (secondes)
+            batch_size: Nombre de résultats en attente déclenchant une écriture
+        """
+        self.interval = interval
+        self.batch_size = batch_size
+        self.pending = deque()
+        self.write_lock = threading.Lock()
+        self.wake_event = threading.Event()
+        self.closed = False
+        self.thread = None
+
+    def start(self):
+        """
+        Démarre le thread d'écriture (à appeler par les sous-classes une fois prêtes)
+        """
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def write(self, host, port, state, banner=None):
+        """
+        Ajoute un résultat au prochain lot (appelé depuis les workers)
+        """
+        self.pending.append((host, port, state, banner))
+        if len(self.pending) >= self.batch_size:
+            self.wake_event.set()
+
+    def _run(self):
+        while not self.closed:
+            self.wake_event.wait(self.interval)
+            self.wake_event.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Transmet les résultats en attente à write_batch()
+        """
+        with self.write_lock:
+            if self.closed:
+                return
+            batch = []
+            while True:
+                try:
+                    batch.append(self.pending.popleft())
+                except IndexError:
+                    break
+            self.write_batch(batch)
+
+    def write_batch(self, batch):
+        """
+        Écrit un lot de résultats (hôte, port, état, bannière); peut être vide
+        """
+        raise NotImplementedError
+
+    def close_output(self):
+        """
+        Libère la sortie du sink (fichier, ...)
+        """
+
+    def close(self):
+        """
+        Arrête le thread d'écriture, vide les derniers résultats et ferme la sortie
+        """
+        if self.closed:
+            return
+        self.flush()
+        with self.write_lock:
+            self.closed = True
+            self.close_output()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join()
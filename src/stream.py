@@ -0,0 +1,92 @@
+"""
+Sortie des résultats en flux NDJSON (un objet JSON par ligne)
+"""
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+from port_db import get_port_info
+from fingerprint import match_banner
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from sinks import BatchedSink
+
+class NdjsonSink(BatchedSink):
+    """
+    Écrit un enregistrement par port ouvert dès sa découverte, et
+    optionnellement un résumé par hôte des ports fermés/filtrés à chaque lot
+
+    Enregistrements:
+        {"type": "port", "host": ..., "port": 22, "state": "open", "service": ..., "banner": ..., "fingerprint": ..., "time": ...}
+        {"type": "summary", "host": ..., "closed": 1000, "filtered": 3, "time": ...}
+    """
+
+    def __init__(self, output, include_summaries=False, interval=1.0, batch_size=256):
+        """
+        Args:
+            output: Chemin du fichier, '-' pour la sortie standard, ou objet fichier
+            include_summaries: Émettre les résumés fermés/filtrés par lot
+            interval: Période maximale entre deux écritures (secondes)
+            batch_size: Nombre de résultats en attente déclenchant une écriture
+        """
+        super().__init__(interval=interval, batch_size=batch_size)
+        self.include_summaries = include_summaries
+        self.owns_file = False
+
+        if output == '-':
+            self.file = sys.stdout
+        elif isinstance(output, str):
+            directory = os.path.dirname(output)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(output, 'w', encoding='utf-8')
+            self.owns_file = True
+        else:
+            self.file = output
+
+        self.start()
+
+    def write_batch(self, batch):
+        """
+        Sérialise un lot en lignes JSON
+        """
+        timestamp = datetime.now().isoformat()
+        lines = []
+        closed = Counter()
+        filtered = Counter()
+
+        for host, port, state, banner in batch:
+            if state == STATE_OPEN:
+                fingerprint = match_banner(banner)
+                lines.append(json.dumps({
+                    'type': 'port',
+                    'host': host,
+                    'port': port,
+                    'state': 'open',
+                    'service': get_port_info(port, fingerprint)['service'],
+                    'banner': banner or '',
+                    'fingerprint': fingerprint,
+                    'time': timestamp
+                }, ensure_ascii=False))
+            elif state == STATE_CLOSED:
+                closed[host] += 1
+            elif state == STATE_FILTERED:
+                filtered[host] += 1
+
+        if self.include_summaries:
+            for host in list(closed) + [h for h in filtered if h not in closed]:
+                lines.append(json.dumps({
+                    'type': 'summary',
+                    'host': host,
+                    'closed': closed[host],
+                    'filtered': filtered[host],
+                    'time': timestamp
+                }, ensure_ascii=False))
+
+        if lines:
+            self.file.write('\n'.join(lines) + '\n')
+            self.file.flush()
+
+    def close_output(self):
+        if self.owns_file:
+            self.file.close()
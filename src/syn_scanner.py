@@ -0,0 +1,260 @@
+"""
+Scan SYN (semi-ouvert) sur socket brute
+
+Les paquets SYN sont forgés et envoyés à cadence contrôlée sur une socket
+brute; une boucle de réception unique associe les réponses SYN-ACK (ouvert)
+et RST (fermé) aux ports sondés. Sans réponse après le timeout, le port est
+considéré filtré. Aucune connexion TCP complète n'est établie: le noyau
+répond lui-même RST aux SYN-ACK reçus.
+
+Nécessite CAP_NET_RAW (root, ou un espace de noms réseau: `unshare -rn`).
+IPv4 uniquement.
+"""
+import ipaddress
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from scanner import PortScanner
+from rate_limiter import TokenBucket
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+
+TCP_SYN = 0x02
+TCP_RST = 0x04
+TCP_ACK = 0x10
+
+def has_raw_socket_capability():
+    """
+    Indique si le processus peut ouvrir une socket brute TCP (CAP_NET_RAW)
+    """
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+    except (PermissionError, OSError, AttributeError):
+        return False
+    sock.close()
+    return True
+
+def is_ipv4(host):
+    """
+    Indique si host est une adresse IPv4 littérale
+    """
+    try:
+        return ipaddress.ip_address(host).version == 4
+    except ValueError:
+        return False
+
+def checksum(data):
+    """
+    Somme de contrôle Internet (RFC 1071)
+    """
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+def build_syn_packet(src_ip, dst_ip, src_port, dst_port, seq):
+    """
+    Construit un segment TCP SYN (avec option MSS) et calcule sa somme de contrôle
+    """
+    offset_flags = (6 << 12) | TCP_SYN  # En-tête de 24 octets
+    options = struct.pack('!BBH', 2, 4, 1460)  # MSS
+    header = struct.pack('!HHIIHHHH', src_port, dst_port, seq, 0,
+                         offset_flags, 64240, 0, 0) + options
+    pseudo_header = struct.pack('!4s4sBBH',
+                                socket.inet_aton(src_ip), socket.inet_aton(dst_ip),
+                                0, socket.IPPROTO_TCP, len(header))
+    tcp_checksum = checksum(pseudo_header + header)
+    return header[:16] + struct.pack('!H', tcp_checksum) + header[18:]
+
+def parse_tcp_reply(packet):
+    """
+    Décode un paquet IPv4/TCP reçu sur la socket brute
+
+    Retourne (ip_source, port_source, port_destination, ack, flags) ou None
+    """
+    if len(packet) < 20:
+        return None
+    version_ihl = packet[0]
+    if version_ihl >> 4 != 4 or packet[9] != socket.IPPROTO_TCP:
+        return None
+    ihl = (version_ihl & 0x0f) * 4
+    if len(packet) < ihl + 20:
+        return None
+    src_ip = socket.inet_ntoa(packet[12:16])
+    src_port, dst_port, _, ack, offset_flags = struct.unpack(
+        '!HHIIH', packet[ihl:ihl + 14])
+    return src_ip, src_port, dst_port, ack, offset_flags & 0x3f
+
+def get_source_address(dst_ip):
+    """
+    Détermine l'adresse source utilisée par le noyau pour joindre dst_ip
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect((dst_ip, 9))
+        return sock.getsockname()[0]
+    finally:
+        sock.close()
+
+class SynScanner(PortScanner):
+    engine = 'syn'
+
+    def __init__(self, target, ports, timeout=1, rate=1000, **kwargs):
+        """
+        Initialise le scanner SYN
+
+        Args:
+            target: Adresse IPv4 cible, ou liste d'adresses IPv4
+            ports: Liste des ports à scanner
+            timeout: Délai d'attente des réponses après le dernier envoi (secondes)
+            rate: Nombre maximum de paquets SYN envoyés par seconde (0: sans limite)
+        """
+        super().__init__(target, ports, timeout=timeout, **kwargs)
+        self.rate = rate
+        if self.rate_limiter is None and rate:
+            self.rate_limiter = TokenBucket(rate)
+        # Les ports filtrés ne sont connus qu'après le dernier envoi: pas d'AIMD
+        self.rate_controller = None
+        self.secret = os.urandom(8)
+        self.answered = {}
+        self.source_addresses = {}
+
+    def cookie(self, host, port):
+        """
+        Numéro de séquence dérivé de (hôte, port) pour authentifier les réponses
+        """
+        return zlib.crc32(self.secret + socket.inet_aton(host) + struct.pack('!H', port))
+
+    def receive_loop(self, sock, src_port, stop_event, progress_bar):
+        """
+        Boucle de réception unique: classe les réponses SYN-ACK et RST
+        """
+        sock.settimeout(0.1)
+        targets = set(self.targets)
+
+        while not stop_event.is_set():
+            try:
+                packet = sock.recv(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            reply = parse_tcp_reply(packet)
+            if reply is None:
+                continue
+            host, port, dst_port, ack, flags = reply
+            if dst_port != src_port or host not in targets:
+                continue
+            if ack != (self.cookie(host, port) + 1) & 0xffffffff:
+                continue
+
+            with self.lock:
+                if (host, port) in self.answered:
+                    continue
+                if flags & TCP_SYN and flags & TCP_ACK:
+                    state = STATE_OPEN
+                elif flags & TCP_RST:
+                    state = STATE_CLOSED
+                else:
+                    continue
+                self.answered[(host, port)] = state
+            self.record(host, port, state)
+            progress_bar.update(1)
+
+    def send_probes(self, sock, src_port):
+        """
+        Envoie un SYN par paire (hôte, port) en respectant la cadence demandée
+        """
+        for host, port in self.work_items():
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            src_ip = self.source_addresses[host]
+            packet = build_syn_packet(src_ip, host, src_port, port, self.cookie(host, port))
+            try:
+                sock.sendto(packet, (host, 0))
+            except OSError:
+                # Tampon d'envoi saturé: laisser le noyau se vider puis réessayer
+                time.sleep(0.01)
+                try:
+                    sock.sendto(packet, (host, 0))
+                except OSError:
+                    pass
+
+    def run_pass(self, progress_bar):
+        """
+        Envoie les SYN des paires de work_items() et collecte les réponses
+        """
+        expected = len(self.answered) + progress_bar.total
+
+        # Réserver le port source: le noyau répondra RST aux SYN-ACK reçus
+        reserved = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        reserved.bind(('0.0.0.0', 0))
+        src_port = reserved.getsockname()[1]
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        stop_event = threading.Event()
+        receiver = threading.Thread(target=self.receive_loop,
+                                    args=(sock, src_port, stop_event, progress_bar))
+        receiver.daemon = True
+        receiver.start()
+
+        try:
+            self.send_probes(sock, src_port)
+
+            # Attendre les dernières réponses
+            deadline = time.monotonic() + self.timeout * self.timeout_scale
+            while time.monotonic() < deadline and len(self.answered) < expected:
+                time.sleep(0.01)
+        finally:
+            stop_event.set()
+            receiver.join()
+            sock.close()
+            reserved.close()
+
+        # Sans réponse: filtré
+        for item in self.work_items():
+            if item not in self.answered:
+                host, port = item
+                self.record(host, port, STATE_FILTERED)
+                progress_bar.update(1)
+
+    def scan(self, verbose=True):
+        """
+        Lance le scan SYN de tous les ports
+        """
+        self.start_time = datetime.now()
+        total = self.remaining_ports()
+
+        if verbose:
+            print(f"\n[*] Démarrage du scan SYN sur {self.target}")
+            print(f"[*] Nombre de ports à scanner: {total}")
+            if self.rate_limiter:
+                print(f"[*] Cadence: {self.rate_limiter.rate:g} paquets/s")
+            print(f"[*] Timeout: {self.timeout}s\n")
+
+        for host in self.targets:
+            if not is_ipv4(host):
+                raise ValueError(f"Le scan SYN nécessite des adresses IPv4: {host}")
+            self.source_addresses[host] = get_source_address(host)
+
+        progress_bar = self.create_progress(total)
+
+        self.run_pass(progress_bar)
+
+        progress_bar.close()
+
+        self.retry_filtered(verbose)
+        self.end_time = datetime.now()
+
+        self.store.merge()
+        self.flush_sinks()
+
+        return self.get_results()
@@ -0,0 +1,303 @@
+"""
+Moteur de scan UDP
+
+Une seule socket (par famille d'adresses) envoie toutes les sondes et reçoit
+toutes les réponses. Sous Linux, IP_RECVERR place les erreurs ICMP dans la
+file d'erreurs de la socket, avec l'adresse de destination de la sonde:
+un « port injoignable » identifie un port fermé.
+
+    réponse UDP              -> ouvert
+    ICMP port injoignable    -> fermé
+    autre ICMP injoignable   -> filtré
+    aucune réponse           -> ouvert|filtré (enregistré comme filtré)
+"""
+import errno
+import heapq
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from scanner import PortScanner
+from rate_limiter import TokenBucket
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from resolver import address_family
+
+# Constantes Linux absentes du module socket
+IP_RECVERR = 11
+IPV6_RECVERR = 25
+SO_EE_ORIGIN_ICMP = 2
+SO_EE_ORIGIN_ICMP6 = 3
+ICMP_DEST_UNREACH = 3
+ICMP_PORT_UNREACH = 3
+ICMP6_DST_UNREACH = 1
+ICMP6_PORT_UNREACH = 4
+EXTENDED_ERROR = struct.Struct('=IBBBBII')
+
+MAX_BANNER = 1024
+
+# Sondes spécifiques par port (datagramme vide par défaut)
+UDP_PAYLOADS = {
+    # DNS: requête NS sur la racine
+    53: b'\x12\x34\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01',
+    # TFTP: lecture d'un fichier (réponse d'erreur attendue)
+    69: b'\x00\x01scan\x00octet\x00',
+    # NTP: requête client (mode 3, version 3)
+    123: b'\x1b' + b'\x00' * 47,
+    # NetBIOS: requête de statut de nœud
+    137: (b'\x80\xf0\x00\x10\x00\x01\x00\x00\x00\x00\x00\x00'
+          b'\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00\x00\x21\x00\x01'),
+    # SNMP v1: GetRequest sysDescr.0, communauté "public"
+    161: bytes.fromhex('302902010004067075626c6963a01c020400005678020100020100'
+                       '300e300c06082b060102010101000500'),
+    # MS SQL Browser: énumération des instances
+    1434: b'\x02',
+    # SSDP: découverte UPnP
+    1900: (b'M-SEARCH * HTTP/1.1\r\nHOST: 239.255.255.250:1900\r\n'
+           b'MAN: "ssdp:discover"\r\nMX: 1\r\nST: ssdp:all\r\n\r\n'),
+    # mDNS: énumération des services
+    5353: (b'\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00'
+           b'\x09_services\x07_dns-sd\x04_udp\x05local\x00\x00\x0c\x00\x01')
+}
+
+def get_udp_payload(port):
+    """
+    Datagramme de sonde adapté au port
+    """
+    return UDP_PAYLOADS.get(port, b'')
+
+def format_udp_banner(data):
+    """
+    Partie lisible d'une réponse UDP
+    """
+    text = data[:MAX_BANNER].decode('utf-8', errors='ignore')
+    return ''.join(char if char.isprintable() else ' ' for char in text).strip()
+
+class UdpScanner(PortScanner):
+    engine = 'udp'
+    protocol = 'udp'
+
+    def __init__(self, target, ports, timeout=1, rate=200, retries=2, backoff=2.0, **kwargs):
+        """
+        Initialise le scanner UDP
+
+        Args:
+            target: Adresse IP ou nom d'hôte cible, ou liste de cibles
+            ports: Liste des ports à scanner
+            timeout: Délai d'attente d'une réponse avant retransmission (secondes)
+            rate: Nombre maximum de datagrammes par seconde (0: sans limite);
+                  les réponses ICMP sont elles-mêmes limitées par les hôtes
+            retries: Nombre de retransmissions sans réponse
+            backoff: Facteur d'allongement du délai à chaque retransmission
+        """
+        kwargs['banner_grabbing'] = False
+        super().__init__(target, ports, timeout=timeout, **kwargs)
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        if self.rate_limiter is None and rate:
+            self.rate_limiter = TokenBucket(rate)
+        self.answered = {}
+        self.sockets = {}
+
+    def open_sockets(self):
+        """
+        Crée une socket par famille d'adresses présente dans les cibles
+        """
+        for host in self.targets:
+            family = address_family(host)
+            if family in self.sockets:
+                continue
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+            if sys.platform.startswith('linux'):
+                if family == socket.AF_INET6:
+                    sock.setsockopt(socket.IPPROTO_IPV6, IPV6_RECVERR, 1)
+                else:
+                    sock.setsockopt(socket.IPPROTO_IP, IP_RECVERR, 1)
+            sock.setblocking(False)
+            self.sockets[family] = sock
+
+    def answer(self, host, port, state, banner=None):
+        """
+        Enregistre la première réponse reçue pour une paire (hôte, port)
+        """
+        with self.lock:
+            if (host, port) in self.answered or host not in self.store.host_index:
+                return False
+            self.answered[(host, port)] = state
+        self.record(host, port, state, banner)
+        return True
+
+    def read_errors(self, sock):
+        """
+        Vide la file d'erreurs ICMP de la socket
+        """
+        while True:
+            try:
+                _, ancdata, _, address = sock.recvmsg(512, 512, socket.MSG_ERRQUEUE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+
+            for _, _, data in ancdata:
+                if len(data) < EXTENDED_ERROR.size:
+                    continue
+                _, origin, icmp_type, icmp_code, _, _, _ = EXTENDED_ERROR.unpack_from(data)
+                if origin == SO_EE_ORIGIN_ICMP and icmp_type == ICMP_DEST_UNREACH:
+                    closed = icmp_code == ICMP_PORT_UNREACH
+                elif origin == SO_EE_ORIGIN_ICMP6 and icmp_type == ICMP6_DST_UNREACH:
+                    closed = icmp_code == ICMP6_PORT_UNREACH
+                else:
+                    continue
+                self.answer(address[0], address[1], STATE_CLOSED if closed else STATE_FILTERED)
+
+    def read_replies(self, sock):
+        """
+        Lit les datagrammes reçus en attente
+        """
+        while True:
+            try:
+                data, address = sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # Erreur ICMP signalée sur l'appel: détails dans la file d'erreurs
+                if e.errno in (errno.ECONNREFUSED, errno.EHOSTUNREACH, errno.ENETUNREACH):
+                    self.read_errors(sock)
+                    continue
+                return
+            self.answer(address[0].split('%', 1)[0], address[1], STATE_OPEN,
+                        format_udp_banner(data))
+
+    def receive_loop(self, stop_event, progress_bar):
+        """
+        Boucle de réception unique: réponses UDP et erreurs ICMP
+        """
+        sockets = list(self.sockets.values())
+        while not stop_event.is_set():
+            try:
+                readable, _, errored = select.select(sockets, [], sockets, 0.1)
+            except (OSError, ValueError):
+                break
+            before = len(self.answered)
+            for sock in set(readable) | set(errored):
+                self.read_errors(sock)
+                self.read_replies(sock)
+            progress_bar.update(len(self.answered) - before)
+
+    def send_probe(self, host, port):
+        """
+        Envoie une sonde (l'erreur d'une sonde précédente peut être remontée ici)
+        """
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        sock = self.sockets[address_family(host)]
+        payload = get_udp_payload(port)
+        for _ in range(3):
+            try:
+                sock.sendto(payload, (host, port))
+                return
+            except (BlockingIOError, InterruptedError):
+                time.sleep(0.01)
+            except OSError as e:
+                if e.errno not in (errno.ECONNREFUSED, errno.EHOSTUNREACH, errno.ENETUNREACH):
+                    return
+
+    def send_probes(self):
+        """
+        Envoie les sondes puis les retransmet, avec un délai croissant, tant
+        qu'aucune réponse n'est arrivée
+
+        Retourne les paires restées sans réponse après toutes les retransmissions
+        """
+        items = iter(self.work_items())
+        exhausted = False
+        deadlines = []
+        expired = []
+
+        while (not exhausted or deadlines) and not self.cancelled:
+            now = time.monotonic()
+
+            # Retransmissions échues en priorité
+            if deadlines and deadlines[0][0] <= now:
+                _, attempt, host, port = heapq.heappop(deadlines)
+                if (host, port) in self.answered:
+                    continue
+                if attempt >= self.retries:
+                    expired.append((host, port))
+                    continue
+                if self.rate_controller:
+                    # Sonde perdue: signal de congestion pour le contrôle AIMD
+                    self.rate_controller.observe(True)
+                if self.metrics is not None:
+                    self.metrics.retry()
+                self.send_probe(host, port)
+                delay = self.timeout * self.backoff ** (attempt + 1)
+                heapq.heappush(deadlines, (time.monotonic() + delay, attempt + 1, host, port))
+                continue
+
+            if not exhausted:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                    continue
+                host, port = item
+                self.send_probe(host, port)
+                heapq.heappush(deadlines, (time.monotonic() + self.timeout, 0, host, port))
+                continue
+
+            time.sleep(min(0.05, max(0.0, deadlines[0][0] - now)))
+
+        return expired
+
+    def scan(self, verbose=True):
+        """
+        Lance le scan UDP de tous les ports
+        """
+        self.start_time = datetime.now()
+        total = self.remaining_ports()
+
+        if verbose:
+            print(f"\n[*] Démarrage du scan UDP sur {self.target}")
+            print(f"[*] Nombre de ports à scanner: {total}")
+            if self.rate_limiter:
+                print(f"[*] Cadence: {self.rate_limiter.rate:g} datagrammes/s")
+            print(f"[*] Timeout: {self.timeout}s, {self.retries} retransmission(s)\n")
+
+        self.open_sockets()
+        progress_bar = self.create_progress(total)
+        stop_event = threading.Event()
+        receiver = threading.Thread(target=self.receive_loop, args=(stop_event, progress_bar))
+        receiver.daemon = True
+        receiver.start()
+
+        expired = []
+        try:
+            expired = self.send_probes()
+        finally:
+            stop_event.set()
+            receiver.join()
+            for sock in self.sockets.values():
+                sock.close()
+            self.sockets = {}
+
+        # Sans réponse après toutes les retransmissions: ouvert|filtré (une
+        # réponse tardive a pu arriver avant l'arrêt de la réception)
+        for item in expired:
+            if item not in self.answered:
+                host, port = item
+                self.record(host, port, STATE_FILTERED)
+                progress_bar.update(1)
+
+        progress_bar.close()
+
+        self.end_time = datetime.now()
+
+        self.store.merge()
+        self.flush_sinks()
+
+        return self.get_results()
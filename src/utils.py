@@ -1,32 +1,114 @@
 """
 Fonctions utilitaires pour le scanner de ports
 """
-import socket
 import ipaddress
 import re
 from colorama import Fore, Style, init
+from resolver import default_resolver
 
 # Initialiser colorama
 init(autoreset=True)
 
 def validate_ip(ip_string):
     """
-    Valide une adresse IP ou un nom d'hôte
+    Valide une adresse IP ou un nom d'hôte (IPv4 ou IPv6)
     """
-    try:
-        # Essayer de résoudre comme nom d'hôte
-        socket.gethostbyname(ip_string)
-        return True
-    except socket.gaierror:
-        return False
+    # Le résultat est mis en cache: resolve_hostname() ne refait pas la requête
+    return resolve_hostname(ip_string) is not None
 
 def resolve_hostname(target):
     """
-    Résout un nom d'hôte en adresse IP
+    Résout un nom d'hôte en adresse IP (IPv4 de préférence, sinon IPv6)
+    """
+    return default_resolver.resolve(target)
+
+MAX_TARGETS = 65536
+
+def _expand_target_range(part):
+    """
+    Développe une plage d'adresses (192.168.1.10-20 ou 192.168.1.10-192.168.1.20)
+    Retourne None si la chaîne n'est pas une plage d'IP (ex: nom d'hôte avec tiret)
+    """
+    start_str, end_str = part.split('-', 1)
+    try:
+        start = ipaddress.ip_address(start_str.strip())
+    except ValueError:
+        return None
+    
+    end_str = end_str.strip()
+    if end_str.isdigit() and start.version == 4:
+        # Seul le dernier octet est précisé
+        end = ipaddress.ip_address(start_str.rsplit('.', 1)[0] + '.' + end_str)
+    else:
+        end = ipaddress.ip_address(end_str)
+    
+    if end.version != start.version or int(end) < int(start):
+        raise ValueError(f"Plage d'adresses invalide: {part}")
+    if int(end) - int(start) + 1 > MAX_TARGETS:
+        raise ValueError(f"Plage trop grande: {part}")
+    
+    return [str(ipaddress.ip_address(i)) for i in range(int(start), int(end) + 1)]
+
+def _expand_target(part):
+    """
+    Développe une cible unique: CIDR, plage, IP ou nom d'hôte
     """
+    if '/' in part:
+        network = ipaddress.ip_network(part, strict=False)
+        if network.num_addresses > MAX_TARGETS:
+            raise ValueError(f"Réseau trop grand: {part}")
+        hosts = [str(ip) for ip in network.hosts()]
+        return hosts or [str(network.network_address)]
+    
+    if '-' in part:
+        hosts = _expand_target_range(part)
+        if hosts is not None:
+            return hosts
+    
+    return [part]
+
+def parse_targets(target_spec):
+    """
+    Parse une spécification de cibles et retourne la liste des cibles
+    
+    Syntaxe supportée (combinable avec des virgules):
+        192.168.1.1, exemple.com     # IP ou nom d'hôte
+        192.168.1.0/24               # Bloc CIDR
+        192.168.1.10-20              # Plage sur le dernier octet
+        192.168.1.10-192.168.1.20    # Plage complète
+        @cibles.txt                  # Fichier (une spécification par ligne)
+    
+    Retourne None si la spécification est invalide
+    """
+    targets = []
+    
     try:
-        return socket.gethostbyname(target)
-    except socket.gaierror:
+        parts = []
+        for part in target_spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if part.startswith('@'):
+                with open(part[1:], 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.split('#', 1)[0].strip()
+                        if line:
+                            parts.extend(p.strip() for p in line.split(',') if p.strip())
+            else:
+                parts.append(part)
+        
+        for part in parts:
+            targets.extend(_expand_target(part))
+        
+        # Dédupliquer en conservant l'ordre
+        targets = list(dict.fromkeys(targets))
+        if not targets:
+            raise ValueError("Aucune cible")
+        if len(targets) > MAX_TARGETS:
+            raise ValueError(f"Trop de cibles ({len(targets)} > {MAX_TARGETS})")
+        return targets
+    except (OSError, ValueError) as e:
+        print(f"{Fore.RED}Erreur de validation: {e}")
         return None
 
 def validate_port_range(port_range_str):
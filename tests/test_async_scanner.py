@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le moteur de scan asynchrone
+"""
+import unittest
+import errno
+import socket
+import threading
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from scanner import PortScanner
+from async_scanner import AsyncPortScanner
+from engines import create_scanner
+
+def start_listener(banner=b'TEST-SERVICE 1.0\r\n'):
+    """Démarre un serveur TCP local qui envoie une bannière"""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(16)
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                break
+            conn.sendall(banner)
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server, server.getsockname()[1]
+
+def free_port():
+    """Retourne un port local libre (donc fermé)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+class TestAsyncPortScanner(unittest.TestCase):
+    """Tests pour le moteur asyncio"""
+
+    def setUp(self):
+        self.server, self.open_port = start_listener()
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_scan_open_and_closed(self):
+        """Test de détection d'un port ouvert et d'un port fermé"""
+        closed_port = free_port()
+        scanner = AsyncPortScanner('127.0.0.1', [self.open_port, closed_port],
+                                   timeout=1, concurrency=10)
+        results = scanner.scan(verbose=False)
+
+        self.assertEqual([p['port'] for p in results['open_ports']], [self.open_port])
+        self.assertIn('TEST-SERVICE', results['open_ports'][0]['banner'])
+        self.assertEqual(results['closed_ports'], 1)
+        self.assertEqual(results['total_ports'], 2)
+
+    def test_results_shape_matches_thread_engine(self):
+        """Test que get_results() a la même forme que PortScanner"""
+        ports = [self.open_port, free_port()]
+        async_results = AsyncPortScanner('127.0.0.1', ports, timeout=1).scan(verbose=False)
+        thread_results = PortScanner('127.0.0.1', ports, timeout=1, threads=2).scan(verbose=False)
+        self.assertEqual(set(async_results), set(thread_results))
+
+    def test_unreachable_is_filtered(self):
+        """Test qu'un hôte injoignable donne un port filtré, comme le moteur à threads"""
+        async def unreachable(host, port):
+            raise OSError(errno.EHOSTUNREACH, 'No route to host')
+
+        scanner = AsyncPortScanner('127.0.0.1', [free_port()], timeout=1, banner_grabbing=False)
+        with mock.patch('async_scanner.asyncio.open_connection', side_effect=unreachable):
+            results = scanner.scan(verbose=False)
+        self.assertEqual(results['filtered_ports'], 1)
+        self.assertEqual(results['closed_ports'], 0)
+
+    def test_create_scanner(self):
+        """Test de la sélection du moteur"""
+        scanner = create_scanner('async', target='127.0.0.1', ports=[80], concurrency=50)
+        self.assertIsInstance(scanner, AsyncPortScanner)
+        self.assertEqual(scanner.concurrency, 50)
+        self.assertIsInstance(create_scanner('thread', target='127.0.0.1', ports=[80]), PortScanner)
+        with self.assertRaises(ValueError):
+            create_scanner('inconnu', target='127.0.0.1', ports=[80])
+
+if __name__ == '__main__':
+    unittest.main()
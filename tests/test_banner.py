@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la récupération des bannières
+"""
+import unittest
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import port_db
+from banner import format_banner, build_request
+from scanner import PortScanner
+from async_scanner import AsyncPortScanner
+from fd_budget import FdBudget
+
+class LocalServer:
+    """Serveur TCP local au comportement paramétrable"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        try:
+            conn.settimeout(2)
+            self.handler(conn)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def close(self):
+        self.sock.close()
+
+def greeting_handler(conn):
+    conn.sendall(b'SSH-2.0-OpenSSH_9.6\r\n')
+
+def http_handler(conn):
+    request = conn.recv(1024)
+    if request.startswith(b'HEAD / HTTP/1.0'):
+        conn.sendall(b'HTTP/1.0 200 OK\r\nDate: now\r\nServer: nginx/1.24\r\n\r\n')
+
+def silent_handler(conn):
+    time.sleep(1)
+
+class TestBannerFormatting(unittest.TestCase):
+    """Tests de mise en forme des bannières"""
+
+    def test_http_banner(self):
+        data = b'HTTP/1.1 301 Moved\r\nLocation: /\r\nServer: Apache\r\n\r\n'
+        self.assertEqual(format_banner(data), 'HTTP/1.1 301 Moved | Server: Apache')
+
+    def test_tls_banner(self):
+        self.assertEqual(format_banner(b'', 'TLSv1.3 TLS_AES_256_GCM_SHA384'),
+                         'TLSv1.3 TLS_AES_256_GCM_SHA384')
+        self.assertEqual(format_banner(b'+OK ready\r\n', 'TLSv1.2 X'), '[TLSv1.2 X] +OK ready')
+
+    def test_request_host(self):
+        self.assertIn(b'Host: [::1]', build_request('Host: {host}', '::1'))
+
+    def test_probe_table(self):
+        self.assertEqual(port_db.get_banner_probe(22), 'greeting')
+        self.assertEqual(port_db.get_banner_probe(80), 'http')
+        self.assertEqual(port_db.get_banner_probe(443), 'tls-http')
+        self.assertEqual(port_db.get_banner_probe(40000), 'generic')
+
+class TestBannerStage(unittest.TestCase):
+    """Tests de l'étape de récupération des bannières"""
+
+    def setUp(self):
+        self.greeting = LocalServer(greeting_handler)
+        self.http = LocalServer(http_handler)
+        self.silent = LocalServer(silent_handler)
+        port_db.BANNER_PROBES[self.greeting.port] = 'greeting'
+        port_db.BANNER_PROBES[self.http.port] = 'http'
+        port_db.BANNER_PROBES[self.silent.port] = 'greeting'
+        self.ports = [self.greeting.port, self.http.port, self.silent.port]
+
+    def tearDown(self):
+        for server in (self.greeting, self.http, self.silent):
+            port_db.BANNER_PROBES.pop(server.port, None)
+            server.close()
+
+    def check_banners(self, results):
+        banners = {p['port']: p['banner'] for p in results['open_ports']}
+        self.assertEqual(banners, {
+            self.greeting.port: 'SSH-2.0-OpenSSH_9.6',
+            self.http.port: 'HTTP/1.0 200 OK | Server: nginx/1.24',
+            self.silent.port: ''
+        })
+
+    def test_thread_engine(self):
+        """Test des sondes par service avec le moteur à threads"""
+        scanner = PortScanner('127.0.0.1', self.ports, timeout=1, threads=3, banner_timeout=0.2)
+        self.check_banners(scanner.scan(verbose=False))
+
+    def test_async_engine(self):
+        """Test des sondes par service avec le moteur asyncio"""
+        scanner = AsyncPortScanner('127.0.0.1', self.ports, timeout=1, banner_timeout=0.2)
+        self.check_banners(scanner.scan(verbose=False))
+
+    def test_discovery_not_blocked(self):
+        """Test qu'un serveur muet n'occupe pas le worker de découverte"""
+        scanner = PortScanner('127.0.0.1', [self.silent.port], timeout=1, threads=1,
+                              banner_timeout=0.5)
+        started = time.monotonic()
+        scanner.scan_port(self.silent.port)
+        self.assertLess(time.monotonic() - started, 0.2)
+        scanner.wait_banners()
+        scanner.store.merge()
+        self.assertEqual(scanner.get_ports_by_state('open', '127.0.0.1'), [self.silent.port])
+
+    def test_async_tls_reuses_connection(self):
+        """Test que la sonde TLS asyncio n'ouvre pas de socket hors budget"""
+        connections = []
+        def counting_handler(conn):
+            connections.append(conn)
+            time.sleep(0.5)
+
+        server = LocalServer(counting_handler)
+        port_db.BANNER_PROBES[server.port] = 'tls'
+        budget = FdBudget(capacity=4)
+        try:
+            scanner = AsyncPortScanner('127.0.0.1', [server.port], timeout=1,
+                                       banner_timeout=0.2, fd_budget=budget)
+            results = scanner.scan(verbose=False)
+        finally:
+            port_db.BANNER_PROBES.pop(server.port, None)
+            server.close()
+
+        self.assertEqual(len(results['open_ports']), 1)
+        self.assertEqual(budget.used, 0)
+        # Mise à niveau de la connexion existante quand asyncio le permet
+        expected = 1 if hasattr(asyncio.StreamWriter, 'start_tls') else 2
+        self.assertEqual(len(connections), expected)
+
+    def test_failed_grab_releases_budget(self):
+        """Test qu'une erreur de lecture de bannière rend le créneau du budget"""
+        budget = FdBudget(capacity=4)
+        scanner = PortScanner('127.0.0.1', [self.greeting.port], timeout=1, threads=1,
+                              fd_budget=budget)
+        def failing_grab(sock, host, port):
+            sock.close()
+            raise ValueError('bannière illisible')
+        scanner.banner_grabber.grab = failing_grab
+        results = scanner.scan(verbose=False)
+
+        self.assertEqual(budget.used, 0)
+        self.assertEqual([p['port'] for p in results['open_ports']], [self.greeting.port])
+
+    def test_banners_disabled(self):
+        scanner = PortScanner('127.0.0.1', [self.greeting.port], timeout=1, threads=1,
+                              banner_grabbing=False)
+        results = scanner.scan(verbose=False)
+        self.assertEqual(results['open_ports'][0]['banner'], '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le harnais de benchmarks
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Ajouter les dossiers src et benchmarks au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from scanner import PortScanner
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from target_farm import TargetFarm
+from run_benchmarks import percentile, compare_with_baseline
+
+class TestTargetFarm(unittest.TestCase):
+    """Tests pour la ferme de cibles locale"""
+
+    def test_states_detected(self):
+        """Test que le scanner voit les états simulés par la ferme"""
+        with TargetFarm(open_count=3, closed_count=5, filtered_count=2) as farm:
+            self.assertEqual(len(farm.ports), 10)
+            scanner = PortScanner(farm.host, farm.ports, timeout=0.2, threads=10)
+            scanner.scan(verbose=False)
+            table = scanner.store.table(farm.host)
+            names = {STATE_OPEN: 'open', STATE_CLOSED: 'closed', STATE_FILTERED: 'filtered'}
+            detected = {port: names[table.get(port)] for port in farm.ports}
+            self.assertEqual(detected, farm.expected_states())
+
+class TestBenchmarkHelpers(unittest.TestCase):
+    """Tests des fonctions de mesure et de comparaison"""
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_compare_with_baseline(self):
+        baseline = {'results': [{'ports': 100, 'threads': 50, 'ports_per_second': 1000,
+                                 'latency_p99_ms': 10, 'mismatches': 0}]}
+        same = [{'ports': 100, 'threads': 50, 'ports_per_second': 950,
+                 'latency_p99_ms': 11, 'mismatches': 0}]
+        slower = [{'ports': 100, 'threads': 50, 'ports_per_second': 500,
+                   'latency_p99_ms': 30, 'mismatches': 1}]
+        self.assertEqual(compare_with_baseline(same, baseline, 0.2), [])
+        self.assertEqual(len(compare_with_baseline(slower, baseline, 0.2)), 3)
+
+if __name__ == '__main__':
+    unittest.main()
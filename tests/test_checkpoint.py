@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour les checkpoints de scan
+"""
+import unittest
+import os
+import tempfile
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from checkpoint import CheckpointWriter, load_checkpoint
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from scanner import PortScanner
+
+class TestCheckpoint(unittest.TestCase):
+    """Tests d'écriture et de relecture des checkpoints"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'scan.ckpt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_records(self):
+        records = []
+        load_checkpoint(self.path, lambda *record: records.append(record))
+        return records
+
+    def test_write_and_read(self):
+        """Test d'un aller-retour écriture/relecture"""
+        writer = CheckpointWriter(self.path, interval=60)
+        writer.write('10.0.0.1', 22, STATE_OPEN, 'SSH-2.0-OpenSSH')
+        writer.write('10.0.0.2', 80, STATE_CLOSED, None)
+        writer.close()
+
+        self.assertEqual(self.read_records(), [
+            ('10.0.0.1', 22, STATE_OPEN, 'SSH-2.0-OpenSSH'),
+            ('10.0.0.2', 80, STATE_CLOSED, '')
+        ])
+
+    def test_append_after_truncated_record(self):
+        """Test qu'un enregistrement tronqué est écarté avant l'ajout"""
+        writer = CheckpointWriter(self.path, interval=60)
+        writer.write('10.0.0.1', 22, STATE_OPEN, 'SSH')
+        writer.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'P\x00\x00')
+
+        writer = CheckpointWriter(self.path, interval=60)
+        writer.write('10.0.0.1', 23, STATE_FILTERED)
+        writer.write('10.0.0.3', 25, STATE_CLOSED)
+        writer.close()
+
+        hosts, _ = load_checkpoint(self.path)
+        self.assertEqual(hosts, ['10.0.0.1', '10.0.0.3'])
+        self.assertEqual([r[1] for r in self.read_records()], [22, 23, 25])
+
+    def test_invalid_file(self):
+        """Test d'un fichier qui n'est pas un checkpoint"""
+        with open(self.path, 'wb') as f:
+            f.write(b'{}')
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_scanner_resume_skips_completed(self):
+        """Test que la reprise ne rescanne pas les paires terminées"""
+        writer = CheckpointWriter(self.path, interval=60)
+        writer.write('127.0.0.1', 40201, STATE_OPEN, 'repris')
+        writer.write('127.0.0.1', 40202, STATE_FILTERED)
+        writer.write('10.9.9.9', 40203, STATE_CLOSED)
+        writer.close()
+
+        scanner = PortScanner('127.0.0.1', [40201, 40202, 40203], timeout=0.5, threads=2)
+        self.assertEqual(scanner.resume_from(self.path), 2)
+        self.assertEqual(list(scanner.work_items()), [('127.0.0.1', 40203)])
+
+        writer = CheckpointWriter(self.path, interval=60)
+        scanner.add_sink(writer)
+        results = scanner.scan(verbose=False)
+        writer.close()
+
+        self.assertEqual(results['open_ports'][0]['banner'], 'repris')
+        self.assertEqual(results['filtered_ports'], 1)
+        self.assertEqual(results['closed_ports'], 1)
+        self.assertEqual(len(self.read_records()), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la découverte des hôtes actifs
+"""
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from discovery import HostDiscovery, build_echo_request, read_arp_table
+from syn_scanner import checksum
+
+ARP_SAMPLE = """IP address       HW type     Flags       HW address            Mask     Device
+10.0.0.1         0x1         0x2         02:42:ac:11:00:01     *        eth0
+10.0.0.2         0x1         0x0         00:00:00:00:00:00     *        eth0
+10.0.0.3         0x1         0x6         02:42:ac:11:00:03     *        eth0
+"""
+
+class SilentDiscovery(HostDiscovery):
+    """Découverte où seuls certains hôtes répondent aux sondes TCP"""
+
+    def __init__(self, responding, **kwargs):
+        super().__init__(icmp=False, arp=False, **kwargs)
+        self.responding = set(responding)
+        self.probed = []
+
+    async def tcp_probe(self, host, port, semaphore):
+        async with semaphore:
+            self.probed.append((host, port))
+            return host in self.responding
+
+class TestHostDiscovery(unittest.TestCase):
+    """Tests de la découverte des hôtes"""
+
+    def test_localhost_alive_by_tcp(self):
+        # Aucun service sur ces ports: le refus de connexion suffit
+        discovery = HostDiscovery(timeout=1.0, ports=[1, 9], icmp=False, arp=False)
+        self.assertEqual(discovery.discover(['127.0.0.1']), ['127.0.0.1'])
+        self.assertEqual(discovery.alive['127.0.0.1'], 'tcp')
+
+    def test_only_live_hosts_in_order(self):
+        discovery = SilentDiscovery(['10.0.0.9', '10.0.0.2'], ports=[80, 443])
+        hosts = ['10.0.0.1', '10.0.0.2', '10.0.0.3', '10.0.0.9']
+        self.assertEqual(discovery.discover(hosts), ['10.0.0.2', '10.0.0.9'])
+        # Les hôtes muets sont sondés sur tous les ports
+        self.assertIn(('10.0.0.1', 80), discovery.probed)
+        self.assertIn(('10.0.0.1', 443), discovery.probed)
+
+    def test_no_live_host(self):
+        discovery = SilentDiscovery([], ports=[80])
+        self.assertEqual(discovery.discover(['10.0.0.1', '10.0.0.2']), [])
+        self.assertEqual(discovery.alive, {})
+
+class TestDiscoveryHelpers(unittest.TestCase):
+    """Tests des paquets ICMP et de la table ARP"""
+
+    def test_echo_request_checksum(self):
+        packet = build_echo_request(0x1234, 7)
+        self.assertEqual(packet[0], 8)
+        self.assertEqual(packet[4:6], b'\x12\x34')
+        # Somme de contrôle valide: le paquet complet se somme à zéro
+        self.assertEqual(checksum(packet), 0)
+
+    def test_read_arp_table(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.arp', delete=False) as f:
+            f.write(ARP_SAMPLE)
+        try:
+            # Entrées incomplètes ignorées
+            self.assertEqual(read_arp_table(f.name), {'10.0.0.1', '10.0.0.3'})
+        finally:
+            os.unlink(f.name)
+
+    def test_missing_arp_table(self):
+        self.assertEqual(read_arp_table('/nonexistent/arp'), set())
+
+if __name__ == '__main__':
+    unittest.main()
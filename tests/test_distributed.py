@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le scan distribué (coordinateur et workers)
+"""
+import unittest
+import base64
+import json
+import socket
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from distributed import (
+    ScanCoordinator, ScanWorker, CoordinatorError, parse_address, encode_results,
+    decode_results
+)
+from scanner import PortScanner
+from results import STATE_OPEN, STATE_CLOSED
+
+def post(address, route, payload, token=None):
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['X-Scan-Token'] = token
+    request = urllib.request.Request(
+        f"http://{address}{route}", data=json.dumps(payload).encode('utf-8'), headers=headers
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+class TestProtocol(unittest.TestCase):
+    """Tests des adresses et de l'encodage des résultats"""
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address('10.0.0.1:9000'), ('10.0.0.1', 9000))
+        self.assertEqual(parse_address('[::1]:9000'), ('::1', 9000))
+        self.assertEqual(parse_address('scanner'), ('scanner', 8765))
+        self.assertEqual(parse_address(':9000'), ('127.0.0.1', 9000))
+
+    def test_encode_decode(self):
+        scanner = PortScanner(['h1', 'h2'], [22, 80], banner_grabbing=False)
+        scanner.record('h1', 22, STATE_OPEN, 'SSH-2.0')
+        scanner.record('h1', 80, STATE_CLOSED)
+        scanner.record('h2', 22, STATE_CLOSED)
+        scanner.record('h2', 80, STATE_OPEN)
+        payload = encode_results(scanner, ['h1', 'h2'], [22, 80])
+        items = list(decode_results(['h1', 'h2'], [22, 80], payload))
+        self.assertEqual(items, [
+            ('h1', 22, STATE_OPEN, 'SSH-2.0'),
+            ('h2', 22, STATE_CLOSED, None),
+            ('h1', 80, STATE_CLOSED, None),
+            ('h2', 80, STATE_OPEN, None)
+        ])
+        with self.assertRaises(ValueError):
+            list(decode_results(['h1'], [22, 80], payload))
+
+class TestCoordinator(unittest.TestCase):
+    """Tests du coordinateur avec des workers locaux"""
+
+    def setUp(self):
+        self.listeners = []
+        for _ in range(3):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(('127.0.0.1', 0))
+            sock.listen(16)
+            self.listeners.append(sock)
+        self.open_ports = sorted(sock.getsockname()[1] for sock in self.listeners)
+        self.closed_ports = []
+        for _ in range(9):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(('127.0.0.1', 0))
+            self.closed_ports.append(sock.getsockname()[1])
+            sock.close()
+        self.ports = self.open_ports + self.closed_ports
+
+    def tearDown(self):
+        for sock in self.listeners:
+            sock.close()
+
+    def start(self, coordinator):
+        results = {}
+        thread = threading.Thread(
+            target=lambda: results.update(coordinator.scan(verbose=False)), daemon=True
+        )
+        thread.start()
+        self.assertTrue(coordinator.ready.wait(5))
+        return thread, results
+
+    def check(self, results):
+        self.assertEqual(sorted(p['port'] for p in results['open_ports']), self.open_ports)
+        self.assertEqual(results['closed_ports'], len(self.closed_ports))
+
+    def test_hosts_per_lease_capped(self):
+        targets = [f"10.0.{index // 256}.{index % 256}" for index in range(600)]
+        coordinator = ScanCoordinator(targets, [80], listen=('127.0.0.1', 0), lease_size=4096)
+        coordinator.build_leases()
+        self.assertEqual([len(lease.targets) for lease in coordinator.leases], [256, 256, 88])
+
+    def test_local_workers(self):
+        coordinator = ScanCoordinator('127.0.0.1', self.ports, timeout=0.5, threads=4,
+                                      listen=('127.0.0.1', 0), lease_size=4,
+                                      local_workers=2, banner_grabbing=False)
+        thread, results = self.start(coordinator)
+        thread.join(60)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(coordinator.leases), 3)
+        self.check(results)
+
+    def test_lease_reassigned_after_worker_death(self):
+        coordinator = ScanCoordinator('127.0.0.1', self.ports, timeout=0.5, threads=4,
+                                      listen=('127.0.0.1', 0), lease_size=6,
+                                      lease_timeout=0.3, banner_grabbing=False)
+        thread, results = self.start(coordinator)
+
+        # Un worker prend un bail puis disparaît sans le renouveler
+        lost = post(coordinator.address, '/lease', {'worker': 'lost'}, coordinator.token)
+        self.assertIn('lease', lost)
+
+        worker = ScanWorker(coordinator.address, 'survivor', connect_timeout=5,
+                            token=coordinator.token)
+        self.assertEqual(worker.run(), 2)
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.check(results)
+        self.assertEqual(coordinator.leases[lost['lease']].attempts, 2)
+
+        # Résultat tardif du worker disparu: ignoré
+        late = {
+            'worker': 'lost', 'lease': lost['lease'], 'banners': {},
+            'states': base64.b64encode(bytes([STATE_CLOSED]) * 6).decode('ascii')
+        }
+        self.assertEqual(coordinator.complete(late), {'accepted': False})
+
+    def test_token_and_lease_owner(self):
+        coordinator = ScanCoordinator('127.0.0.1', self.ports, timeout=0.5, threads=4,
+                                      listen=('127.0.0.1', 0), lease_size=12,
+                                      token='secret', banner_grabbing=False)
+        thread, results = self.start(coordinator)
+
+        # Sans le secret partagé, le coordinateur refuse la requête
+        for token in (None, 'wrong'):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                post(coordinator.address, '/lease', {'worker': 'intruder'}, token)
+            self.assertEqual(context.exception.code, 403)
+
+        # Un worker au mauvais jeton s'arrête en erreur au lieu de finir « sans bail »
+        intruder = ScanWorker(coordinator.address, 'intruder', connect_timeout=5, token='wrong')
+        with self.assertRaises(CoordinatorError):
+            intruder.run()
+
+        lease = post(coordinator.address, '/lease', {'worker': 'owner'}, 'secret')
+        self.assertIn('lease', lease)
+
+        # Résultat d'un autre worker que le détenteur du bail: ignoré
+        forged = {
+            'worker': 'intruder', 'lease': lease['lease'], 'banners': {},
+            'states': base64.b64encode(bytes([STATE_CLOSED]) * 12).decode('ascii')
+        }
+        self.assertEqual(post(coordinator.address, '/result', forged, 'secret'),
+                         {'accepted': False})
+
+        coordinator.cancel()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results['open_ports'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le budget de descripteurs
+"""
+import unittest
+import errno
+import socket
+import sys
+import threading
+from pathlib import Path
+from unittest import mock
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from fd_budget import FdBudget, get_fd_limit, raise_fd_limit, is_exhausted
+from scanner import PortScanner
+from async_scanner import AsyncPortScanner
+
+class TestFdBudget(unittest.TestCase):
+    """Tests du sémaphore de sockets"""
+
+    def test_capacity_from_limit(self):
+        budget = FdBudget(reserve=16)
+        limits = get_fd_limit()
+        if limits is None:
+            self.assertIsNone(budget.capacity)
+        else:
+            self.assertGreaterEqual(budget.capacity, 1)
+            self.assertLess(budget.capacity, limits[0])
+
+    def test_raise_limit_keeps_hard_limit(self):
+        limits = get_fd_limit()
+        if limits is None:
+            self.skipTest("RLIMIT_NOFILE indisponible")
+        soft = raise_fd_limit()
+        self.assertGreaterEqual(soft, limits[0])
+        self.assertEqual(get_fd_limit()[1], limits[1])
+
+    def test_acquire_blocks_until_release(self):
+        budget = FdBudget(capacity=1)
+        budget.acquire()
+        self.assertFalse(budget.try_acquire())
+
+        acquired = threading.Event()
+        def waiter():
+            budget.acquire()
+            acquired.set()
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        budget.release()
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        self.assertEqual(budget.stats()['waits'], 1)
+
+    def test_shrink(self):
+        budget = FdBudget(capacity=100)
+        for _ in range(10):
+            budget.acquire()
+        budget.shrink()
+        self.assertEqual(budget.capacity, 9)
+        self.assertEqual(budget.stats()['exhausted'], 1)
+
+        # Chaque socket libérée rend une place, sans dépasser la capacité nominale
+        for _ in range(10):
+            budget.release()
+        self.assertEqual(budget.capacity, 19)
+        for _ in range(100):
+            budget.acquire()
+            budget.release()
+        self.assertEqual(budget.capacity, 100)
+
+    def test_is_exhausted(self):
+        self.assertTrue(is_exhausted(OSError(errno.EMFILE, 'Too many open files')))
+        self.assertTrue(is_exhausted(OSError(errno.ENFILE, 'Too many open files in system')))
+        self.assertFalse(is_exhausted(OSError(errno.ECONNREFUSED, 'refused')))
+        # Manque de tampons: pas un manque de descripteurs
+        self.assertFalse(is_exhausted(OSError(errno.ENOBUFS, 'No buffer space available')))
+
+class TestScannerBudget(unittest.TestCase):
+    """Tests de l'épuisement des descripteurs pendant un scan"""
+
+    def free_ports(self, count):
+        sockets = [socket.socket() for _ in range(count)]
+        for sock in sockets:
+            sock.bind(('127.0.0.1', 0))
+        ports = [sock.getsockname()[1] for sock in sockets]
+        for sock in sockets:
+            sock.close()
+        return ports
+
+    def test_emfile_is_backpressure(self):
+        """Test qu'un EMFILE retarde la sonde au lieu de fausser le résultat"""
+        real_socket = socket.socket
+        failures = [2]
+
+        def flaky_socket(*args, **kwargs):
+            if failures[0]:
+                failures[0] -= 1
+                raise OSError(errno.EMFILE, 'Too many open files')
+            return real_socket(*args, **kwargs)
+
+        budget = FdBudget(capacity=4)
+        scanner = PortScanner('127.0.0.1', self.free_ports(5), timeout=1, threads=1,
+                              banner_grabbing=False, fd_budget=budget)
+        with mock.patch('scanner.socket.socket', side_effect=flaky_socket):
+            results = scanner.scan(verbose=False)
+
+        self.assertEqual(results['closed_ports'], 5)
+        self.assertEqual(results['filtered_ports'], 0)
+        self.assertEqual(budget.used, 0)
+        self.assertEqual(budget.stats()['exhausted'], 2)
+
+    def test_budget_released_with_banners(self):
+        """Test que les sockets confiées aux bannières libèrent leur place"""
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        port = server.getsockname()[1]
+        budget = FdBudget(capacity=2)
+        try:
+            for engine, options in ((PortScanner, {'threads': 8}),
+                                    (AsyncPortScanner, {'concurrency': 8})):
+                scanner = engine('127.0.0.1', [port] + self.free_ports(10), timeout=1,
+                                 banner_timeout=0.1, fd_budget=budget, **options)
+                results = scanner.scan(verbose=False)
+                self.assertEqual(len(results['open_ports']), 1)
+                self.assertEqual(results['closed_ports'], 10)
+                self.assertEqual(budget.used, 0)
+        finally:
+            server.close()
+
+if __name__ == '__main__':
+    unittest.main()
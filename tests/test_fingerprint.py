@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'identification des services par bannière
+"""
+import unittest
+import socket
+import sys
+import threading
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from fingerprint import FingerprintMatcher, literal_prefix, match_banner
+from port_db import get_port_info, service_label
+from scanner import PortScanner
+
+class TestLiteralPrefix(unittest.TestCase):
+    """Tests de l'extraction des préfixes littéraux"""
+
+    def test_prefixes(self):
+        self.assertEqual(literal_prefix(r'^SSH-[\d.]+'), 'SSH-')
+        self.assertEqual(literal_prefix(r'^\+OK '), '+OK ')
+        self.assertEqual(literal_prefix(r'^220[ -]'), '220')
+        self.assertEqual(literal_prefix(r'^HTTPS?/'), 'HTTP')
+        self.assertEqual(literal_prefix(r'^\d+'), '')
+        self.assertEqual(literal_prefix(r'SSH-'), '')
+
+class TestFingerprintMatcher(unittest.TestCase):
+    """Tests du moteur de correspondance"""
+
+    def setUp(self):
+        self.matcher = FingerprintMatcher([
+            {'service': 'SSH', 'product': 'OpenSSH', 'pattern': r'^SSH-[\d.]+-OpenSSH_([\w.]+)', 'version': 1},
+            {'service': 'SSH', 'pattern': r'^SSH-'},
+            {'service': 'FTP', 'pattern': r'^220[ -].*ftp', 'ignore_case': True},
+            {'service': 'Redis', 'pattern': r'^-(?:NOAUTH|ERR)'},
+            {'service': 'XMPP', 'product': 'ejabberd', 'pattern': r'<stream:stream.*ejabberd ([\d.]+)', 'version': 1}
+        ])
+
+    def test_index_and_fallback(self):
+        """Test de la répartition entre index et expression combinée"""
+        self.assertEqual(sorted(self.matcher.prefix_index), ['220', 'ssh'])
+        self.assertEqual([s.service for s in self.matcher.fallback], ['Redis', 'XMPP'])
+
+    def test_indexed_match(self):
+        self.assertEqual(self.matcher.match('SSH-2.0-OpenSSH_9.6p1 Ubuntu'),
+                         {'service': 'SSH', 'product': 'OpenSSH', 'version': '9.6p1'})
+        self.assertEqual(self.matcher.match('SSH-2.0-Go')['product'], None)
+        self.assertEqual(self.matcher.match('220 Welcome to FTP')['service'], 'FTP')
+
+    def test_combined_match(self):
+        """Test des signatures non indexées et de leurs groupes de version"""
+        self.assertEqual(self.matcher.match('-NOAUTH Authentication required')['service'], 'Redis')
+        result = self.matcher.match("<?xml?><stream:stream from='x' ejabberd 23.10>")
+        self.assertEqual(result, {'service': 'XMPP', 'product': 'ejabberd', 'version': '23.10'})
+
+    def test_no_match(self):
+        self.assertIsNone(self.matcher.match('Hello'))
+        self.assertIsNone(self.matcher.match(''))
+        self.assertIsNone(self.matcher.match(None))
+
+    def test_default_database(self):
+        """Test que la base fournie se charge et identifie les services courants"""
+        self.assertEqual(match_banner('HTTP/1.1 200 OK | Server: nginx/1.24.0')['product'], 'nginx')
+        self.assertEqual(match_banner('220 mail.example.com ESMTP Postfix')['service'], 'SMTP')
+
+class TestPortInfoFingerprint(unittest.TestCase):
+    """Tests de l'intégration avec get_port_info et les résultats"""
+
+    def test_get_port_info(self):
+        fingerprint = {'service': 'SSH', 'product': 'OpenSSH', 'version': '9.6'}
+        info = get_port_info(2223, fingerprint)
+        self.assertEqual(info['service'], 'SSH')
+        self.assertEqual(service_label(info), 'SSH (OpenSSH 9.6)')
+        self.assertEqual(get_port_info(2223)['service'], 'Unknown')
+        self.assertEqual(get_port_info(2223)['product'], '')
+
+    def test_scan_results(self):
+        """Test que l'empreinte est stockée sur les ports ouverts"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        port = server.getsockname()[1]
+
+        def serve():
+            conn, _ = server.accept()
+            conn.sendall(b'SSH-2.0-OpenSSH_9.6\r\n')
+            conn.close()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        try:
+            results = PortScanner('127.0.0.1', [port], timeout=1, threads=1,
+                                  banner_timeout=0.5).scan(verbose=False)
+        finally:
+            thread.join(1)
+            server.close()
+
+        self.assertEqual(results['open_ports'][0]['fingerprint'],
+                         {'service': 'SSH', 'product': 'OpenSSH', 'version': '9.6'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'historique des scans et la comparaison de scans
+"""
+import unittest
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from history import ScanHistory, prioritize_ports, pack_ports, unpack_ports
+from scanner import PortScanner
+from results import STATE_OPEN, STATE_CLOSED
+
+def make_results(ports, open_ports, hosts=('10.0.0.1',)):
+    """Résultats de scan simulés (open_ports: {hôte: [ports]})"""
+    scanner = PortScanner(list(hosts), ports, banner_grabbing=False)
+    scanner.start_time = scanner.end_time = datetime.now()
+    for host in hosts:
+        for port in ports:
+            if port in open_ports.get(host, ()):
+                scanner.record(host, port, STATE_OPEN, f'banner {port}')
+            else:
+                scanner.record(host, port, STATE_CLOSED)
+    return scanner.get_results()
+
+class TestScanHistory(unittest.TestCase):
+    """Tests de la base d'historique"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history = ScanHistory(os.path.join(self.directory.name, 'history.db'))
+
+    def tearDown(self):
+        self.history.close()
+        self.directory.cleanup()
+
+    def test_pack_ports(self):
+        self.assertEqual(list(unpack_ports(pack_ports([443, 22, 80, 22]))), [22, 80, 443])
+
+    def test_record_and_baseline(self):
+        ports = [22, 80, 443]
+        first = self.history.record(make_results(ports, {'10.0.0.1': [22]}), ports)
+        second = self.history.record(make_results(ports, {'10.0.0.1': [22, 80]}), ports)
+
+        scan_id, scanned = self.history.baseline('10.0.0.1')
+        self.assertEqual(scan_id, second)
+        self.assertEqual(list(scanned), ports)
+        self.assertEqual(self.history.baseline('10.0.0.1', against=first)[0], first)
+        self.assertIsNone(self.history.baseline('10.0.0.1', protocol='udp'))
+        self.assertIsNone(self.history.baseline('10.0.0.2'))
+        self.assertEqual(self.history.open_ports(second, '10.0.0.1'),
+                         {22: 'banner 22', 80: 'banner 80'})
+
+    def test_diff(self):
+        ports = list(range(20, 30))
+        hosts = ('10.0.0.1', '10.0.0.2')
+        self.history.record(make_results(ports, {'10.0.0.1': [21, 22]}, hosts[:1]), ports)
+
+        # Scan partiel: le port 21 n'est pas rescanné, il n'est donc pas compté fermé
+        current_ports = [22, 23, 24]
+        current = make_results(current_ports, {'10.0.0.1': [23], '10.0.0.2': [22]}, hosts)
+        changes = self.history.diff(current, current_ports)
+
+        self.assertEqual(changes['opened'], [{'host': '10.0.0.1', 'port': 23, 'banner': 'banner 23'}])
+        self.assertEqual(changes['closed'], [{'host': '10.0.0.1', 'port': 22}])
+        self.assertEqual(changes['new_hosts'], ['10.0.0.2'])
+
+    def test_known_open_ports(self):
+        ports = [22, 80, 443]
+        self.history.record(make_results(ports, {'10.0.0.1': [443]}), ports)
+        self.history.record(make_results(ports, {'10.0.0.1': [22]}), ports)
+        self.assertEqual(self.history.known_open_ports(['10.0.0.1', '10.0.0.9']), [22])
+
+        # Scan partiel: le port 443 n'est pas couvert, son dernier état connu reste valable
+        self.history.record(make_results([22, 80], {'10.0.0.1': [80]}), [22, 80])
+        self.assertEqual(self.history.known_open_ports(['10.0.0.1']), [80])
+        self.history.record(make_results([22], {}), [22])
+        self.history.record(make_results([443], {'10.0.0.1': [443]}), [443])
+        self.assertEqual(self.history.known_open_ports(['10.0.0.1']), [80, 443])
+        self.assertEqual(self.history.known_open_ports(['10.0.0.1'], ports=[22, 443]), [443])
+
+class TestPrioritizePorts(unittest.TestCase):
+    """Tests de l'ordre du scan différentiel"""
+
+    def test_known_first_then_sample(self):
+        ports = list(range(1, 101))
+        ordered = prioritize_ports(ports, [50, 7, 1000], sample_ratio=0.1, seed=1)
+        self.assertEqual(ordered[:2], [7, 50])
+        self.assertEqual(len(ordered), 2 + 10)
+        self.assertEqual(len(set(ordered)), len(ordered))
+        self.assertTrue(set(ordered) <= set(ports))
+
+    def test_no_sample(self):
+        self.assertEqual(prioritize_ports([1, 2, 3], [3], sample_ratio=0), [3])
+        self.assertEqual(prioritize_ports([1, 2, 3], [], sample_ratio=1), [1, 2, 3])
+
+    def test_known_open_scanned_first_when_randomized(self):
+        """Test que l'ordre pseudo-aléatoire ne permute que l'échantillon"""
+        hosts = ['10.0.0.1', '10.0.0.2']
+        known_open = [443, 22, 300]
+        ports = prioritize_ports(list(range(1, 501)), known_open, sample_ratio=0.5, seed=3)
+        scanner = PortScanner(hosts, ports, seed=7, priority_ports=known_open)
+        items = list(scanner.work_items())
+        self.assertEqual(items[:6], [(host, port) for port in [22, 300, 443] for host in hosts])
+        self.assertEqual(set(items), {(host, port) for port in ports for host in hosts})
+        tail = [port for _, port in items[6:]]
+        self.assertNotEqual(tail, sorted(tail))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le planificateur des scans du service web
+"""
+import unittest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from jobs import ScanJobScheduler, QuotaExceeded
+
+class BlockingRunner:
+    """Exécuteur de test: chaque job attend d'être libéré"""
+
+    def __init__(self):
+        self.started = []
+        self.release = {}
+
+    def __call__(self, job):
+        event = threading.Event()
+        self.release[job.id] = event
+        self.started.append(job.id)
+        while not event.wait(0.01):
+            if job.cancel_token.cancelled:
+                return {'cancelled': True}
+        return {'target': job.request['target']}
+
+    def finish(self, job_id):
+        self.wait_started(job_id)
+        self.release[job_id].set()
+
+    def wait_started(self, job_id):
+        deadline = time.monotonic() + 5
+        while job_id not in self.release and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+def wait_status(job, status):
+    deadline = time.monotonic() + 5
+    while job.status != status and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+class TestScanJobScheduler(unittest.TestCase):
+    """Tests du budget, des quotas et de l'équité"""
+
+    def setUp(self):
+        self.runner = BlockingRunner()
+
+    def scheduler(self, **options):
+        return ScanJobScheduler(self.runner, **options)
+
+    def test_thread_budget(self):
+        scheduler = self.scheduler(max_threads=300, min_threads=50, per_client_running=5)
+        first = scheduler.submit('a', {'target': 'h1'}, 200)
+        second = scheduler.submit('a', {'target': 'h2'}, 200)
+        third = scheduler.submit('a', {'target': 'h3'}, 200)
+
+        self.assertEqual(first.granted, 200)
+        # Budget restant (100) suffisant pour démarrer avec moins de threads
+        self.assertEqual(second.granted, 100)
+        self.assertEqual(third.status, 'queued')
+
+        self.runner.finish(first.id)
+        self.assertEqual(wait_status(third, 'running'), 'running')
+        self.assertEqual(third.granted, 200)
+        self.assertEqual(wait_status(first, 'completed'), 'completed')
+        self.assertEqual(first.results, {'target': 'h1'})
+
+    def test_fair_queuing(self):
+        scheduler = self.scheduler(max_running=1, per_client_queued=10)
+        jobs = [scheduler.submit('a', {'target': f'a{i}'}, 10) for i in range(3)]
+        jobs.append(scheduler.submit('b', {'target': 'b0'}, 10))
+        self.assertEqual(scheduler.position(jobs[3]), 1)
+
+        for count in range(1, 4):
+            self.runner.finish(self.runner.started[-1])
+            deadline = time.monotonic() + 5
+            while len(self.runner.started) == count and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        # Le client b passe avant les scans suivants du client a
+        order = [scheduler.get(job_id).request['target'] for job_id in self.runner.started]
+        self.assertEqual(order[:3], ['a0', 'b0', 'a1'])
+
+    def test_client_quota(self):
+        scheduler = self.scheduler(per_client_running=1, per_client_queued=1)
+        scheduler.submit('a', {'target': 'h1'}, 10)
+        scheduler.submit('a', {'target': 'h2'}, 10)
+        with self.assertRaises(QuotaExceeded):
+            scheduler.submit('a', {'target': 'h3'}, 10)
+        # Les autres clients ne sont pas concernés
+        self.assertEqual(scheduler.submit('b', {'target': 'h4'}, 10).status, 'running')
+
+    def test_cancel(self):
+        scheduler = self.scheduler(max_running=1)
+        running = scheduler.submit('a', {'target': 'h1'}, 10)
+        queued = scheduler.submit('b', {'target': 'h2'}, 10)
+
+        # Un client ne peut pas annuler le scan d'un autre
+        self.assertFalse(scheduler.cancel(queued.id, client='a'))
+        self.assertEqual(queued.status, 'queued')
+        self.assertTrue(scheduler.cancel(queued.id, client='b'))
+        self.assertEqual(queued.status, 'cancelled')
+        self.runner.wait_started(running.id)
+        self.assertTrue(scheduler.cancel(running.id))
+        self.assertEqual(wait_status(running, 'cancelled'), 'cancelled')
+        self.assertFalse(scheduler.cancel(running.id))
+        self.assertEqual(scheduler.stats()['used_threads'], 0)
+
+    def test_retention(self):
+        scheduler = self.scheduler(max_retained=2)
+        jobs = []
+        for index in range(3):
+            job = scheduler.submit('a', {'target': f'h{index}'}, 10)
+            self.runner.finish(job.id)
+            wait_status(job, 'completed')
+            jobs.append(job)
+        self.assertIsNone(scheduler.get(jobs[0].id))
+        self.assertIsNotNone(scheduler.get(jobs[2].id))
+
+        scheduler.retention = 0
+        self.assertIsNone(scheduler.get(jobs[2].id))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'instrumentation des scans
+"""
+import unittest
+import errno
+import socket
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metrics import Histogram, ScanMetrics, StatsReporter
+from scanner import PortScanner
+from async_scanner import AsyncPortScanner
+from results import STATE_OPEN, STATE_CLOSED
+from tests.helpers import free_ports
+
+class TestHistogram(unittest.TestCase):
+    """Tests de l'histogramme de latence"""
+
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for value in (0.005, 0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(),
+                         [(0.01, 1), (0.1, 3), (1.0, 4), (float('inf'), 5)])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(1.0), float('inf'))
+        self.assertIsNone(Histogram().quantile(0.5))
+
+class TestScanMetrics(unittest.TestCase):
+    """Tests des compteurs et de leur export"""
+
+    def test_counters(self):
+        metrics = ScanMetrics()
+        metrics.add_pending(3)
+        metrics.connect_started()
+        metrics.connect_started()
+        metrics.add_pending(-2)
+        metrics.connect_finished(errno.ECONNREFUSED, 0.002)
+        metrics.outcome(STATE_CLOSED)
+        metrics.retry()
+
+        data = metrics.snapshot()
+        self.assertEqual(data['in_flight'], 1)
+        self.assertEqual(data['queue_depth'], 1)
+        self.assertEqual(data['errors'], {'ECONNREFUSED': 1})
+        self.assertEqual(data['outcomes']['closed'], 1)
+        self.assertEqual(data['retries'], 1)
+        self.assertEqual(data['latency']['count'], 1)
+
+    def test_prometheus_format(self):
+        metrics = ScanMetrics()
+        metrics.connect_started()
+        metrics.connect_finished('timeout')
+        metrics.outcome(STATE_OPEN)
+        text = metrics.render_prometheus()
+
+        self.assertIn('# TYPE portscan_results_total counter', text)
+        self.assertIn('portscan_results_total{state="open"} 1', text)
+        self.assertIn('portscan_connect_errors_total{errno="timeout"} 1', text)
+        self.assertIn('portscan_connect_latency_seconds_bucket{le="+Inf"} 0', text)
+        self.assertIn('portscan_in_flight 0', text)
+        self.assertTrue(text.endswith('\n'))
+
+    def test_stats_reporter_final_summary(self):
+        lines = []
+        reporter = StatsReporter(ScanMetrics(), interval=60, write=lines.append).start()
+        reporter.stop()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith('[stats]'))
+
+class TestScannerInstrumentation(unittest.TestCase):
+    """Tests des crochets des moteurs de scan"""
+
+    def check_engine(self, engine, **kwargs):
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        open_port = server.getsockname()[1]
+        ports = [open_port] + free_ports(9)
+        metrics = ScanMetrics()
+        try:
+            scanner = engine('127.0.0.1', ports, timeout=1, banner_grabbing=False,
+                             metrics=metrics, **kwargs)
+            results = scanner.scan(verbose=False)
+        finally:
+            server.close()
+
+        data = metrics.snapshot()
+        self.assertEqual(len(results['open_ports']), 1)
+        self.assertEqual(data['outcomes']['open'], 1)
+        self.assertEqual(data['outcomes']['closed'], 9)
+        self.assertEqual(data['connects'], 10)
+        self.assertEqual(data['errors'].get('ECONNREFUSED'), 9)
+        self.assertEqual(data['latency']['count'], 10)
+        self.assertEqual(data['in_flight'], 0)
+        self.assertEqual(data['queue_depth'], 0)
+
+    def test_thread_engine(self):
+        self.check_engine(PortScanner, threads=4)
+
+    def test_async_engine(self):
+        self.check_engine(AsyncPortScanner, concurrency=4)
+
+    def test_unexpected_error_recorded_filtered(self):
+        """Test qu'une erreur inattendue n'est pas prise pour un port fermé"""
+        metrics = ScanMetrics()
+        ports = free_ports(2)
+        scanner = PortScanner('127.0.0.1', ports, threads=1, metrics=metrics)
+        def failing_observe(host, rtt):
+            raise ValueError('estimation impossible')
+        scanner.observe_rtt = failing_observe
+        results = scanner.scan(verbose=False)
+
+        data = metrics.snapshot()
+        self.assertEqual(results['filtered_ports'], 2)
+        self.assertEqual(results['closed_ports'], 0)
+        self.assertEqual(data['errors'], {'ValueError': 2})
+        self.assertEqual(data['in_flight'], 0)
+
+    def test_cancelled_scan_drains_queue(self):
+        metrics = ScanMetrics()
+        scanner = PortScanner('127.0.0.1', list(range(1, 1001)), metrics=metrics)
+        scanner.cancel()
+        scanner.scan(verbose=False)
+        self.assertEqual(metrics.snapshot()['queue_depth'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
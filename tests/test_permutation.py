@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la permutation pseudo-aléatoire
+"""
+import unittest
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from permutation import FeistelPermutation
+
+class TestFeistelPermutation(unittest.TestCase):
+    """Tests de la permutation à mémoire constante"""
+
+    def test_bijection(self):
+        for size in (0, 1, 2, 3, 17, 1000, 4097):
+            permutation = FeistelPermutation(size, seed=size)
+            values = list(permutation)
+            self.assertEqual(len(values), size)
+            self.assertEqual(sorted(values), list(range(size)))
+
+    def test_random_access(self):
+        permutation = FeistelPermutation(500, seed=3)
+        self.assertEqual([permutation[i] for i in range(500)], list(permutation))
+        with self.assertRaises(IndexError):
+            permutation[500]
+
+    def test_seed(self):
+        self.assertEqual(list(FeistelPermutation(300, seed=1)), list(FeistelPermutation(300, seed=1)))
+        self.assertNotEqual(list(FeistelPermutation(300, seed=1)), list(FeistelPermutation(300, seed=2)))
+
+    def test_shuffled(self):
+        values = list(FeistelPermutation(10000, seed=5))
+        self.assertNotEqual(values, sorted(values))
+        # Les premiers indices couvrent toute la plage, pas seulement son début
+        self.assertGreater(max(values[:100]), 5000)
+
+if __name__ == '__main__':
+    unittest.main()
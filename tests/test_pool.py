@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le moteur de scan persistant
+"""
+import unittest
+import socket
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from pool import ScanPool
+from scanner import PortScanner
+from progress import CancelToken
+from tests.helpers import free_ports
+
+class TestScanPool(unittest.TestCase):
+    """Tests du pool de workers partagé"""
+
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(20)
+        self.open_port = self.server.getsockname()[1]
+        self.pool = ScanPool(threads=16, banner_concurrency=4)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.close()
+
+    def test_repeated_scans_reuse_workers(self):
+        ports = [self.open_port] + free_ports(30)
+        for _ in range(3):
+            results = self.pool.scan('127.0.0.1', ports, threads=8, timeout=1,
+                                     banner_timeout=0.05)
+            self.assertEqual([p['port'] for p in results['open_ports']], [self.open_port])
+            self.assertEqual(results['closed_ports'], 30)
+        stats = self.pool.stats()
+        self.assertEqual(stats['workers'], 8)
+        self.assertEqual(stats['idle'], 8)
+        self.assertEqual(stats['jobs'], 0)
+
+    def test_concurrent_jobs_independent_results(self):
+        first = [self.open_port] + free_ports(20)
+        second = free_ports(40)
+        futures = [self.pool.submit('127.0.0.1', first, threads=8, banner_grabbing=False),
+                   self.pool.submit('127.0.0.1', second, threads=8, banner_grabbing=False)]
+        results = [future.result(timeout=30) for future in futures]
+
+        self.assertEqual(len(results[0]['open_ports']), 1)
+        self.assertEqual(results[0]['total_ports'], 21)
+        self.assertEqual(results[1]['open_ports'], [])
+        self.assertEqual(results[1]['closed_ports'], 40)
+        self.assertLessEqual(self.pool.stats()['workers'], 16)
+
+    def test_rtt_estimates_kept_between_scans(self):
+        ports = free_ports(10)
+        first = PortScanner('127.0.0.1', ports, timeout=2, adaptive_timeout=True, pool=self.pool)
+        first.scan(verbose=False)
+        second = PortScanner('127.0.0.1', ports, timeout=2, adaptive_timeout=True, pool=self.pool)
+        # Le second scan démarre avec le timeout déjà ajusté par le premier
+        self.assertIs(second.rtt_estimators['127.0.0.1'], first.rtt_estimators['127.0.0.1'])
+        self.assertLess(second.get_timeout('127.0.0.1'), 2)
+
+    def test_cancelled_job_releases_workers(self):
+        token = CancelToken()
+        token.cancel()
+        results = self.pool.scan('127.0.0.1', list(range(1, 5001)), threads=8,
+                                 cancel_token=token)
+        self.assertTrue(results['cancelled'])
+        self.assertEqual(self.pool.stats()['jobs'], 0)
+
+    def test_failing_sink_keeps_workers_alive(self):
+        class FailingSink:
+            def write(self, host, port, state, banner):
+                raise RuntimeError("sink défaillant")
+
+            def flush(self):
+                pass
+
+        ports = free_ports(20)
+        scanner = PortScanner('127.0.0.1', ports, threads=4, timeout=1, pool=self.pool)
+        scanner.add_sink(FailingSink())
+        results = scanner.scan(verbose=False)
+        self.assertEqual(results['total_ports'], 20)
+        self.assertEqual(results['filtered_ports'], 20)
+
+        # Les workers ont survécu et servent le scan suivant
+        results = self.pool.scan('127.0.0.1', ports, threads=4, timeout=1)
+        self.assertEqual(results['closed_ports'], 20)
+        self.assertEqual(self.pool.stats()['workers'], 4)
+
+    def test_empty_scan(self):
+        results = self.pool.scan('127.0.0.1', [], threads=4)
+        self.assertEqual(results['total_ports'], 0)
+
+    def test_closed_pool_rejects_jobs(self):
+        self.pool.close()
+        with self.assertRaises(RuntimeError):
+            self.pool.submit('127.0.0.1', [80])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour l'annulation et le suivi de progression des scans
+"""
+import unittest
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from progress import CancelToken, ScanProgress
+from scanner import PortScanner
+from async_scanner import AsyncPortScanner
+from results import STATE_UNKNOWN
+
+class TestScanProgress(unittest.TestCase):
+    """Tests du callback de progression"""
+
+    def test_throttled_updates(self):
+        updates = []
+        progress = ScanProgress(1000, updates.append, interval=60, show_bar=False)
+        for _ in range(1000):
+            progress.update()
+        progress.found('127.0.0.1', 22, 'SSH-2.0')
+        progress.close()
+
+        # Une mise à jour immédiate, puis la mise à jour finale
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(updates[-1]['progress'], 1000)
+        self.assertEqual(updates[-1]['percentage'], 100.0)
+        self.assertEqual(updates[-1]['open_ports'],
+                         [{'host': '127.0.0.1', 'port': 22, 'banner': 'SSH-2.0'}])
+
+    def test_cancel_token(self):
+        token = CancelToken()
+        self.assertFalse(token.cancelled)
+        self.assertFalse(token.wait(0))
+        token.cancel()
+        self.assertTrue(token.cancelled)
+        self.assertTrue(token.wait(0))
+
+class TestScannerCancellation(unittest.TestCase):
+    """Tests de l'annulation d'un scan en cours"""
+
+    def setUp(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(('127.0.0.1', 0))
+        self.listener.listen(16)
+        self.open_port = self.listener.getsockname()[1]
+
+    def tearDown(self):
+        self.listener.close()
+
+    def test_progress_reports_open_ports(self):
+        updates = []
+        scanner = PortScanner('127.0.0.1', [self.open_port], timeout=0.5,
+                              banner_grabbing=False, on_progress=updates.append)
+        results = scanner.scan(verbose=False)
+        self.assertFalse(results['cancelled'])
+        self.assertEqual(updates[-1]['progress'], 1)
+        found = [port['port'] for update in updates for port in update['open_ports']]
+        self.assertEqual(found, [self.open_port])
+
+    def check_cancel(self, scanner_class, **options):
+        ports = list(range(20000, 40000))
+        token = CancelToken()
+
+        def on_progress(update):
+            if update['progress'] >= 50:
+                token.cancel()
+
+        scanner = scanner_class('127.0.0.1', ports, timeout=0.5, banner_grabbing=False,
+                                cancel_token=token, on_progress=on_progress,
+                                progress_interval=0, **options)
+        started = time.monotonic()
+        results = scanner.scan(verbose=False)
+        self.assertTrue(results['cancelled'])
+        self.assertLess(time.monotonic() - started, 10)
+        table = scanner.store.table('127.0.0.1')
+        unscanned = sum(1 for port in ports if table.get(port) == STATE_UNKNOWN)
+        self.assertGreater(unscanned, 0)
+
+    def test_cancel_thread_engine(self):
+        self.check_cancel(PortScanner, threads=4)
+
+    def test_cancel_async_engine(self):
+        self.check_cancel(AsyncPortScanner, concurrency=10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la limitation de cadence
+"""
+import unittest
+import time
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from rate_limiter import TokenBucket, AimdController
+from scanner import PortScanner
+from tests.helpers import free_ports
+
+class TestTokenBucket(unittest.TestCase):
+    """Tests pour le seau à jetons"""
+
+    def test_burst_then_paced(self):
+        """Test que la rafale initiale est immédiate puis que les appels sont espacés"""
+        bucket = TokenBucket(rate=100, burst=5)
+        delays = [bucket.reserve() for _ in range(10)]
+        self.assertEqual(delays[:5], [0.0] * 5)
+        self.assertAlmostEqual(delays[9], 0.05, delta=0.01)
+
+    def test_acquire_rate(self):
+        """Test que acquire() respecte la cadence"""
+        bucket = TokenBucket(rate=200, burst=1)
+        started = time.monotonic()
+        for _ in range(21):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+class TestAimdController(unittest.TestCase):
+    """Tests pour le contrôle AIMD"""
+
+    def test_backoff_and_ramp_up(self):
+        """Test de la réduction sur timeouts puis de la remontée"""
+        bucket = TokenBucket(rate=100)
+        controller = AimdController(bucket, min_rate=10, max_rate=100, window=10,
+                                    threshold=0.3, increase=20)
+        for _ in range(10):
+            controller.observe(True)
+        self.assertEqual(controller.rate, 50)
+        for _ in range(30):
+            controller.observe(True)
+        self.assertEqual(controller.rate, 10)
+        for _ in range(10):
+            controller.observe(False)
+        self.assertEqual(controller.rate, 30)
+        for _ in range(100):
+            controller.observe(False)
+        self.assertEqual(controller.rate, 100)
+
+    def test_scanner_max_rate(self):
+        """Test que le scanner respecte --max-rate"""
+        scanner = PortScanner('127.0.0.1', free_ports(30), timeout=0.5,
+                              threads=10, max_rate=100)
+        self.assertEqual(scanner.rate_controller.min_rate, 5)
+        results = scanner.scan(verbose=False)
+        self.assertGreaterEqual(results['duration'], 0.15)
+        self.assertEqual(results['closed_ports'], 30)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le registre des services
+"""
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from registry import ServiceRegistry, DEFAULT_REGISTRY, compile_registry, parse_registry
+from port_db import PORT_RANGES, DANGEROUS_PORTS, get_port_info, get_top_ports, get_registry
+
+class TestServiceRegistry(unittest.TestCase):
+    """Tests pour ServiceRegistry"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(fd, 'w') as f:
+            f.write("# commentaire\n"
+                    "ssh      22/tcp   2   # SSH\n"
+                    "http     80/tcp   1\n"
+                    "domain   53/udp   1\n"
+                    "domain   53/tcp\n"
+                    "unknown  49152/tcp  3\n"
+                    "invalide 70000/tcp\n")
+        self.registry = ServiceRegistry(PORT_RANGES, DANGEROUS_PORTS, self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_lookup(self):
+        self.assertEqual(self.registry.service(22), 'ssh')
+        self.assertEqual(self.registry.service(53, 'udp'), 'domain')
+        self.assertIsNone(self.registry.service(22, 'udp'))
+        self.assertIsNone(self.registry.service(49152))
+
+    def test_categories_and_danger(self):
+        self.assertEqual(self.registry.category(0), 'well-known')
+        self.assertEqual(self.registry.category(1023), 'well-known')
+        self.assertEqual(self.registry.category(1024), 'registered')
+        self.assertEqual(self.registry.category(65535), 'dynamic')
+        self.assertTrue(self.registry.is_dangerous(3389))
+        self.assertFalse(self.registry.is_dangerous(22))
+
+    def test_top_ports(self):
+        """Test du classement, limité aux ports classés"""
+        self.assertEqual(self.registry.top_ports(2), [80, 22])
+        self.assertEqual(self.registry.top_ports(5), [80, 22, 49152])
+        self.assertEqual(self.registry.ranked_count(), 3)
+        self.assertEqual(self.registry.top_ports(1, 'udp'), [53])
+
+    def test_compiled_registry(self):
+        """Test du registre précompilé, projeté en mémoire tant qu'il est à jour"""
+        self.assertFalse(self.registry.memory_mapped)
+        compiled = compile_registry(self.path)
+        try:
+            registry = ServiceRegistry(PORT_RANGES, DANGEROUS_PORTS, self.path)
+            self.assertTrue(registry.memory_mapped)
+            self.assertEqual(registry.service(22), 'ssh')
+            self.assertEqual(registry.service(53, 'udp'), 'domain')
+            self.assertIsNone(registry.service(49152))
+            self.assertEqual(registry.top_ports(5), [80, 22, 49152])
+
+            # Texte modifié après la compilation: le fichier compilé est ignoré
+            with open(self.path, 'a') as f:
+                f.write("telnet   23/tcp   4\n")
+            registry = ServiceRegistry(PORT_RANGES, DANGEROUS_PORTS, self.path)
+            self.assertFalse(registry.memory_mapped)
+            self.assertEqual(registry.top_ports(5), [80, 22, 49152, 23])
+        finally:
+            os.remove(compiled)
+
+class TestBundledRegistry(unittest.TestCase):
+    """Tests du registre fourni avec le projet"""
+
+    def test_port_info(self):
+        self.assertEqual(get_port_info(22)['service'], 'SSH')
+        self.assertEqual(get_port_info(873)['service'], 'rsync')
+        self.assertEqual(get_port_info(161, protocol='udp')['service'], 'snmp')
+        self.assertEqual(get_port_info(60000)['service'], 'Unknown')
+
+    def test_top_ports(self):
+        top = get_top_ports(1000)
+        self.assertEqual(len(top), 1000)
+        self.assertEqual(len(set(top)), 1000)
+        self.assertEqual(top[:3], [80, 23, 443])
+        self.assertEqual(get_top_ports(10), top[:10])
+        self.assertEqual(len(get_top_ports(100, 'udp')), 100)
+
+    def test_compiled_registry_up_to_date(self):
+        """Test que services.bin correspond à services.txt (python src/registry.py)"""
+        registry = get_registry()
+        self.assertTrue(registry.memory_mapped)
+        names, tables, ranked = parse_registry(DEFAULT_REGISTRY)
+        self.assertEqual(registry.ranked, ranked)
+        for protocol in ('tcp', 'udp'):
+            self.assertEqual(bytes(registry.tables[protocol]), tables[protocol].tobytes())
+
+    def test_loaded_once(self):
+        self.assertIs(get_registry(), get_registry())
+
+if __name__ == '__main__':
+    unittest.main()
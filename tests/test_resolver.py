@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le résolveur DNS
+"""
+import unittest
+import socket
+import sys
+import threading
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from resolver import DnsResolver, address_family
+from scanner import PortScanner
+
+class CountingResolver(DnsResolver):
+    """Résolveur factice qui compte les requêtes système"""
+
+    def __init__(self, answers, **kwargs):
+        super().__init__(**kwargs)
+        self.answers = answers
+        self.lookups = []
+        self.lookup_lock = threading.Lock()
+
+    def _lookup(self, name):
+        with self.lookup_lock:
+            self.lookups.append(name)
+        return list(self.answers.get(name, []))
+
+class TestDnsResolver(unittest.TestCase):
+    """Tests pour DnsResolver"""
+
+    def test_literal_addresses(self):
+        """Test que les adresses littérales ne sont pas résolues"""
+        resolver = CountingResolver({})
+        self.assertEqual(resolver.resolve('127.0.0.1'), '127.0.0.1')
+        self.assertEqual(resolver.resolve('::1'), '::1')
+        self.assertEqual(resolver.lookups, [])
+
+    def test_positive_and_negative_cache(self):
+        """Test que succès et échecs sont mis en cache"""
+        resolver = CountingResolver({'exemple.test': ['10.0.0.1']})
+        self.assertEqual(resolver.resolve('exemple.test'), '10.0.0.1')
+        self.assertEqual(resolver.resolve('EXEMPLE.test'), '10.0.0.1')
+        self.assertIsNone(resolver.resolve('absent.test'))
+        self.assertIsNone(resolver.resolve('absent.test'))
+        self.assertEqual(resolver.lookups, ['exemple.test', 'absent.test'])
+
+    def test_ttl_expiry(self):
+        """Test qu'une entrée expirée est résolue à nouveau"""
+        resolver = CountingResolver({'exemple.test': ['10.0.0.1']}, ttl=0, negative_ttl=0)
+        resolver.resolve('exemple.test')
+        resolver.resolve('exemple.test')
+        self.assertEqual(len(resolver.lookups), 2)
+
+    def test_lru_eviction(self):
+        """Test que le cache reste borné"""
+        resolver = CountingResolver({}, max_entries=2)
+        for name in ('a.test', 'b.test', 'c.test'):
+            resolver.resolve(name)
+        self.assertEqual(list(resolver.cache), ['b.test', 'c.test'])
+
+    def test_resolve_many(self):
+        """Test de la résolution groupée"""
+        resolver = CountingResolver({'a.test': ['10.0.0.1'], 'b.test': ['fd00::2']})
+        result = resolver.resolve_many(['a.test', '10.0.0.9', 'b.test', 'c.test', 'a.test'])
+        self.assertEqual(result, {
+            'a.test': '10.0.0.1', '10.0.0.9': '10.0.0.9',
+            'b.test': 'fd00::2', 'c.test': None
+        })
+        self.assertEqual(sorted(resolver.lookups), ['a.test', 'b.test', 'c.test'])
+
+    def test_system_lookup(self):
+        """Test de la résolution réelle de localhost"""
+        self.assertIn(DnsResolver().resolve('localhost'), ('127.0.0.1', '::1'))
+
+class TestIpv6Scan(unittest.TestCase):
+    """Tests du scan d'une cible IPv6"""
+
+    def test_address_family(self):
+        self.assertEqual(address_family('10.0.0.1'), socket.AF_INET)
+        self.assertEqual(address_family('::1'), socket.AF_INET6)
+
+    @unittest.skipUnless(socket.has_ipv6, "IPv6 non disponible")
+    def test_scan_ipv6_loopback(self):
+        """Test du scan d'un port ouvert sur ::1"""
+        try:
+            server = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+            server.bind(('::1', 0))
+        except OSError:
+            self.skipTest("Boucle locale IPv6 non disponible")
+        server.listen(5)
+        port = server.getsockname()[1]
+        try:
+            scanner = PortScanner('::1', [port], timeout=0.5, threads=1)
+            scanner.scan()
+            self.assertEqual([p['port'] for p in scanner.get_results()['open_ports']], [port])
+        finally:
+            server.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le stockage compact des résultats
+"""
+import unittest
+import threading
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from results import (
+    ScanResultStore, HostStateTable, parse_state,
+    STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+)
+from scanner import PortScanner
+
+class TestHostStateTable(unittest.TestCase):
+    """Tests pour la table d'états d'un hôte"""
+
+    def test_set_and_count(self):
+        """Test de l'enregistrement et du comptage des états"""
+        table = HostStateTable()
+        table.set(22, STATE_OPEN, 'SSH-2.0')
+        table.set(23, STATE_CLOSED)
+        table.set(65535, STATE_FILTERED)
+        self.assertEqual(len(table.states), 65536)
+        self.assertEqual(table.count(STATE_OPEN), 1)
+        self.assertEqual(list(table.ports(STATE_FILTERED)), [65535])
+        self.assertEqual(table.banners, {22: 'SSH-2.0'})
+
+    def test_state_overwrite_drops_banner(self):
+        """Test qu'un port qui n'est plus ouvert perd sa bannière"""
+        table = HostStateTable()
+        table.set(80, STATE_OPEN, 'nginx')
+        table.set(80, STATE_FILTERED)
+        self.assertEqual(table.banners, {})
+
+class TestScanResultStore(unittest.TestCase):
+    """Tests pour la fusion des tampons des workers"""
+
+    def test_merge_from_threads(self):
+        """Test de la fusion des écritures de plusieurs threads"""
+        store = ScanResultStore(['10.0.0.1', '10.0.0.2'])
+
+        def work(offset):
+            for port in range(offset, 1000, 4):
+                store.record('10.0.0.1', port + 1, STATE_CLOSED)
+                store.record('10.0.0.2', port + 1, STATE_FILTERED)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.record('10.0.0.1', 443, STATE_OPEN, 'TLS')
+        store.merge()
+
+        self.assertEqual(store.count('closed'), 999)
+        self.assertEqual(store.count('filtered', '10.0.0.2'), 1000)
+        self.assertEqual(store.open_ports(),
+                         [{'host': '10.0.0.1', 'port': 443, 'banner': 'TLS'}])
+        self.assertEqual(store.ports_by_state('open'), [('10.0.0.1', 443)])
+
+    def test_tables_sized_to_ports(self):
+        """Test que les tables ne couvrent que les ports du scan"""
+        store = ScanResultStore(['10.0.0.1', '10.0.0.2'], [443, 22, 80])
+        self.assertEqual(len(store.table('10.0.0.1').states), 3)
+        store.record('10.0.0.1', 443, STATE_OPEN, 'TLS')
+        store.record('10.0.0.1', 22, STATE_CLOSED)
+        store.record('10.0.0.2', 8080, STATE_OPEN)
+        store.merge()
+
+        table = store.table('10.0.0.1')
+        self.assertEqual(table.get(443), STATE_OPEN)
+        self.assertEqual(table.get(8080), 0)
+        self.assertEqual(list(table.ports(STATE_CLOSED)), [22])
+        self.assertEqual(store.open_ports(),
+                         [{'host': '10.0.0.1', 'port': 443, 'banner': 'TLS'}])
+        # Tous les ports: table directe de 65536 octets
+        full = ScanResultStore(['10.0.0.1'], range(65536))
+        self.assertEqual(len(full.table('10.0.0.1').states), 65536)
+
+    def test_parse_state(self):
+        """Test de conversion des noms d'états"""
+        self.assertEqual(parse_state('open'), STATE_OPEN)
+        self.assertEqual(parse_state(STATE_CLOSED), STATE_CLOSED)
+        with self.assertRaises(ValueError):
+            parse_state('inconnu')
+
+    def test_scanner_ports_by_state(self):
+        """Test de l'API de requête par état du scanner"""
+        scanner = PortScanner('127.0.0.1', [40001, 40002], timeout=0.5, threads=2)
+        scanner.scan(verbose=False)
+        self.assertEqual(scanner.get_ports_by_state('closed', '127.0.0.1'), [40001, 40002])
+        self.assertEqual(scanner.get_ports_by_state('open'), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,8 +10,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from scanner import PortScanner
+from rtt import RttEstimator
+from results import STATE_FILTERED
 from port_db import get_port_info, get_common_ports_list
-from utils import validate_ip, validate_port_range, resolve_hostname
+from utils import validate_ip, validate_port_range, resolve_hostname, parse_targets
 
 class TestPortDatabase(unittest.TestCase):
     """Tests pour la base de données des ports"""
@@ -32,8 +34,8 @@ class TestPortDatabase(unittest.TestCase):
     
     def test_get_port_info_unknown_port(self):
         """Test avec un port inconnu"""
-        info = get_port_info(12345)
-        self.assertEqual(info['port'], 12345)
+        info = get_port_info(12346)
+        self.assertEqual(info['port'], 12346)
         self.assertEqual(info['service'], 'Unknown')
         self.assertFalse(info['is_dangerous'])
     
@@ -88,6 +90,36 @@ class TestUtils(unittest.TestCase):
         self.assertIsNone(validate_port_range('invalid'))
         self.assertIsNone(validate_port_range('70000'))
     
+    def test_parse_targets_cidr(self):
+        """Test de parsing d'un bloc CIDR"""
+        targets = parse_targets('192.168.1.0/30')
+        self.assertEqual(targets, ['192.168.1.1', '192.168.1.2'])
+    
+    def test_parse_targets_ranges(self):
+        """Test de parsing des plages d'adresses"""
+        self.assertEqual(parse_targets('10.0.0.1-3'), ['10.0.0.1', '10.0.0.2', '10.0.0.3'])
+        self.assertEqual(parse_targets('10.0.0.254-10.0.1.1'),
+                         ['10.0.0.254', '10.0.0.255', '10.0.1.0', '10.0.1.1'])
+        self.assertEqual(parse_targets('mon-serveur.local'), ['mon-serveur.local'])
+    
+    def test_parse_targets_list_and_file(self):
+        """Test de parsing d'une liste et d'un fichier de cibles"""
+        import tempfile
+        import os
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("# Cibles\n10.0.0.5\nlocalhost  # commentaire\n\n10.0.0.1\n")
+        try:
+            targets = parse_targets(f'10.0.0.1, @{f.name}')
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(targets, ['10.0.0.1', '10.0.0.5', 'localhost'])
+    
+    def test_parse_targets_invalid(self):
+        """Test de parsing invalide"""
+        self.assertIsNone(parse_targets('10.0.0.5-1'))
+        self.assertIsNone(parse_targets('10.0.0.0/8'))
+        self.assertIsNone(parse_targets('@fichier-inexistant.txt'))
+    
     def test_resolve_hostname(self):
         """Test de résolution de hostname"""
         ip = resolve_hostname('localhost')
@@ -128,6 +160,174 @@ class TestPortScanner(unittest.TestCase):
         for key in required_keys:
             self.assertIn(key, results)
 
+    def test_scan_multiple_targets(self):
+        """Test de scan multi-cibles avec résultats par hôte"""
+        import socket
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(8)
+        port = server.getsockname()[1]
+        try:
+            scanner = PortScanner(['127.0.0.1', '127.0.0.2'], [port], timeout=0.5, threads=4)
+            results = scanner.scan(verbose=False)
+        finally:
+            server.close()
+        
+        self.assertEqual(results['total_ports'], 2)
+        self.assertEqual(set(results['hosts']), {'127.0.0.1', '127.0.0.2'})
+        self.assertEqual(results['hosts']['127.0.0.1']['open_ports'][0]['port'], port)
+        self.assertEqual(results['hosts']['127.0.0.2']['open_ports'], [])
+        self.assertEqual(results['hosts']['127.0.0.2']['total_ports'], 1)
+        self.assertEqual(results['open_ports'][0]['host'], '127.0.0.1')
+    
+    def test_work_items_interleave_hosts(self):
+        """Test que les paires (hôte, port) alternent entre les hôtes"""
+        scanner = PortScanner(['10.0.0.1', '10.0.0.2'], [80, 443], randomize=False)
+        self.assertEqual(list(scanner.work_items()), [
+            ('10.0.0.1', 80), ('10.0.0.2', 80), ('10.0.0.1', 443), ('10.0.0.2', 443)
+        ])
+    
+    def test_work_items_randomized(self):
+        """Test que l'ordre pseudo-aléatoire couvre chaque paire une seule fois"""
+        hosts = ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+        ports = list(range(1, 201))
+        scanner = PortScanner(hosts, ports, seed=7)
+        items = list(scanner.work_items())
+        self.assertEqual(len(items), 600)
+        self.assertEqual(set(items), {(host, port) for port in ports for host in hosts})
+        self.assertNotEqual(items, list(PortScanner(hosts, ports, randomize=False).work_items()))
+        self.assertEqual(items, list(PortScanner(hosts, ports, seed=7).work_items()))
+
+    def test_adaptive_timeout_per_target(self):
+        """Test que le timeout adaptatif baisse sur une cible réactive"""
+        scanner = PortScanner(['127.0.0.1', '127.0.0.2'], list(range(40000, 40020)),
+                              timeout=2, threads=4, adaptive_timeout=True,
+                              min_timeout=0.05, max_timeout=3)
+        self.assertEqual(scanner.get_timeout('127.0.0.1'), 2)
+        scanner.scan(verbose=False)
+        self.assertLess(scanner.get_timeout('127.0.0.1'), 2)
+        self.assertGreaterEqual(scanner.get_timeout('127.0.0.1'), 0.05)
+        self.assertIsNot(scanner.rtt_estimators['127.0.0.1'], scanner.rtt_estimators['127.0.0.2'])
+    
+    def test_fixed_timeout_by_default(self):
+        """Test que le timeout reste fixe sans option adaptative"""
+        scanner = PortScanner('127.0.0.1', [12345], timeout=0.7)
+        scanner.observe_rtt('127.0.0.1', 0.001)
+        self.assertEqual(scanner.get_timeout('127.0.0.1'), 0.7)
+
+class LossyScanner(PortScanner):
+    """Scanner dont la première sonde vers certains ports est perdue"""
+    
+    def __init__(self, *args, lost=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lost = set(lost)
+        self.attempts = {}
+        self.retry_timeouts = []
+    
+    def scan_port(self, port, host=None):
+        host = host or self.targets[0]
+        self.attempts[(host, port)] = self.attempts.get((host, port), 0) + 1
+        if self.retry_items is not None:
+            self.retry_timeouts.append(self.get_timeout(host))
+        if (host, port) in self.lost and self.attempts[(host, port)] == 1:
+            self.record(host, port, STATE_FILTERED)
+            return
+        super().scan_port(port, host)
+
+class TestRetryPass(unittest.TestCase):
+    """Tests de la passe de relance des ports filtrés"""
+    
+    def test_lost_probes_retried(self):
+        """Test que les sondes perdues sont relancées avec un timeout plus long"""
+        lost = [('127.0.0.1', 1), ('127.0.0.1', 2)]
+        scanner = LossyScanner('127.0.0.1', list(range(1, 11)), timeout=0.5, threads=4,
+                               banner_grabbing=False, retry_passes=1, lost=lost)
+        results = scanner.scan(verbose=False)
+        
+        self.assertEqual(results['filtered_ports'], 0)
+        self.assertEqual(results['closed_ports'], 10)
+        self.assertEqual(results['retried_ports'], 2)
+        self.assertEqual(scanner.attempts[lost[0]], 2)
+        self.assertEqual(scanner.attempts[('127.0.0.1', 3)], 1)
+        self.assertEqual(scanner.retry_timeouts, [1.0, 1.0])
+        # Timeout et cadence rétablis après la relance
+        self.assertEqual(scanner.get_timeout('127.0.0.1'), 0.5)
+        self.assertIsNone(scanner.rate_limiter)
+    
+    def test_no_retry_by_default(self):
+        """Test que les ports filtrés restent filtrés sans passe de relance"""
+        scanner = LossyScanner('127.0.0.1', [1, 2, 3], timeout=0.5, banner_grabbing=False,
+                               lost=[('127.0.0.1', 1)])
+        results = scanner.scan(verbose=False)
+        self.assertEqual(results['filtered_ports'], 1)
+        self.assertEqual(results['retried_ports'], 0)
+    
+    def test_firewalled_host_not_retried(self):
+        """Test qu'un hôte majoritairement filtré (pare-feu) n'est pas relancé"""
+        lost = [('127.0.0.1', port) for port in range(1, 9)]
+        scanner = LossyScanner('127.0.0.1', list(range(1, 11)), timeout=0.5,
+                               banner_grabbing=False, retry_passes=2, lost=lost)
+        results = scanner.scan(verbose=False)
+        self.assertEqual(results['filtered_ports'], 8)
+        self.assertEqual(results['retried_ports'], 0)
+    
+    def test_rate_reduced_during_retry(self):
+        """Test que la cadence imposée est réduite pendant la relance puis rétablie"""
+        rates = []
+        
+        controllers = []
+        
+        class RateProbe(LossyScanner):
+            def scan_port(self, port, host=None):
+                if self.retry_items is not None:
+                    rates.append(self.rate_limiter.rate)
+                    controllers.append(self.rate_controller)
+                super().scan_port(port, host)
+        
+        scanner = RateProbe('127.0.0.1', list(range(1, 11)), timeout=0.5, max_rate=1000,
+                            banner_grabbing=False, retry_passes=1, lost=[('127.0.0.1', 5)])
+        scanner.scan(verbose=False)
+        self.assertEqual(rates, [500.0])
+        # AIMD suspendu pendant la relance, rétabli ensuite
+        self.assertEqual(controllers, [None])
+        self.assertIsNotNone(scanner.rate_controller)
+        self.assertEqual(scanner.rate_limiter.rate, 1000.0)
+
+class TestRttEstimator(unittest.TestCase):
+    """Tests pour l'estimation du RTT"""
+    
+    def test_initial_timeout(self):
+        """Test du timeout initial avant toute mesure"""
+        self.assertEqual(RttEstimator(1.0).timeout(), 1.0)
+        self.assertEqual(RttEstimator(10.0, max_timeout=3.0).timeout(), 3.0)
+    
+    def test_first_sample(self):
+        """Test du RTO après une première mesure (SRTT + 4 * RTT/2)"""
+        estimator = RttEstimator(1.0, min_timeout=0.01, max_timeout=3.0)
+        estimator.observe(0.1)
+        self.assertAlmostEqual(estimator.timeout(), 0.3)
+    
+    def test_bounds(self):
+        """Test du plancher et du plafond"""
+        fast = RttEstimator(1.0, min_timeout=0.05, max_timeout=3.0)
+        for _ in range(20):
+            fast.observe(0.0001)
+        self.assertEqual(fast.timeout(), 0.05)
+        
+        slow = RttEstimator(1.0, min_timeout=0.05, max_timeout=3.0)
+        slow.observe(2.5)
+        self.assertEqual(slow.timeout(), 3.0)
+    
+    def test_variance_increases_timeout(self):
+        """Test qu'une forte variance augmente le timeout"""
+        stable = RttEstimator(1.0, min_timeout=0.001)
+        jittery = RttEstimator(1.0, min_timeout=0.001)
+        for rtt in [0.05] * 10:
+            stable.observe(rtt)
+        for rtt in [0.01, 0.09] * 5:
+            jittery.observe(rtt)
+        self.assertGreater(jittery.timeout(), stable.timeout())
+
 class TestReporter(unittest.TestCase):
     """Tests pour le générateur de rapports"""
     
@@ -165,6 +365,33 @@ class TestReporter(unittest.TestCase):
         except:
             success = False
         self.assertTrue(success)
+    
+    def test_multi_target_json_report(self):
+        """Test du rapport JSON consolidé multi-cibles"""
+        import json
+        import tempfile
+        import os
+        from reporter import Reporter
+        host_a = dict(self.mock_results, target='10.0.0.1', total_ports=5,
+                      open_ports=[{'host': '10.0.0.1', 'port': 22, 'banner': 'SSH-2.0'}],
+                      closed_ports=4, filtered_ports=0)
+        host_b = dict(self.mock_results, target='10.0.0.2', total_ports=5,
+                      open_ports=[], closed_ports=3, filtered_ports=2)
+        results = dict(self.mock_results, target='2 hôtes',
+                       open_ports=host_a['open_ports'], closed_ports=7, filtered_ports=2,
+                       hosts={'10.0.0.1': host_a, '10.0.0.2': host_b})
+        
+        reporter = Reporter(results)
+        self.assertTrue(reporter.is_multi_target())
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, 'rapport.json')
+            reporter.generate_json_report(filename)
+            with open(filename, encoding='utf-8') as f:
+                data = json.load(f)
+        
+        self.assertEqual(data['statistics']['hosts_count'], 2)
+        self.assertEqual([h['target'] for h in data['hosts']], ['10.0.0.1', '10.0.0.2'])
+        self.assertEqual(data['hosts'][0]['open_ports'][0]['service'], 'SSH')
 
 def run_tests():
     """Lance tous les tests"""
@@ -175,6 +402,8 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestPortDatabase))
     suite.addTests(loader.loadTestsFromTestCase(TestUtils))
     suite.addTests(loader.loadTestsFromTestCase(TestPortScanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestRetryPass))
+    suite.addTests(loader.loadTestsFromTestCase(TestRttEstimator))
     suite.addTests(loader.loadTestsFromTestCase(TestReporter))
     
     # Lancer les tests
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le scan réparti sur plusieurs processus
+"""
+import unittest
+import socket
+import sys
+import tempfile
+import os
+import queue
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from sharding import ShardedScanner, QueueSink, shard_work
+from scanner import PortScanner
+from engines import create_scanner
+from checkpoint import CheckpointWriter
+from metrics import ScanMetrics
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+
+class TestShardWork(unittest.TestCase):
+    """Tests du découpage du travail"""
+
+    def test_ports_split(self):
+        shards = shard_work(['h1', 'h2'], list(range(1, 11)), 3)
+        self.assertEqual(len(shards), 3)
+        for targets, _ in shards:
+            self.assertEqual(targets, ['h1', 'h2'])
+        ports = sorted(port for _, shard_ports in shards for port in shard_ports)
+        self.assertEqual(ports, list(range(1, 11)))
+
+    def test_hosts_split(self):
+        # Moins de ports que de processus: répartir les cibles
+        shards = shard_work(['h1', 'h2', 'h3', 'h4'], [80], 2)
+        self.assertEqual(shards, [(['h1', 'h3'], [80]), (['h2', 'h4'], [80])])
+
+    def test_empty_shards_dropped(self):
+        shards = shard_work(['h1'], [22, 80], 4)
+        self.assertEqual(len(shards), 2)
+
+class TestShardedScanner(unittest.TestCase):
+    """Tests du scan réparti sur des ports locaux"""
+
+    def setUp(self):
+        self.listeners = []
+        for _ in range(3):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(('127.0.0.1', 0))
+            sock.listen(16)
+            self.listeners.append(sock)
+        self.open_ports = sorted(sock.getsockname()[1] for sock in self.listeners)
+        self.closed_ports = []
+        for _ in range(5):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(('127.0.0.1', 0))
+            self.closed_ports.append(sock.getsockname()[1])
+            sock.close()
+
+    def tearDown(self):
+        for sock in self.listeners:
+            sock.close()
+
+    def test_create_scanner(self):
+        scanner = create_scanner('thread', '127.0.0.1', [80], workers=2)
+        self.assertIsInstance(scanner, ShardedScanner)
+        scanner = create_scanner('thread', '127.0.0.1', [80], workers=1)
+        self.assertNotIsInstance(scanner, ShardedScanner)
+
+    def test_merged_results(self):
+        ports = self.open_ports + self.closed_ports
+        scanner = create_scanner('thread', '127.0.0.1', ports, timeout=0.5, threads=4,
+                                 workers=2, banner_grabbing=False)
+        results = scanner.scan(verbose=False)
+
+        self.assertEqual(results['total_ports'], len(ports))
+        self.assertEqual(sorted(p['port'] for p in results['open_ports']), self.open_ports)
+        self.assertEqual(results['closed_ports'], len(self.closed_ports))
+        self.assertEqual(results['hosts']['127.0.0.1']['closed_ports'], len(self.closed_ports))
+        self.assertEqual(scanner.engine, 'thread')
+
+    def test_retried_counts_summed(self):
+        """Test que les relances des processus remontent dans le parent"""
+        class Progress:
+            def update(self, count):
+                pass
+
+        metrics = ScanMetrics()
+        scanner = ShardedScanner('127.0.0.1', [22, 80], workers=2, metrics=metrics)
+        result_queue = queue.Queue()
+        result_queue.put(('batch', [('127.0.0.1', 22, STATE_CLOSED, None)]))
+        result_queue.put(('done', 0, 'thread', 3))
+        result_queue.put(('batch', [('127.0.0.1', 80, STATE_CLOSED, None)]))
+        result_queue.put(('done', 1, 'thread', 2))
+        scanner._collect(result_queue, {0: None, 1: None}, Progress())
+
+        self.assertEqual(scanner.retried_count, 5)
+        self.assertEqual(metrics.snapshot()['retries'], 5)
+
+    def test_retried_pairs_sent_once(self):
+        """Test que le parent ne reçoit que l'état final des paires relancées"""
+        result_queue = queue.Queue()
+        scanner = PortScanner('127.0.0.1', [21, 22, 23, 80])
+        sink = QueueSink(result_queue, hold_filtered=True)
+        scanner.add_sink(sink)
+        scanner.record('127.0.0.1', 21, STATE_CLOSED)
+        for port in (22, 23, 80):
+            scanner.record('127.0.0.1', port, STATE_FILTERED)
+        # Passe de relance: 22 répond, 23 reste filtré, 80 s'ouvre
+        scanner.record('127.0.0.1', 22, STATE_CLOSED)
+        scanner.record('127.0.0.1', 23, STATE_FILTERED)
+        scanner.record('127.0.0.1', 80, STATE_OPEN, 'banner')
+        sink.release_filtered(scanner)
+        sink.close()
+
+        received = []
+        while not result_queue.empty():
+            received.extend(result_queue.get()[1])
+        self.assertEqual(sorted(received), [
+            ('127.0.0.1', 21, STATE_CLOSED, None),
+            ('127.0.0.1', 22, STATE_CLOSED, None),
+            ('127.0.0.1', 23, STATE_FILTERED, None),
+            ('127.0.0.1', 80, STATE_OPEN, 'banner')
+        ])
+
+    def test_sinks_receive_all_results(self):
+        ports = self.open_ports + self.closed_ports
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'scan.ckpt')
+            scanner = create_scanner('async', '127.0.0.1', ports, timeout=0.5,
+                                     workers=2, banner_grabbing=False)
+            writer = CheckpointWriter(path)
+            scanner.add_sink(writer)
+            scanner.scan(verbose=False)
+            writer.close()
+
+            # Reprise: tout a déjà été scanné
+            resumed = create_scanner('async', '127.0.0.1', ports, workers=2)
+            self.assertEqual(resumed.resume_from(path), len(ports))
+            self.assertEqual(resumed.remaining_ports(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
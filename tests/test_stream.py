@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour la sortie NDJSON en flux
+"""
+import unittest
+import io
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from stream import NdjsonSink
+from results import STATE_OPEN, STATE_CLOSED, STATE_FILTERED
+from scanner import PortScanner
+
+class TestNdjsonSink(unittest.TestCase):
+    """Tests pour le sink NDJSON"""
+
+    def test_open_ports_and_summaries(self):
+        """Test des enregistrements de ports et des résumés"""
+        output = io.StringIO()
+        sink = NdjsonSink(output, include_summaries=True, interval=60)
+        sink.write('10.0.0.1', 22, STATE_OPEN, 'SSH-2.0')
+        sink.write('10.0.0.1', 23, STATE_CLOSED)
+        sink.write('10.0.0.2', 80, STATE_FILTERED)
+        sink.flush()
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(records[0]['type'], 'port')
+        self.assertEqual(records[0]['service'], 'SSH')
+        self.assertEqual(records[0]['banner'], 'SSH-2.0')
+        summaries = {r['host']: r for r in records if r['type'] == 'summary'}
+        self.assertEqual(summaries['10.0.0.1']['closed'], 1)
+        self.assertEqual(summaries['10.0.0.2']['filtered'], 1)
+        sink.close()
+
+    def test_batch_size_triggers_write(self):
+        """Test qu'un lot plein est écrit sans attendre l'intervalle"""
+        output = io.StringIO()
+        sink = NdjsonSink(output, interval=60, batch_size=2)
+        sink.write('10.0.0.1', 80, STATE_OPEN, '')
+        sink.write('10.0.0.1', 443, STATE_OPEN, '')
+        for _ in range(100):
+            if len(output.getvalue().splitlines()) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(output.getvalue().splitlines()), 2)
+        sink.close()
+
+    def test_streams_during_scan(self):
+        """Test du flux branché sur un scan réel"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(8)
+        port = server.getsockname()[1]
+        output = io.StringIO()
+        try:
+            scanner = PortScanner('127.0.0.1', [port, 40301], timeout=0.5, threads=2)
+            sink = NdjsonSink(output)
+            scanner.add_sink(sink)
+            scanner.scan(verbose=False)
+            sink.close()
+        finally:
+            server.close()
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([(r['host'], r['port']) for r in records], [('127.0.0.1', port)])
+
+if __name__ == '__main__':
+    unittest.main()
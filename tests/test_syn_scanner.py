@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le scan SYN
+
+Les tests de scan réel nécessitent CAP_NET_RAW. Sans privilèges, ils peuvent
+être lancés dans un espace de noms réseau:
+    unshare -rn sh -c 'ip link set lo up && python -m pytest tests/test_syn_scanner.py'
+"""
+import unittest
+import socket
+import struct
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from scanner import PortScanner
+from syn_scanner import (
+    SynScanner, build_syn_packet, checksum, parse_tcp_reply,
+    has_raw_socket_capability, TCP_SYN
+)
+from engines import create_scanner
+
+class TestSynPackets(unittest.TestCase):
+    """Tests de construction et de décodage des paquets"""
+
+    def test_syn_packet_checksum(self):
+        """Test que la somme de contrôle du segment est valide"""
+        packet = build_syn_packet('10.0.0.1', '10.0.0.2', 40000, 80, 12345)
+        self.assertEqual(len(packet), 24)
+        src_port, dst_port, seq, _, offset_flags = struct.unpack('!HHIIH', packet[:14])
+        self.assertEqual((src_port, dst_port, seq), (40000, 80, 12345))
+        self.assertEqual(offset_flags & 0x3f, TCP_SYN)
+
+        # Une somme de contrôle correcte donne 0 lorsqu'elle est recalculée
+        pseudo_header = struct.pack('!4s4sBBH', socket.inet_aton('10.0.0.1'),
+                                    socket.inet_aton('10.0.0.2'), 0, 6, len(packet))
+        self.assertEqual(checksum(pseudo_header + packet), 0)
+
+    def test_parse_tcp_reply(self):
+        """Test du décodage d'une réponse SYN-ACK"""
+        tcp = struct.pack('!HHIIHHHH', 80, 40000, 1, 12346, (5 << 12) | 0x12, 0, 0, 0)
+        ip = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 20 + len(tcp), 0, 0, 64, 6, 0,
+                         socket.inet_aton('10.0.0.2'), socket.inet_aton('10.0.0.1'))
+        self.assertEqual(parse_tcp_reply(ip + tcp), ('10.0.0.2', 80, 40000, 12346, 0x12))
+        self.assertIsNone(parse_tcp_reply(b'\x45' * 10))
+
+class TestSynScanner(unittest.TestCase):
+    """Tests de scan SYN sur localhost"""
+
+    def test_fallback_for_non_ipv4_targets(self):
+        """Test du repli sur le moteur par connexion"""
+        scanner = create_scanner('syn', target='::1', ports=[80])
+        self.assertIsInstance(scanner, PortScanner)
+        self.assertEqual(scanner.engine, 'thread')
+
+    @unittest.skipUnless(has_raw_socket_capability(), "CAP_NET_RAW requis")
+    def test_scan_localhost(self):
+        """Test de détection d'un port ouvert et d'un port fermé"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(8)
+        open_port = server.getsockname()[1]
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(('127.0.0.1', 0))
+        closed_port = probe.getsockname()[1]
+        probe.close()
+
+        try:
+            scanner = SynScanner('127.0.0.1', [open_port, closed_port], timeout=0.5)
+            results = scanner.scan(verbose=False)
+        finally:
+            server.close()
+
+        self.assertEqual([p['port'] for p in results['open_ports']], [open_port])
+        self.assertEqual(results['closed_ports'], 1)
+        self.assertEqual(results['filtered_ports'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le moteur de scan UDP
+"""
+import unittest
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from udp_scanner import UdpScanner, get_udp_payload, format_udp_banner
+from engines import create_scanner
+from metrics import ScanMetrics
+
+class UdpEchoServer:
+    """Serveur UDP local qui répond à chaque datagramme"""
+
+    def __init__(self, reply=b'pong', skip=0):
+        self.reply = reply
+        self.skip = skip
+        self.received = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(65535)
+            except OSError:
+                return
+            self.received.append(data)
+            # Ignorer les premiers datagrammes pour simuler des pertes
+            if len(self.received) > self.skip:
+                self.sock.sendto(self.reply, address)
+
+    def close(self):
+        self.sock.close()
+
+def free_udp_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+class TestUdpPayloads(unittest.TestCase):
+    """Tests des sondes par protocole"""
+
+    def test_payloads(self):
+        self.assertEqual(get_udp_payload(123)[0], 0x1b)
+        self.assertEqual(len(get_udp_payload(123)), 48)
+        self.assertTrue(get_udp_payload(161).startswith(b'\x30\x29'))
+        self.assertEqual(len(get_udp_payload(161)), 43)
+        self.assertEqual(get_udp_payload(40000), b'')
+
+    def test_banner(self):
+        self.assertEqual(format_udp_banner(b'\x00\x01OK ready\r\n'), 'OK ready')
+
+class TestUdpScanner(unittest.TestCase):
+    """Tests du scan UDP contre des serveurs locaux"""
+
+    def setUp(self):
+        self.server = UdpEchoServer(reply=b'\x00pong')
+
+    def tearDown(self):
+        self.server.close()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "IP_RECVERR nécessite Linux")
+    def test_open_closed(self):
+        """Test: réponse -> ouvert, ICMP port injoignable -> fermé"""
+        closed_port = free_udp_port()
+        scanner = UdpScanner('127.0.0.1', [self.server.port, closed_port],
+                             timeout=0.2, rate=0, retries=1)
+        started = time.monotonic()
+        results = scanner.scan(verbose=False)
+
+        self.assertEqual([(p['port'], p['banner']) for p in results['open_ports']],
+                         [(self.server.port, 'pong')])
+        self.assertEqual(results['closed_ports'], 1)
+        self.assertEqual(results['protocol'], 'udp')
+        # Tout a répondu: pas d'attente de retransmission
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_retransmission(self):
+        """Test qu'une sonde perdue est retransmise"""
+        server = UdpEchoServer(skip=1)
+        try:
+            scanner = UdpScanner('127.0.0.1', [server.port], timeout=0.1, rate=0, retries=2)
+            results = scanner.scan(verbose=False)
+        finally:
+            server.close()
+        self.assertEqual(len(server.received), 2)
+        self.assertEqual([p['port'] for p in results['open_ports']], [server.port])
+
+    def test_no_response_filtered(self):
+        """Test qu'un port muet est filtré après les retransmissions avec délai croissant"""
+        class PendingMetrics(ScanMetrics):
+            def add_pending(self, count):
+                super().add_pending(count)
+                self.queued = getattr(self, 'queued', 0) + max(0, count)
+
+        server = UdpEchoServer(skip=100)
+        metrics = PendingMetrics()
+        try:
+            scanner = UdpScanner('127.0.0.1', [server.port], timeout=0.05, rate=0,
+                                 retries=2, backoff=2.0, metrics=metrics)
+            started = time.monotonic()
+            results = scanner.scan(verbose=False)
+            elapsed = time.monotonic() - started
+        finally:
+            server.close()
+        self.assertEqual(len(server.received), 3)
+        self.assertEqual(results['filtered_ports'], 1)
+        # La paire sans réponse n'est mise en file qu'une fois
+        self.assertEqual(metrics.queued, 1)
+        self.assertEqual(metrics.snapshot()['queue_depth'], 0)
+        # 0.05 + 0.1 + 0.2
+        self.assertGreaterEqual(elapsed, 0.35)
+
+    def test_factory(self):
+        scanner = create_scanner('udp', '127.0.0.1', [53], timeout=1, rate=50, retries=1)
+        self.assertEqual(scanner.engine, 'udp')
+        self.assertEqual(scanner.rate_limiter.rate, 50)
+        self.assertEqual(scanner.retries, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,11 @@
 """
 Application Flask pour l'interface web du scanner de ports - VERSION CORRIGÉE
 """
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 import sys
+import yaml
 from pathlib import Path
 from datetime import datetime
 
@@ -14,7 +15,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from scanner import PortScanner
 from port_db import get_common_ports_list, get_port_info
-from utils import validate_ip, resolve_hostname, validate_port_range
+from utils import resolve_hostname, validate_port_range
+from history import ScanHistory, DEFAULT_HISTORY
+from jobs import ScanJobScheduler, QuotaExceeded
+from metrics import ScanMetrics, prometheus_metric
+from fd_budget import default_fd_budget, raise_fd_limit
+from pool import ScanPool
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'scanner-ports-secret-key-2024'
@@ -29,9 +35,6 @@ socketio = SocketIO(
     engineio_logger=False
 )
 
-# Stocker les scans en cours
-active_scans = {}
-
 @app.route('/')
 def index():
     """Page principale"""
@@ -46,19 +49,17 @@ def validate_target():
     if not target:
         return jsonify({'valid': False, 'message': 'Cible vide'})
     
-    if not validate_ip(target):
-        return jsonify({'valid': False, 'message': 'Cible invalide'})
-    
+    # Résolution mise en cache: le scan qui suit ne refait pas la requête
     resolved_ip = resolve_hostname(target)
-    if resolved_ip:
-        return jsonify({
-            'valid': True,
-            'target': target,
-            'resolved_ip': resolved_ip,
-            'message': f'Résolu: {target} -> {resolved_ip}'
-        })
+    if not resolved_ip:
+        return jsonify({'valid': False, 'message': 'Cible invalide'})
     
-    return jsonify({'valid': True, 'target': target, 'resolved_ip': target})
+    return jsonify({
+        'valid': True,
+        'target': target,
+        'resolved_ip': resolved_ip,
+        'message': f'Résolu: {target} -> {resolved_ip}'
+    })
 
 @app.route('/api/profiles', methods=['GET'])
 def get_profiles():
@@ -112,31 +113,50 @@ def handle_disconnect():
     """Gestion de la déconnexion WebSocket"""
     print(f'[WEBSOCKET] Client déconnecté: {request.sid}')
 
-@socketio.on('start_scan')
-def handle_scan(data):
-    """Démarre un scan via WebSocket"""
-    scan_id = data.get('scan_id')
+# Profils de scan du service web
+SCAN_PROFILES = {
+    'quick': {
+        'ports': get_common_ports_list,
+        'threads': 200,
+        'timeout': 0.5
+    },
+    'web': {
+        'ports': lambda: [80, 443, 8000, 8080, 8443, 8888],
+        'threads': 50,
+        'timeout': 2
+    },
+    'database': {
+        'ports': lambda: [1433, 3306, 5432, 27017, 6379, 9200],
+        'threads': 50,
+        'timeout': 2
+    },
+    'full': {
+        'ports': lambda: list(range(1, 65536)),
+        'threads': 500,
+        'timeout': 0.5
+    },
+    'safe': {
+        'ports': get_common_ports_list,
+        'threads': 10,
+        'timeout': 3,
+        'max_rate': 5
+    }
+}
+
+def build_scan_request(data):
+    """
+    Prépare les paramètres d'un scan: (requête, None) ou (None, message d'erreur)
+    """
     target = data.get('target')
     profile = data.get('profile', 'quick')
     custom_ports = data.get('custom_ports', None)
     
-    print(f"\n{'='*60}")
-    print(f"[SCAN] Nouveau scan: {scan_id}")
-    print(f"[SCAN] Cible: {target}")
-    print(f"[SCAN] Profil: {profile}")
-    print(f"{'='*60}\n")
-    
-    # Valider la cible
-    if not validate_ip(target):
+    # Valider et résoudre la cible (une seule résolution, mise en cache)
+    resolved_ip = resolve_hostname(target) if target else None
+    if not resolved_ip:
         print(f"[ERREUR] Cible invalide: {target}")
-        emit('scan_error', {
-            'scan_id': scan_id,
-            'error': 'Cible invalide'
-        })
-        return
+        return None, 'Cible invalide'
     
-    # Résoudre le hostname
-    resolved_ip = resolve_hostname(target) or target
     print(f"[SCAN] IP résolue: {resolved_ip}")
     
     # Déterminer les ports
@@ -145,138 +165,287 @@ def handle_scan(data):
         ports = validate_port_range(custom_ports)
         if not ports:
             print(f"[ERREUR] Ports invalides")
-            emit('scan_error', {
-                'scan_id': scan_id,
-                'error': 'Ports invalides'
-            })
-            return
+            return None, 'Ports invalides'
         threads = 100
         timeout = 1
+        max_rate = None
     else:
         # Profils prédéfinis
-        profile_config = {
-            'quick': {
-                'ports': get_common_ports_list(),
-                'threads': 200,
-                'timeout': 0.5
-            },
-            'web': {
-                'ports': [80, 443, 8000, 8080, 8443, 8888],
-                'threads': 50,
-                'timeout': 2
-            },
-            'database': {
-                'ports': [1433, 3306, 5432, 27017, 6379, 9200],
-                'threads': 50,
-                'timeout': 2
-            },
-            'full': {
-                'ports': list(range(1, 65536)),
-                'threads': 500,
-                'timeout': 0.5
-            },
-            'safe': {
-                'ports': get_common_ports_list(),
-                'threads': 10,
-                'timeout': 3
-            }
-        }
-        
-        config = profile_config.get(profile, profile_config['quick'])
-        ports = config['ports']
+        config = SCAN_PROFILES.get(profile, SCAN_PROFILES['quick'])
+        ports = config['ports']()
         threads = config['threads']
         timeout = config['timeout']
+        max_rate = config.get('max_rate')
     
-    print(f"[SCAN] Configuration: {len(ports)} ports, {threads} threads, timeout {timeout}s")
+    return {
+        'target': resolved_ip,
+        'ports': ports,
+        'threads': threads,
+        'timeout': timeout,
+        'max_rate': max_rate
+    }, None
+
+# Compteurs cumulés de tous les scans du service (exposés sur /metrics)
+scan_metrics = ScanMetrics()
+
+# Sockets des scans simultanés: limite de descripteurs relevée au démarrage
+raise_fd_limit()
+default_fd_budget.refresh()
+
+def emit_job_event(job, event, payload):
+    """
+    Envoie un événement du job au seul client WebSocket qui l'a soumis
+    
+    Les jobs soumis par l'API REST n'ont pas de destinataire: ils se consultent
+    sur /api/scans/<id>.
+    """
+    sid = job.request.get('sid')
+    if sid:
+        socketio.emit(event, {
+            'scan_id': job.id,
+            'client_ref': job.request.get('client_ref'),
+            **payload
+        }, to=sid)
+
+def run_scan_job(job):
+    """Exécute un job de scan (appelé par le planificateur)"""
+    scan_id = job.id
+    settings = job.request
+    ports = settings['ports']
+    
+    print(f"[SCAN] Démarrage du scan {scan_id}: {len(ports)} ports, "
+          f"{job.granted}/{job.threads} threads, timeout {settings['timeout']}s")
     
     # Émettre le début du scan
-    emit('scan_started', {
-        'scan_id': scan_id,
-        'target': resolved_ip,
+    emit_job_event(job, 'scan_started', {
+        'target': settings['target'],
         'ports_count': len(ports),
         'start_time': datetime.now().isoformat()
     })
     
-    def run_scan():
-        """Fonction de scan en arrière-plan"""
-        try:
-            print(f"[SCAN] Création du scanner...")
-            
-            # Créer le scanner
-            scanner = PortScanner(
-                target=resolved_ip,
-                ports=ports,
-                timeout=timeout,
-                threads=threads
-            )
-            
-            print(f"[SCAN] Lancement du scan...")
-            
-            # Lancer le scan
-            results = scanner.scan(verbose=False)
-            
-            print(f"[SCAN] Scan terminé!")
-            print(f"[SCAN] Ports scannés: {results['total_ports']}")
-            print(f"[SCAN] Ports ouverts: {len(results['open_ports'])}")
-            print(f"[SCAN] Durée: {results['duration']:.2f}s")
-            
-            # Enrichir les résultats avec les infos des ports
-            enriched_ports = []
-            for port_data in results['open_ports']:
-                port = port_data['port']
-                info = get_port_info(port)
-                enriched_ports.append({
-                    'port': port,
-                    'service': info['service'],
-                    'category': info['category'],
-                    'is_dangerous': info['is_dangerous'],
-                    'danger_info': info['danger_info'],
-                    'banner': port_data['banner']
-                })
-                print(f"[SCAN] Port ouvert: {port} ({info['service']})")
-            
-            results['open_ports'] = enriched_ports
-            results['start_time'] = results['start_time'].isoformat()
-            results['end_time'] = results['end_time'].isoformat()
-            
-            print(f"[SCAN] Émission des résultats au client...")
-            
-            # Émettre les résultats
-            socketio.emit('scan_complete', {
-                'scan_id': scan_id,
-                'results': results
-            })
-            
-            print(f"[SCAN] ✓ Résultats envoyés avec succès!")
-            
-        except Exception as e:
-            import traceback
-            error_msg = str(e)
-            print(f"\n[ERREUR] Exception durant le scan:")
-            print(f"[ERREUR] {error_msg}")
-            print(traceback.format_exc())
-            
-            socketio.emit('scan_error', {
-                'scan_id': scan_id,
-                'error': error_msg
+    def emit_progress(update):
+        """Progression et ports ouverts trouvés depuis la mise à jour précédente"""
+        job.progress = {key: update[key] for key in ('progress', 'total', 'percentage')}
+        emit_job_event(job, 'scan_progress', update)
+    
+    try:
+        # Scanner exécuté par le moteur partagé, dans la limite des threads accordés
+        scanner = PortScanner(
+            target=settings['target'],
+            ports=ports,
+            timeout=settings['timeout'],
+            threads=job.granted,
+            max_rate=settings['max_rate'],
+            cancel_token=job.cancel_token,
+            on_progress=emit_progress,
+            metrics=scan_metrics,
+            pool=scan_pool
+        )
+        
+        # Lancer le scan
+        results = scanner.scan(verbose=False)
+        
+        if results['cancelled']:
+            # Le client a déjà été notifié par stop_scan
+            print(f"[SCAN] Scan {scan_id} annulé après {results['duration']:.2f}s")
+            return None
+        
+        print(f"[SCAN] Scan terminé!")
+        print(f"[SCAN] Ports scannés: {results['total_ports']}")
+        print(f"[SCAN] Ports ouverts: {len(results['open_ports'])}")
+        print(f"[SCAN] Durée: {results['duration']:.2f}s")
+        
+        # Enregistrer le scan dans l'historique
+        if history_config.get('enabled', True):
+            try:
+                history = ScanHistory(history_config.get('path') or DEFAULT_HISTORY)
+                history.record(results, ports)
+                history.close()
+            except Exception as e:
+                print(f"[SCAN] Historique indisponible: {e}")
+        
+        # Enrichir les résultats avec les infos des ports
+        enriched_ports = []
+        for port_data in results['open_ports']:
+            port = port_data['port']
+            info = get_port_info(port, port_data.get('fingerprint'))
+            enriched_ports.append({
+                'port': port,
+                'service': info['service'],
+                'product': info['product'],
+                'category': info['category'],
+                'is_dangerous': info['is_dangerous'],
+                'danger_info': info['danger_info'],
+                'banner': port_data['banner'],
+                'fingerprint': port_data.get('fingerprint')
             })
-        finally:
-            if scan_id in active_scans:
-                del active_scans[scan_id]
-                print(f"[SCAN] Scan {scan_id} nettoyé\n")
+            print(f"[SCAN] Port ouvert: {port} ({info['service']})")
+        
+        results['open_ports'] = enriched_ports
+        results['start_time'] = results['start_time'].isoformat()
+        results['end_time'] = results['end_time'].isoformat()
+        # Détail par hôte inutile pour un scan mono-cible (et non sérialisable)
+        del results['hosts']
+        
+        print(f"[SCAN] Émission des résultats au client...")
+        
+        # Émettre les résultats
+        emit_job_event(job, 'scan_complete', {'results': results})
+        
+        print(f"[SCAN] ✓ Résultats envoyés avec succès!")
+        return results
+        
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        print(f"\n[ERREUR] Exception durant le scan:")
+        print(f"[ERREUR] {error_msg}")
+        print(traceback.format_exc())
+        
+        emit_job_event(job, 'scan_error', {'error': error_msg})
+        raise
+
+def load_config_section(name):
+    """Section `name` de config.yaml ({} si absente ou illisible)"""
+    config_file = Path(__file__).parent.parent / 'config' / 'config.yaml'
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return (yaml.safe_load(f) or {}).get(name) or {}
+    except (OSError, yaml.YAMLError):
+        return {}
+
+# Historique des scans (section 'history'), comme en ligne de commande
+history_config = load_config_section('history')
+
+# Planificateur des scans: budget global de threads, quotas par client, file équitable
+scheduler = ScanJobScheduler(
+    run_scan_job,
+    spawn=socketio.start_background_task,
+    **load_config_section('web')
+)
+
+# Moteur persistant partagé par tous les scans: workers, lecture des bannières
+# et RTT des hôtes déjà scannés restent prêts d'un scan à l'autre
+scan_pool = ScanPool(threads=scheduler.max_threads)
+
+def submit_scan(data, client, sid=None):
+    """
+    Soumet un scan au planificateur
+    
+    Retourne (job, None, None) ou (None, message d'erreur, statut HTTP): 400
+    pour une requête invalide, 429 si le client a trop de scans en attente.
+    L'identifiant du job est tiré par le planificateur; la référence
+    `client_ref` du client WebSocket est seulement renvoyée dans ses événements.
+    """
+    scan_request, error = build_scan_request(data)
+    if error:
+        return None, error, 400
+    scan_request['sid'] = sid
+    scan_request['client_ref'] = data.get('client_ref')
+    try:
+        job = scheduler.submit(client, scan_request, scan_request['threads'])
+    except QuotaExceeded as e:
+        print(f"[SCAN] Refusé pour {client}: {e}")
+        return None, str(e), 429
+    return job, None, None
+
+@app.route('/api/scans', methods=['GET'])
+def list_scans():
+    """Occupation du service de scan"""
+    return jsonify({**scheduler.stats(), 'pool': scan_pool.stats()})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métriques des scans et du planificateur au format Prometheus"""
+    stats = scheduler.stats()
+    lines = []
+    for name, key, help_text in (
+            ('portscan_jobs_running', 'running', 'Scans en cours'),
+            ('portscan_jobs_queued', 'queued', 'Scans en attente'),
+            ('portscan_threads_used', 'used_threads', 'Threads accordés aux scans en cours'),
+            ('portscan_threads_max', 'max_threads', 'Budget global de threads')):
+        lines.extend(prometheus_metric(name, 'gauge', help_text, [('', [], stats[key])]))
+    fd_stats = default_fd_budget.stats()
+    if fd_stats['capacity'] is not None:
+        lines.extend(prometheus_metric('portscan_fd_budget_used', 'gauge',
+                                       'Sockets en vol', [('', [], fd_stats['used'])]))
+        lines.extend(prometheus_metric('portscan_fd_budget_capacity', 'gauge',
+                                       'Sockets permises par RLIMIT_NOFILE', [('', [], fd_stats['capacity'])]))
+        lines.extend(prometheus_metric('portscan_fd_exhausted_total', 'counter',
+                                       'Sockets refusées par le système (EMFILE/ENFILE)',
+                                       [('', [], fd_stats['exhausted'])]))
+    body = scan_metrics.render_prometheus() + "\n".join(lines) + "\n"
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/scans', methods=['POST'])
+def create_scan():
+    """Soumet un scan (target, profile ou custom_ports)"""
+    job, error, status = submit_scan(request.get_json() or {}, request.remote_addr)
+    if error:
+        return jsonify({'error': error}), status
+    return jsonify(job.snapshot()), 202
+
+@app.route('/api/scans/<scan_id>', methods=['GET'])
+def get_scan(scan_id):
+    """État, progression et résultats d'un scan"""
+    job = scheduler.get(scan_id)
+    if job is None:
+        return jsonify({'error': 'Scan inconnu ou expiré'}), 404
+    data = job.snapshot()
+    if data['status'] == 'queued':
+        data['position'] = scheduler.position(job)
+    return jsonify(data)
+
+@app.route('/api/scans/<scan_id>', methods=['DELETE'])
+def delete_scan(scan_id):
+    """Annule un scan en attente ou en cours (réservé au client qui l'a soumis)"""
+    if not scheduler.cancel(scan_id, client=request.remote_addr):
+        return jsonify({'error': 'Scan inconnu, terminé ou soumis par un autre client'}), 404
+    return jsonify({'id': scan_id, 'status': 'cancelled'})
+
+@socketio.on('start_scan')
+def handle_scan(data):
+    """Démarre un scan via WebSocket"""
+    client_ref = data.get('client_ref')
     
-    # Lancer le scan dans un thread en arrière-plan
-    active_scans[scan_id] = True
-    socketio.start_background_task(run_scan)
+    print(f"\n{'='*60}")
+    print(f"[SCAN] Nouveau scan: {client_ref}")
+    print(f"[SCAN] Cible: {data.get('target')}")
+    print(f"[SCAN] Profil: {data.get('profile', 'quick')}")
+    print(f"{'='*60}\n")
+    
+    job, error, _ = submit_scan(data, request.remote_addr, sid=request.sid)
+    if error:
+        emit('scan_error', {
+            'client_ref': client_ref,
+            'error': error
+        })
+        return
+    
+    # Identifiant attribué par le serveur, à utiliser pour stop_scan
+    emit('scan_accepted', {
+        'scan_id': job.id,
+        'client_ref': client_ref
+    })
+    
+    if job.status == 'queued':
+        # Budget ou quota atteint: le scan démarrera à son tour
+        position = scheduler.position(job)
+        print(f"[SCAN] Scan {job.id} en attente (position {position})")
+        emit('scan_queued', {
+            'scan_id': job.id,
+            'client_ref': client_ref,
+            'position': position
+        })
 
 @socketio.on('stop_scan')
 def handle_stop_scan(data):
-    """Arrête un scan en cours"""
+    """Arrête un scan en attente ou en cours (réservé au client qui l'a soumis)"""
     scan_id = data.get('scan_id')
     print(f"[SCAN] Arrêt demandé pour {scan_id}")
     
-    if scan_id in active_scans:
-        del active_scans[scan_id]
+    if scheduler.cancel(scan_id, client=request.remote_addr):
+        # Plus aucune sonde n'est lancée: les threads et sockets se libèrent
         emit('scan_stopped', {'scan_id': scan_id})
         print(f"[SCAN] Scan {scan_id} arrêté")
 
@@ -5,8 +5,10 @@ const state = {
     selectedProfile: 'quick',
     customPorts: false,
     scanning: false,
+    clientRef: null,
     scanId: null,
     results: null,
+    liveOpenPorts: [],
     profiles: {},
     reconnecting: false
 };
@@ -165,10 +167,12 @@ elements.startScan.addEventListener('click', () => {
         return;
     }
     
-    state.scanId = `scan_${Date.now()}`;
+    // Référence locale: l'identifiant du scan est attribué par le serveur
+    state.clientRef = `scan_${Date.now()}`;
+    state.scanId = null;
     state.scanning = true;
     
-    console.log('[SCAN] Démarrage:', state.scanId);
+    console.log('[SCAN] Démarrage:', state.clientRef);
     
     // Afficher la progression
     elements.progressSection.style.display = 'block';
@@ -185,7 +189,7 @@ elements.startScan.addEventListener('click', () => {
     
     // Configuration
     const config = {
-        scan_id: state.scanId,
+        client_ref: state.clientRef,
         target: state.target,
         profile: state.selectedProfile
     };
@@ -214,6 +218,17 @@ function resetUI() {
     elements.stopScan.style.display = 'none';
 }
 
+// Événement du scan en cours ? (retient l'identifiant attribué par le serveur)
+function isCurrentScan(data) {
+    if (!state.clientRef || data.client_ref !== state.clientRef) {
+        return false;
+    }
+    if (data.scan_id) {
+        state.scanId = data.scan_id;
+    }
+    return true;
+}
+
 // Socket.IO Events
 socket.on('connect', () => {
     console.log('[WEBSOCKET] Connecté');
@@ -243,22 +258,43 @@ socket.on('reconnect_error', (error) => {
     console.error('[WEBSOCKET] Erreur de reconnexion:', error);
 });
 
+socket.on('scan_accepted', (data) => {
+    if (isCurrentScan(data)) {
+        console.log('[SCAN] Accepté:', data.scan_id);
+    }
+});
+
 socket.on('scan_started', (data) => {
     console.log('[SCAN] Démarré:', data.scan_id);
     
-    if (data.scan_id === state.scanId) {
+    if (isCurrentScan(data)) {
+        state.liveOpenPorts = [];
         elements.scanPorts.textContent = data.ports_count.toLocaleString();
         elements.scanStatus.textContent = 'Scan en cours...';
         elements.progressFill.style.width = '1%';
     }
 });
 
+socket.on('scan_queued', (data) => {
+    if (isCurrentScan(data)) {
+        elements.scanStatus.textContent = `En attente: position ${data.position} dans la file`;
+        console.log('[SCAN] En attente, position', data.position);
+    }
+});
+
 socket.on('scan_progress', (data) => {
-    if (data.scan_id === state.scanId) {
+    if (isCurrentScan(data)) {
         const percentage = Math.round(data.percentage);
         elements.scanPercentage.textContent = `${percentage}%`;
         elements.progressFill.style.width = `${percentage}%`;
-        elements.scanStatus.textContent = `${data.progress.toLocaleString()} / ${data.total.toLocaleString()} ports`;
+        // Ports ouverts trouvés depuis la mise à jour précédente
+        if (data.open_ports && data.open_ports.length) {
+            state.liveOpenPorts.push(...data.open_ports);
+            data.open_ports.forEach(port => console.log('[SCAN] Port ouvert:', port.port));
+        }
+        const found = state.liveOpenPorts.length;
+        const openInfo = found ? ` — ${found} port(s) ouvert(s): ${state.liveOpenPorts.slice(-10).map(p => p.port).join(', ')}` : '';
+        elements.scanStatus.textContent = `${data.progress.toLocaleString()} / ${data.total.toLocaleString()} ports${openInfo}`;
         console.log('[SCAN] Progression:', percentage + '%');
     }
 });
@@ -266,7 +302,7 @@ socket.on('scan_progress', (data) => {
 socket.on('scan_complete', (data) => {
     console.log('[SCAN] Terminé:', data.scan_id);
     
-    if (data.scan_id !== state.scanId) {
+    if (!isCurrentScan(data)) {
         console.warn('[SCAN] ID ne correspond pas, ignoré');
         return;
     }
@@ -291,6 +327,9 @@ socket.on('scan_complete', (data) => {
 });
 
 socket.on('scan_error', (data) => {
+    if (!isCurrentScan(data)) {
+        return;
+    }
     console.error('[ERREUR] Scan:', data.error);
     alert(`Erreur durant le scan: ${data.error}`);
     resetUI();
@@ -343,9 +382,13 @@ function displayResults(results) {
                 banner = '<span style="color: #9ca3af;">N/A</span>';
             }
             
+            const service = port.product
+                ? `${escapeHtml(port.service)} <span class="banner-text">${escapeHtml(port.product)}</span>`
+                : port.service;
+            
             tr.innerHTML = `
                 <td><span class="port-number">${port.port}</span></td>
-                <td>${port.service}</td>
+                <td>${service}</td>
                 <td>${port.category}</td>
                 <td>${statusBadge}</td>
                 <td>${banner}</td>